@@ -7,18 +7,24 @@
         1. Time_Analysis: 时域信号分析、处理方法
         2. Frequency_Analysis: 频域信号分析、处理方法
         3. TimeFre_Analysis: 时频域信号分析、处理方法
+        4. HistAccumulator: 分块累积的直方图与蓄水池样本, 用于大信号与流式数据的PDF估计
+        5. ReservoirSampler: 蓄水池随机采样器, 从数据流中等概率保留固定数量的样本
     - function: 
         1. window: 生成各类窗函数整周期采样序列
+        2. register_window: 注册可缓存的命名自定义窗函数
+        3. fft_autocorr: FFT法沿最后一轴批量计算有偏自相关
+        4. fft_crosscorr: 由一次正变换批量计算多通道间的(广义)互相关
 """
 
-from .dependencies import Optional, Callable
+from .dependencies import Optional, Union, Callable, lru_cache
 from .dependencies import np
 from .dependencies import plt, zh_font
 from .dependencies import fft, stats, signal
+from .dependencies import CHUNK_SIZE, MEDIAN_BUFFER_SIZE, FLOAT_EPS
 
 from .decorators import Check_Vars, Plot
 
-from .Signal import Signal, Analysis
+from .Signal import Signal, Analysis, float_dtype, complex_dtype
 
 from .Plot import plot_spectrum, plot_spectrogram
 
@@ -27,18 +33,86 @@ from .Plot import plot_spectrum, plot_spectrogram
 # -## ----------------------------------------------------------------------------------------#
 # -----## ------------------------------------------------------------------------------------#
 # ---------## --------------------------------------------------------------------------------#
+# 标准窗函数表达式, n为采样点序号, N为保证窗中心幅值为1的奇数长度
+_STD_WINDOWS = {
+    "矩形窗": lambda n, N: np.ones(len(n)),
+    "汉宁窗": lambda n, N: 0.5 * (1 - np.cos(2 * np.pi * n / (N - 1))),
+    "海明窗": lambda n, N: 0.54 - 0.46 * np.cos(2 * np.pi * n / (N - 1)),
+    "巴特利特窗": lambda n, N: np.where(
+        np.less_equal(n, (N - 1) / 2), 2 * n / (N - 1), 2 - 2 * n / (N - 1)
+    ),
+    "布莱克曼窗": lambda n, N: 0.42
+    - 0.5 * np.cos(2 * np.pi * n / (N - 1))
+    + 0.08 * np.cos(4 * np.pi * n / (N - 1)),
+}
+_NAMED_WINDOWS = {}  # register_window注册的命名自定义窗函数
+WINDOW_TYPES = list(_STD_WINDOWS) + ["自定义窗"]  # 可选窗类型, 注册后原地追加
+WINDOW_CACHE_SIZE = 64  # 窗序列缓存的最大条目数
+WINDOW_CACHE_MAXLEN = 2**18  # 缓存窗序列的最大长度, 更长的整信号窗不缓存以限制内存
+
+
+@Check_Vars({"name": {}, "func": {}})
+def register_window(name: str, func: Callable) -> None:
+    """
+    注册命名自定义窗函数, 注册后可作为window及各分析方法的WinType使用, 并与标准窗一样缓存
+
+    参数:
+    --------
+    name : str
+        窗类型名称, 不能与标准窗或"自定义窗"重名, 重复注册时覆盖原窗函数
+    func : Callable
+        窗函数, 输入采样点序号n=0,1,...,num-1, 返回窗函数采样序列
+    """
+    if name in _STD_WINDOWS or name == "自定义窗":
+        raise ValueError(f"窗类型{name}与内置窗重名")
+    _NAMED_WINDOWS[name] = func
+    if name not in WINDOW_TYPES:
+        WINDOW_TYPES.append(name)
+    # 丢弃覆盖前的旧序列及由其计算的ISTFT包络
+    _window_cached.cache_clear()
+    _ola_envelope.cache_clear()
+
+
+def _make_window(
+    type: str, num: int, func: Optional[Callable], padding: Optional[int], dtype
+) -> tuple:
+    """
+    计算窗函数序列及其归一化系数, 返回只读序列
+    """
+    N = num
+    n = np.arange(N)  # n=0,1,2,3,...,N-1
+    if N % 2 == 0:
+        N += 1  # 保证window[N//2]采样点幅值为1, 此时窗函数非对称
+    if num == 1:
+        win_data = np.ones(1)
+    elif type in _STD_WINDOWS:
+        win_data = _STD_WINDOWS[type](n, N)
+    elif type in _NAMED_WINDOWS:
+        win_data = np.array(_NAMED_WINDOWS[type](n), dtype=float)
+    elif type == "自定义窗" and func is not None:
+        win_data = np.array(func(n), dtype=float)
+    else:
+        raise ValueError("不支持的窗函数类型")
+    Amp_scale = float(1 / np.mean(win_data))  # 窗函数幅值归一化
+    Engy_scale = float(1 / np.mean(np.square(win_data)))  # 窗函数能量归一化
+    win_data = win_data.astype(dtype, copy=False)
+    # 进行零填充（如果指定了填充长度）
+    if padding is not None:
+        win_data = np.pad(
+            win_data, padding, mode="constant"
+        )  # 双边各填充padding点, 共延长2*padding点
+    win_data.flags.writeable = False  # 缓存共享的序列只读
+    return Amp_scale, Engy_scale, win_data
+
+
+@lru_cache(maxsize=WINDOW_CACHE_SIZE)
+def _window_cached(type: str, num: int, padding: Optional[int], dtype: str) -> tuple:
+    return _make_window(type, num, None, padding, dtype)
+
+
 @Check_Vars(
     {
-        "type": {
-            "Content": (
-                "矩形窗",
-                "汉宁窗",
-                "海明窗",
-                "巴特利特窗",
-                "布莱克曼窗",
-                "自定义窗",
-            )
-        },
+        "type": {"Content": WINDOW_TYPES},
         "num": {"Low": 1},
         "padding": {"Low": 1},
     }
@@ -49,15 +123,17 @@ def window(
     func: Optional[Callable] = None,
     padding: Optional[int] = None,
     check: bool = False,
+    dtype: str = "float64",
     **Kwargs,
 ) -> np.ndarray:
     """
-    生成各类窗函数整周期采样序列
+    生成各类窗函数整周期采样序列, 除"自定义窗"外按(type, num, padding, dtype)缓存
 
     参数:
     --------
     type : str
-        窗函数类型, 可选: "矩形窗", "汉宁窗", "海明窗", "巴特利特窗", "布莱克曼窗" 和 "自定义窗"
+        窗函数类型, 可选: "矩形窗", "汉宁窗", "海明窗", "巴特利特窗", "布莱克曼窗", "自定义窗"
+        及register_window注册的窗类型
     num : int
         采样点数
     func : Callable, 可选
@@ -66,6 +142,8 @@ def window(
         窗序列双边各零填充点数, 默认不填充
     check : bool, 可选
         是否绘制所有窗函数图像以检查, 默认不检查
+    dtype : str or np.dtype, 默认为"float64"
+        窗函数序列的数据类型, 与待加窗数据的计算精度一致以避免类型提升
     (title) : str, 可选
         绘图标题, 默认"窗函数测试图"
     (plot_save) : bool, 可选
@@ -78,45 +156,21 @@ def window(
     Engy_scale : float
         能量归一化系数
     win_data : np.ndarray
-        窗函数采样序列
+        窗函数采样序列, 只读
     """
-    # 定义窗函数
-    N = num
-    window_func = {}  # 标准窗函数表达式字典
-    window_func["矩形窗"] = lambda n: np.ones(len(n))
-    window_func["汉宁窗"] = lambda n: 0.5 * (1 - np.cos(2 * np.pi * n / (N - 1)))
-    window_func["海明窗"] = lambda n: 0.54 - 0.46 * np.cos(2 * np.pi * n / (N - 1))
-    window_func["巴特利特窗"] = lambda n: np.where(
-        np.less_equal(n, (N - 1) / 2), 2 * n / (N - 1), 2 - 2 * n / (N - 1)
-    )
-    window_func["布莱克曼窗"] = (
-        lambda n: 0.42
-        - 0.5 * np.cos(2 * np.pi * n / (N - 1))
-        + 0.08 * np.cos(4 * np.pi * n / (N - 1))
-    )
-    window_func["自定义窗"] = func
-    # ----------------------------------------------------------------------------------------#
-    # 生成采样点
-    if N < 1:
-        return np.array([])
-    elif N == 1:
-        return np.ones(1, float)
-    n = np.arange(N)  # n=0,1,2,3,...,N-1
-    if N % 2 == 0:
-        N += 1  # 保证window[N//2]采样点幅值为1, 此时窗函数非对称
     # ----------------------------------------------------------------------------------------#
     # 检查所有窗函数,如需要
     if check:
-        window_num = len(window_func) - 1
+        window_func = dict(_STD_WINDOWS, **_NAMED_WINDOWS)
+        n = np.arange(num)
+        N = num + 1 if num % 2 == 0 else num
         # 2列多行显示
-        rows = window_num // 2 if len(window_func) % 2 == 0 else window_num // 2 + 1
+        rows = (len(window_func) + 1) // 2
         cols = 2
         fig, ax = plt.subplots(rows, cols, figsize=(10, 5 * rows))
         ax = ax.flatten() if isinstance(ax, np.ndarray) else [ax]
-        for ax, (key, func) in zip(ax, window_func.items()):
-            if key == "自定义窗":
-                continue
-            ax.plot(n, func(n))
+        for ax, (key, wfunc) in zip(ax, window_func.items()):
+            ax.plot(n, wfunc(n, N) if key in _STD_WINDOWS else wfunc(n))
             ax.set_title(key, fontproperties=zh_font)
             ax.set_ylim(0, 1.1)
         title = Kwargs.get("title", "窗函数测试图")
@@ -127,18 +181,419 @@ def window(
             plt.savefig(title + ".svg", format="svg")
         plt.show()
     # ----------------------------------------------------------------------------------------#
-    # 生成窗采样序列
-    if type not in window_func.keys():
-        raise ValueError("不支持的窗函数类型")
-    win_data = window_func[type](n)
-    Amp_scale = 1 / np.mean(win_data)  # 窗函数幅值归一化
-    Engy_scale = 1 / np.mean(np.square(win_data))  # 窗函数能量归一化
-    # 进行零填充（如果指定了填充长度）
-    if padding is not None:
-        win_data = np.pad(
-            win_data, padding, mode="constant"
-        )  # 双边各填充padding点, 共延长2*padding点
-    return Amp_scale, Engy_scale, win_data
+    # 生成窗采样序列, 匿名自定义窗与过长的窗不缓存
+    if type == "自定义窗" or num + 2 * (padding or 0) > WINDOW_CACHE_MAXLEN:
+        return _make_window(type, num, func, padding, dtype)
+    return _window_cached(type, num, padding, np.dtype(dtype).name)
+
+
+# --------------------------------------------------------------------------------------------#
+@Check_Vars({"data": {}, "max_lag": {"CloseLow": 0}})
+def fft_autocorr(data: np.ndarray, max_lag: Optional[int] = None) -> np.ndarray:
+    """
+    FFT法沿最后一轴批量计算有偏自相关R(k)/N, k=0~max_lag, 可一次处理多通道或多分段数据
+
+    参数:
+    --------
+    data : np.ndarray
+        输入数据, 形状为(..., N)
+    max_lag : int, 可选
+        最大延迟点数, 默认为N-1
+
+    返回:
+    --------
+    corr : np.ndarray
+        单边自相关, 形状为(..., max_lag+1)
+    """
+    N = data.shape[-1]
+    L = N - 1 if max_lag is None else min(max_lag, N - 1)
+    nfft = fft.next_fast_len(N + L)  # 零填充至N+L以上, 使0~L延迟不受循环相关混叠
+    if np.iscomplexobj(data):
+        spec = fft.fft(data, nfft)
+        R = fft.ifft(spec * np.conj(spec))[..., : L + 1]
+    else:
+        spec = fft.rfft(data, nfft)
+        R = fft.irfft(np.square(spec.real) + np.square(spec.imag), nfft)[..., : L + 1]
+    return R / N
+
+
+# --------------------------------------------------------------------------------------------#
+def _pair_index(channels: int, pairs: Optional[list]) -> np.ndarray:
+    # 通道对索引, 默认为全部i<j通道对
+    if pairs is None:
+        return np.stack(np.triu_indices(channels, k=1), axis=-1)
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    if np.any(pairs < 0) or np.any(pairs >= channels):
+        raise ValueError(f"通道对索引超出通道数{channels}")
+    return pairs
+
+
+def _crosscorr_from_spec(
+    spec: np.ndarray, nfft: int, N: int, pairs: np.ndarray, L: int, weight: str
+) -> np.ndarray:
+    # 由各通道单边频谱按通道对分块计算-L~L延迟的互相关, 避免一次生成全部通道对的互谱
+    corr = np.empty((len(pairs), 2 * L + 1), dtype=spec.real.dtype)
+    block = max(1, CHUNK_SIZE // nfft)
+    for k in range(0, len(pairs), block):
+        i, j = pairs[k : k + block, 0], pairs[k : k + block, 1]
+        cross = spec[i] * np.conj(spec[j])  # 互谱
+        if weight == "phat":  # 相位变换加权, 仅保留互谱相位
+            cross /= np.maximum(np.abs(cross), FLOAT_EPS)
+        r = fft.irfft(cross, nfft)
+        corr[k : k + block] = np.concatenate((r[:, nfft - L :], r[:, : L + 1]), axis=-1)
+    if weight == "none":
+        corr /= N  # 有偏估计, 同Autocorr
+    return corr
+
+
+@Check_Vars(
+    {
+        "data": {"ndim": 2},
+        "max_lag": {"CloseLow": 0},
+        "weight": {"Content": ("none", "phat")},
+    }
+)
+def fft_crosscorr(
+    data: np.ndarray,
+    pairs: Optional[list] = None,
+    max_lag: Optional[int] = None,
+    weight: str = "none",
+) -> np.ndarray:
+    """
+    由各通道一次零填充FFT批量计算通道对的(广义)互相关R_ij(k)=sum(x_i[n+k]*x_j[n]),
+    正延迟表示通道i滞后于通道j
+
+    参数:
+    --------
+    data : np.ndarray
+        多通道数据, 形状为(channels, N)
+    pairs : list, 可选
+        通道对索引列表[(i, j), ...], 默认为全部i<j通道对
+    max_lag : int, 可选
+        最大延迟点数, 默认为N-1
+    weight : str, 默认为"none"
+        互谱加权方式, 可选:
+                    "none": 普通互相关, 按N有偏归一化
+                    "phat": 相位变换加权的广义互相关(GCC-PHAT)
+
+    返回:
+    --------
+    corr : np.ndarray
+        互相关, 形状为(通道对数, 2*max_lag+1), 延迟为-max_lag~max_lag
+    """
+    N = data.shape[-1]
+    L = N - 1 if max_lag is None else min(max_lag, N - 1)
+    nfft = fft.next_fast_len(N + L)
+    spec = fft.rfft(data, nfft)  # 每个通道只做一次正变换
+    return _crosscorr_from_spec(spec, nfft, N, _pair_index(len(data), pairs), L, weight)
+
+
+# --------------------------------------------------------------------------------------------#
+# 趋势统计特征所依赖的分段中间矩, 按需计算并在各特征间共享, m(name)获取其它中间矩
+_TREND_MOMENTS = {
+    "mean": lambda x, m: np.mean(x, axis=-1),
+    "abs": lambda x, m: np.abs(x),
+    "mean_abs": lambda x, m: np.mean(m("abs"), axis=-1),
+    "max_abs": lambda x, m: np.max(m("abs"), axis=-1),
+    "mean_sqrt_abs": lambda x, m: np.mean(np.sqrt(m("abs")), axis=-1),
+    "mean_sq": lambda x, m: np.mean(np.square(x), axis=-1),
+    "dev": lambda x, m: x - m("mean")[..., None],
+    "dev_sq": lambda x, m: np.square(m("dev")),
+    "m2": lambda x, m: np.mean(m("dev_sq"), axis=-1),  # 二阶中心矩
+    "m3": lambda x, m: np.mean(m("dev_sq") * m("dev"), axis=-1),  # 三阶中心矩
+    "m4": lambda x, m: np.mean(np.square(m("dev_sq")), axis=-1),  # 四阶中心矩
+}
+
+# 趋势统计特征由中间矩计算的表达式
+_TREND_FEATURES = {
+    # 常用统计特征
+    "均值": lambda m: m("mean"),
+    "方差": lambda m: m("m2"),
+    "标准差": lambda m: np.sqrt(m("m2")),
+    "均方值": lambda m: m("mean_sq"),
+    # 有量纲参数指标
+    "方根幅值": lambda m: np.square(m("mean_sqrt_abs")),
+    "平均幅值": lambda m: m("mean_abs"),
+    "有效值": lambda m: np.sqrt(m("mean_sq")),
+    "峰值": lambda m: m("max_abs"),
+    # 无量纲参数指标
+    "波形指标": lambda m: np.sqrt(m("mean_sq")) / m("mean_abs"),
+    "峰值指标": lambda m: m("max_abs") / np.sqrt(m("mean_sq")),
+    "脉冲指标": lambda m: m("max_abs") / m("mean_abs"),
+    "裕度指标": lambda m: m("max_abs") / np.square(m("mean_sqrt_abs")),
+    "偏度指标": lambda m: m("m3") / m("m2") ** 1.5,
+    "峭度指标": lambda m: m("m4") / np.square(m("m2")) - 3,  # Fisher定义, 同stats.kurtosis
+}
+
+TREND_FEATURES = tuple(_TREND_FEATURES)  # 支持的趋势统计特征
+
+
+def _trend_features(seg_data: np.ndarray, Features: list) -> dict:
+    """
+    由(..., 分段数, 段长)的分段数据计算多个统计特征, 每个中间矩只计算一次
+    """
+    moments = {}
+
+    def m(name: str) -> np.ndarray:
+        if name not in moments:
+            moments[name] = _TREND_MOMENTS[name](seg_data, m)
+        return moments[name]
+
+    return {Feature: _TREND_FEATURES[Feature](m) for Feature in Features}
+
+
+# --------------------------------------------------------------------------------------------#
+class ReservoirSampler:
+    """
+    蓄水池随机采样器(Algorithm R), 从任意长度的数据流中等概率保留固定数量的样本,
+    内存占用与数据长度无关, 可逐块输入大信号或流式数据后做精确核密度估计
+
+    参数:
+    --------
+    size : int
+        蓄水池采样点数
+    shape : tuple, 默认为()
+        前置通道轴形状, 多通道时为(channels,), 各通道共用采样时刻
+
+    属性:
+    --------
+    n : int
+        累积点数
+    samples : np.ndarray
+        当前保留的样本, 形状为shape+(min(n, size),)
+
+    方法:
+    --------
+    update(data:np.ndarray) -> None
+        累积新的数据块, 沿最后一轴采样
+    kde(points:np.ndarray) -> np.ndarray
+        对保留样本做精确高斯核密度估计
+    """
+
+    @Check_Vars({"size": {"Low": 1}})
+    def __init__(self, size: int, shape: tuple = ()):
+        self.n = 0
+        self._reservoir = np.zeros(shape + (size,))
+        self._rng = np.random.default_rng()
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self._reservoir[..., : min(self.n, self._reservoir.shape[-1])]
+
+    # ----------------------------------------------------------------------------------------#
+    def update(self, data: np.ndarray) -> None:
+        """
+        累积新的数据块, 第t点以size/(t+1)的概率替换蓄水池中的随机样本
+
+        参数:
+        --------
+        data : np.ndarray or Signal
+            新数据块, 形状为shape+(n,)
+        """
+        if isinstance(data, Signal):
+            data = data.data
+        k = self._reservoir.shape[-1]
+        n_new = data.shape[-1]
+        t = self.n + np.arange(n_new)  # 新数据的全局序号
+        fill = t < k
+        self._reservoir[..., t[fill]] = data[..., fill]
+        j = self._rng.integers(0, t[~fill] + 1)
+        keep = j < k
+        self._reservoir[..., j[keep]] = data[..., ~fill][..., keep]
+        self.n += n_new
+
+    # ----------------------------------------------------------------------------------------#
+    def kde(self, points: np.ndarray) -> np.ndarray:
+        """
+        对保留样本做精确高斯核密度估计
+
+        参数:
+        --------
+        points : np.ndarray
+            幅值域采样点
+
+        返回:
+        --------
+        pdf : np.ndarray
+            概率密度, 形状为shape+(len(points),)
+        """
+        samples = self.samples
+        flat = samples.reshape(-1, samples.shape[-1])
+        pdf = np.stack([stats.gaussian_kde(ch)(points) for ch in flat])
+        return pdf.reshape(samples.shape[:-1] + (len(points),))
+
+
+# --------------------------------------------------------------------------------------------#
+class HistAccumulator:
+    """
+    分块累积的直方图, 同时累积一、二阶矩与可选的蓄水池样本, 内存占用与数据长度无关,
+    可逐块输入大信号或流式数据后估计概率密度函数
+
+    参数:
+    --------
+    low : float or np.ndarray
+        直方图下界, 为数组时各通道取各自的下界
+    high : float or np.ndarray
+        直方图上界, 为数组时各通道取各自的上界
+    bins : int, 默认为4096
+        直方图等宽区间数
+    reservoir : int, 默认为0
+        蓄水池采样点数, 为0时不采样
+    shape : tuple, 默认为()
+        前置通道轴形状, 多通道时为(channels,)
+
+    属性:
+    --------
+    edges : np.ndarray
+        直方图区间边界, 形状为shape+(bins+1,)
+    counts : np.ndarray
+        各区间点数, 形状为shape+(bins,)
+    n : int
+        累积点数, 含超出直方图范围的点
+
+    方法:
+    --------
+    update(data:np.ndarray) -> None
+        累积新的数据块, 沿最后一轴统计
+    density(points:np.ndarray) -> np.ndarray
+        直方图密度在指定点处的取值
+    binned_kde(points:np.ndarray) -> np.ndarray
+        FFT卷积直方图与高斯核, 计算指定点处的核密度估计
+    reservoir_kde(points:np.ndarray) -> np.ndarray
+        对蓄水池样本做精确高斯核密度估计
+    """
+
+    @Check_Vars({"bins": {"Low": 1}, "reservoir": {"CloseLow": 0}})
+    def __init__(
+        self,
+        low: Union[float, np.ndarray],
+        high: Union[float, np.ndarray],
+        bins: int = 4096,
+        reservoir: int = 0,
+        shape: tuple = (),
+    ):
+        low = np.broadcast_to(np.asarray(low, dtype=float), shape)
+        high = np.broadcast_to(np.asarray(high, dtype=float), shape)
+        if not np.all(low < high):
+            raise ValueError(f"直方图下界{low}应小于上界{high}")
+        self.edges = np.linspace(low, high, bins + 1, axis=-1)
+        self.counts = np.zeros(shape + (bins,), dtype=np.int64)
+        self.n = 0
+        self._sum = np.zeros(shape)
+        self._sum_sq = np.zeros(shape)
+        self._sampler = ReservoirSampler(reservoir, shape) if reservoir > 0 else None
+
+    # ----------------------------------------------------------------------------------------#
+    def update(self, data: np.ndarray) -> None:
+        """
+        累积新的数据块, 沿最后一轴统计
+
+        参数:
+        --------
+        data : np.ndarray or Signal
+            新数据块, 形状为shape+(n,)
+        """
+        if isinstance(data, Signal):
+            data = data.data
+        bins = self.counts.shape[-1]
+        low, high = self.edges[..., :1], self.edges[..., -1:]
+        # 各通道的区间索引展平后一次bincount
+        idx = np.floor((data - low) * (bins / (high - low))).astype(np.int64)
+        valid = (idx >= 0) & (idx < bins)
+        ch = np.arange(int(np.prod(data.shape[:-1]))).reshape(data.shape[:-1] + (1,))
+        flat = (ch * bins + idx)[valid]
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(
+            self.counts.shape
+        )
+        self._sum += np.sum(data, axis=-1)
+        self._sum_sq += np.sum(np.square(data), axis=-1)
+        if self._sampler is not None:
+            self._sampler.update(data)
+        self.n += data.shape[-1]
+
+    # ----------------------------------------------------------------------------------------#
+    @property
+    def _centers(self) -> np.ndarray:
+        return (self.edges[..., :-1] + self.edges[..., 1:]) / 2
+
+    @property
+    def _width(self) -> np.ndarray:
+        return self.edges[..., 1] - self.edges[..., 0]
+
+    def _interp(self, points: np.ndarray, grid_density: np.ndarray) -> np.ndarray:
+        # 各通道密度在各自的区间中心上线性插值至指定点, 首末半个区间内取端点区间的值
+        flat = grid_density.reshape(-1, grid_density.shape[-1])
+        centers = np.broadcast_to(self._centers, grid_density.shape).reshape(flat.shape)
+        out = np.stack([np.interp(points, c, ch) for c, ch in zip(centers, flat)])
+        out = out.reshape(grid_density.shape[:-1] + (len(points),))
+        inside = (points >= self.edges[..., :1]) & (points <= self.edges[..., -1:])
+        return np.where(inside, out, 0.0)
+
+    # ----------------------------------------------------------------------------------------#
+    def density(self, points: np.ndarray) -> np.ndarray:
+        """
+        直方图密度在指定点处的取值, 按总点数归一化
+
+        参数:
+        --------
+        points : np.ndarray
+            幅值域采样点
+
+        返回:
+        --------
+        pdf : np.ndarray
+            概率密度, 形状为shape+(len(points),)
+        """
+        width = self._width[..., None]
+        idx = np.floor((points - self.edges[..., :1]) / width).astype(np.int64)
+        valid = (idx >= 0) & (idx < self.counts.shape[-1])
+        counts = np.take_along_axis(self.counts, np.where(valid, idx, 0), axis=-1)
+        return np.where(valid, counts / (self.n * width), 0.0)
+
+    # ----------------------------------------------------------------------------------------#
+    def binned_kde(self, points: np.ndarray) -> np.ndarray:
+        """
+        FFT卷积直方图与高斯核, 计算指定点处的核密度估计, 带宽按Scott准则, 同stats.gaussian_kde
+
+        参数:
+        --------
+        points : np.ndarray
+            幅值域采样点
+
+        返回:
+        --------
+        pdf : np.ndarray
+            概率密度, 形状为shape+(len(points),)
+        """
+        n = self.n
+        var = (self._sum_sq - np.square(self._sum) / n) / (n - 1)  # 无偏方差
+        h = np.sqrt(np.maximum(var, 0)) * n ** (-1 / 5)  # Scott带宽
+        width = self._width[..., None]
+        h = np.maximum(h[..., None], width / 2)  # 带宽不小于区间宽度的一半
+        bins = self.counts.shape[-1]
+        offset = np.arange(-bins + 1, bins) * width
+        kernel = np.exp(-0.5 * np.square(offset / h)) / (h * np.sqrt(2 * np.pi))
+        grid_density = signal.fftconvolve(self.counts, kernel, mode="same", axes=-1) / n
+        return self._interp(points, np.maximum(grid_density, 0))
+
+    # ----------------------------------------------------------------------------------------#
+    def reservoir_kde(self, points: np.ndarray) -> np.ndarray:
+        """
+        对蓄水池样本做精确高斯核密度估计
+
+        参数:
+        --------
+        points : np.ndarray
+            幅值域采样点
+
+        返回:
+        --------
+        pdf : np.ndarray
+            概率密度, 形状为shape+(len(points),)
+        """
+        if self._sampler is None:
+            raise ValueError("未启用蓄水池采样, 需设置reservoir>0")
+        return self._sampler.kde(points)
 
 
 # --------------------------------------------------------------------------------------------#
@@ -172,8 +627,14 @@ class Time_Analysis(Analysis):
         估计信号的概率密度函数
     Trend(Feature: str, step: float, SegLength: float) -> np.ndarray
         计算信号指定统计特征的时间趋势
-    Autocorr(std: bool = False, both: bool = False) -> np.ndarray
+    Trends(step: float, SegLength: float, Features: list = None) -> dict
+        一次计算信号多个统计特征的时间趋势
+    Autocorr(std: bool = False, both: bool = False, max_lag: float = None, method: str = "fft") -> np.ndarray
         计算信号自相关
+    Crosscorr(pairs: list = None, max_lag: float = None, weight: str = "none") -> np.ndarray
+        计算多通道信号通道对之间的(广义)互相关
+    Time_delay(pairs: list = None, max_lag: float = None, weight: str = "phat") -> np.ndarray
+        估计多通道信号通道对之间的到达时间差
     """
 
     @Analysis.Input({"Sig": {}})
@@ -190,8 +651,20 @@ class Time_Analysis(Analysis):
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
-    @Analysis.Input({"samples": {"Low": 20}})
-    def Pdf(self, samples: int = 100, AmpRange: Optional[tuple] = None) -> np.ndarray:
+    @Analysis.Input(
+        {
+            "samples": {"Low": 20},
+            "method": {"Content": ("kde", "binned_kde", "hist", "reservoir")},
+            "reservoir": {"Low": 2},
+        }
+    )
+    def Pdf(
+        self,
+        samples: int = 100,
+        AmpRange: Optional[tuple] = None,
+        method: str = "kde",
+        reservoir: int = 100000,
+    ) -> np.ndarray:
         """
         估计信号的概率密度函数(PDF)
 
@@ -201,6 +674,14 @@ class Time_Analysis(Analysis):
             PDF的幅值域采样点数
         AmpRange : tuple, 可选
             PDF的幅值域范围, 默认为信号数据的最值
+        method : str, 默认为"kde"
+            估计方法, 可选:
+                        "kde": 全部数据的高斯核密度估计, O(N*samples)
+                        "binned_kde": 直方图与高斯核FFT卷积的分箱核密度估计
+                        "hist": 以幅值域采样点为区间中心的直方图密度
+                        "reservoir": 蓄水池随机采样后的精确高斯核密度估计
+        reservoir : int, 默认为100000
+            "reservoir"方法的采样点数
 
         返回:
         --------
@@ -211,37 +692,51 @@ class Time_Analysis(Analysis):
         """
         # 初始化
         data = self.Sig.data
+        N = self.Sig.N
         # 计算概率密度函数
-        density = stats.gaussian_kde(data)  # 核密度估计
+        data_min, data_max = np.min(data), np.max(data)
         if AmpRange is not None:
             amp_Axis = np.linspace(AmpRange[0], AmpRange[1], samples, endpoint=False)
         else:
-            amp_Axis = np.linspace(min(data), max(data), samples, endpoint=False)
-        pdf = density(amp_Axis)  # 概率密度函数采样
+            amp_Axis = np.linspace(data_min, data_max, samples, endpoint=False)
+        if method == "kde":
+            pdf = np.stack(
+                [
+                    stats.gaussian_kde(ch_data)(amp_Axis)  # 核密度估计, 并采样概率密度函数
+                    for ch_data in data.reshape(-1, N)
+                ]
+            ).reshape(data.shape[:-1] + (samples,))  # 多通道信号逐通道估计
+            return amp_Axis, pdf
+        # 其余方法分块累积, 内存占用与信号长度无关
+        shape = data.shape[:-1]
+        if method == "hist":
+            width = amp_Axis[1] - amp_Axis[0]
+            acc = HistAccumulator(
+                amp_Axis[0] - width / 2, amp_Axis[-1] + width / 2, samples, shape=shape
+            )  # 区间中心为幅值域采样点
+        elif method == "binned_kde":
+            # 各通道直方图范围取各自的最值, 多通道结果与逐通道计算一致
+            low = np.minimum(np.min(data, axis=-1), amp_Axis[0])
+            high = np.maximum(np.max(data, axis=-1), amp_Axis[-1])
+            high = high + (high - low) * 1e-9  # 使最大值落入末区间
+            acc = HistAccumulator(low, high, shape=shape)
+        else:
+            acc = ReservoirSampler(reservoir, shape)
+        for i in range(0, N, CHUNK_SIZE):
+            acc.update(data[..., i : i + CHUNK_SIZE])
+        if method == "hist":
+            pdf = acc.density(amp_Axis)
+        elif method == "binned_kde":
+            pdf = acc.binned_kde(amp_Axis)
+        else:
+            pdf = acc.kde(amp_Axis)
         return amp_Axis, pdf
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
     @Analysis.Input(
         {
-            "Feature": {
-                "Content": [
-                    "均值",
-                    "方差",
-                    "标准差",
-                    "均方值",
-                    "方根幅值",
-                    "平均幅值",
-                    "有效值",
-                    "峰值",
-                    "波形指标",
-                    "峰值指标",
-                    "脉冲指标",
-                    "裕度指标",
-                    "偏度指标",
-                    "峭度指标",
-                ]
-            },
+            "Feature": {"Content": TREND_FEATURES},
             "step": {"OpenLow": 0},
             "SegLength": {"OpenLow": 0},
         }
@@ -271,52 +766,77 @@ class Time_Analysis(Analysis):
         trend : np.ndarray
             统计特征的时间趋势
         """
+        t_Axis, trends = self.Trends(step, SegLength, Features=[Feature])
+        return t_Axis, trends[Feature]
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Input({"step": {"OpenLow": 0}, "SegLength": {"OpenLow": 0}})
+    def Trends(
+        self, step: float, SegLength: float, Features: Optional[list] = None
+    ) -> dict:
+        """
+        一次计算信号多个统计特征的时间趋势, 各特征共享分段的均值、平方、绝对值等中间矩
+
+        参数:
+        --------
+        step : float
+            时间趋势采样步长
+        SegLength : float
+            时间趋势采样段长
+        Features : list, 可选
+            统计特征指标列表, 可选项同Trend, 默认为全部指标
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            时间轴
+        trends : dict
+            以特征名为键的时间趋势字典, 多通道信号时各趋势前置通道轴
+        """
         # 初始化
         data = self.Sig.data
         N = self.Sig.N
         fs = self.Sig.fs
-        t_Axis = self.Sig.t_Axis
+        Features = list(TREND_FEATURES) if Features is None else list(Features)
+        for Feature in Features:
+            if Feature not in TREND_FEATURES:
+                raise ValueError(f"不支持的特征指标{Feature}")
         # 计算时域统计特征趋势
-        step_idx = range(0, N, int(step * fs))  # 步长索引
+        stepNum = int(step * fs)
         SegNum = int(SegLength * fs)
-        seg_data = np.asarray(
-            [data[i : i + SegNum] for i in step_idx if i + SegNum <= N]
-        )  # 按步长切分数据成(N%step_idx)*SegNum的二维数组
-        t_Axis = t_Axis[:: step_idx[1]][: len(seg_data)]  # 与seg_data对应的时间轴
-        # 计算趋势
-        Feature_func = {
-            # 常用统计特征
-            "均值": np.mean,
-            "方差": np.var,
-            "标准差": np.std,
-            "均方值": lambda x, axis: np.mean(np.square(x), axis=axis),
-            # 有量纲参数指标
-            "方根幅值": lambda x, axis: np.square(
-                np.mean(np.sqrt(np.abs(x)), axis=axis)
-            ),
-            "平均幅值": lambda x, axis: np.mean(np.abs(x), axis=axis),
-            "有效值": lambda x, axis: np.sqrt(np.mean(np.square(x), axis=axis)),
-            "峰值": lambda x, axis: np.max(np.abs(x), axis=axis),
-            # 无量纲参数指标
-            "波形指标": lambda x, axis: np.sqrt(np.mean(np.square(x), axis=axis))
-            / np.mean(np.abs(x), axis=axis),
-            "峰值指标": lambda x, axis: np.max(np.abs(x), axis=axis)
-            / np.sqrt(np.mean(np.square(x), axis=axis)),
-            "脉冲指标": lambda x, axis: np.max(np.abs(x), axis=axis)
-            / np.mean(np.abs(x), axis=axis),
-            "裕度指标": lambda x, axis: np.max(np.abs(x), axis=axis)
-            / np.square(np.mean(np.sqrt(np.abs(x)), axis=axis)),
-            "偏度指标": stats.skew,
-            "峭度指标": stats.kurtosis,
+        if stepNum < 1 or SegNum < 1:
+            raise ValueError("趋势采样步长或段长小于信号采样间隔")
+        if SegNum > N:
+            raise ValueError(f"趋势采样段长{SegLength}超过信号时长")
+        # 按步长切分数据成(分段数, SegNum)的零拷贝视图, 多通道时前置通道轴
+        seg_view = np.lib.stride_tricks.sliding_window_view(data, SegNum, axis=-1)
+        seg_view = seg_view[..., ::stepNum, :]
+        step_idx = np.arange(seg_view.shape[-2]) * stepNum  # 各完整分段的起始索引
+        t_Axis = self.Sig.t0 + step_idx * self.Sig.dt  # 与各分段对应的时间轴
+        # 分块计算趋势, 限制中间结果内存占用, 内存映射信号按块读取
+        block = max(1, CHUNK_SIZE // SegNum)  # 每块分段数
+        trends = {Feature: [] for Feature in Features}
+        for j in range(0, len(step_idx), block):
+            seg_trends = _trend_features(seg_view[..., j : j + block, :], Features)
+            for Feature in Features:
+                trends[Feature].append(seg_trends[Feature])
+        trends = {
+            Feature: np.concatenate(trend, axis=-1) for Feature, trend in trends.items()
         }
-        if Feature not in Feature_func.keys():
-            raise ValueError(f"不支持的特征指标{Feature}")
-        trend = Feature_func[Feature](seg_data, axis=1)
-        return t_Axis, trend
+        return t_Axis, trends
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
-    def Autocorr(self, std: bool = False, both: bool = False) -> np.ndarray:
+    @Analysis.Input(
+        {"max_lag": {"CloseLow": 0}, "method": {"Content": ("fft", "direct")}}
+    )
+    def Autocorr(
+        self,
+        std: bool = False,
+        both: bool = False,
+        max_lag: Optional[float] = None,
+        method: str = "fft",
+    ) -> np.ndarray:
         """
         计算信号自相关
 
@@ -326,6 +846,12 @@ class Time_Analysis(Analysis):
             是否标准化得自相关系数
         both : bool, 默认为False
             是否返回双边自相关
+        max_lag : float, 可选
+            最大延迟时间, 默认为信号时长
+        method : str, 默认为"fft"
+            计算方法, 可选:
+                        "fft": 零填充FFT法, O(NlogN)
+                        "direct": 直接卷积法
         
         返回:
         --------
@@ -336,20 +862,128 @@ class Time_Analysis(Analysis):
         """
         # 初始化
         data = self.Sig.data
+        data = data.astype(float_dtype(data), copy=False)
         N = self.Sig.N
-        t_Axis = self.Sig.t_Axis
-        # 计算自相关
-        R = np.correlate(data, data, mode="full")  # 卷积
-        corr = R / N  # 自相关函数
+        L = N - 1 if max_lag is None else min(int(max_lag * self.Sig.fs), N - 1)
+        t_Axis = self.Sig.t_Axis[: L + 1]
+        # 计算0~L延迟的单边自相关
+        if method == "fft":
+            corr = fft_autocorr(data, L)
+        else:
+            if data.ndim == 1:
+                R = np.correlate(data, data, mode="full")  # 卷积
+            else:
+                R = signal.fftconvolve(
+                    data, data[..., ::-1], mode="full", axes=-1
+                )  # 多通道信号沿时间轴批量卷积
+            corr = R[..., N - 1 : N + L] / N  # 自相关函数
         if std is True:
-            corr /= np.var(data)  # 标准化得自相关系数
+            corr /= np.var(data, axis=-1, keepdims=True)  # 标准化得自相关系数
         # 后处理
-        if both is False:
-            corr = corr[-1 * N :]  # 只取0~T部分
-        else:
+        if both is True:
+            corr = np.concatenate((np.conj(corr[..., :0:-1]), corr), axis=-1)  # 共轭对称
             t_Axis = np.concatenate((-1 * t_Axis[::-1], t_Axis[1:]))  # t=-T~T
         return t_Axis, corr
 
+    # ----------------------------------------------------------------------------------------#
+    def _crosscorr(
+        self, pairs: Optional[list], max_lag: Optional[float], weight: str
+    ) -> tuple:
+        # 各通道零填充频谱经缓存共享, 不随通道对重复计算
+        data = self.Sig.data
+        if data.ndim != 2:
+            raise ValueError("互相关分析需输入多通道信号SignalArray")
+        N = self.Sig.N
+        L = N - 1 if max_lag is None else min(int(max_lag * self.Sig.fs), N - 1)
+        dtype = float_dtype(data)
+        nfft = fft.next_fast_len(N + L)
+        spec = self.Sig.cached(
+            ("rfft", "矩形窗", dtype, nfft),
+            lambda: fft.rfft(data.astype(dtype, copy=False), nfft),
+        )
+        pairs = _pair_index(len(data), pairs)
+        corr = _crosscorr_from_spec(spec, nfft, N, pairs, L, weight)
+        t_Axis = np.arange(-L, L + 1) * self.Sig.dt
+        return pairs, t_Axis, corr
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Plot("1D", plot_spectrum)
+    @Analysis.Input(
+        {"max_lag": {"CloseLow": 0}, "weight": {"Content": ("none", "phat")}}
+    )
+    def Crosscorr(
+        self,
+        pairs: Optional[list] = None,
+        max_lag: Optional[float] = None,
+        weight: str = "none",
+    ) -> np.ndarray:
+        """
+        计算多通道信号通道对之间的(广义)互相关, 正延迟表示通道i滞后于通道j
+
+        参数:
+        --------
+        pairs : list, 可选
+            通道对索引列表[(i, j), ...], 默认为全部i<j通道对
+        max_lag : float, 可选
+            最大延迟时间, 默认为信号时长
+        weight : str, 默认为"none"
+            互谱加权方式, 可选:
+                        "none": 普通互相关, 按N有偏归一化
+                        "phat": 相位变换加权的广义互相关(GCC-PHAT)
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            延迟时间轴
+        corr : np.ndarray
+            互相关, 按通道对顺序排列
+        """
+        _, t_Axis, corr = self._crosscorr(pairs, max_lag, weight)
+        return t_Axis, corr
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Input(
+        {"max_lag": {"CloseLow": 0}, "weight": {"Content": ("none", "phat")}}
+    )
+    def Time_delay(
+        self,
+        pairs: Optional[list] = None,
+        max_lag: Optional[float] = None,
+        weight: str = "phat",
+    ) -> np.ndarray:
+        """
+        由互相关峰值估计通道对之间的到达时间差, 峰值邻域抛物线插值得亚采样点精度
+
+        参数:
+        --------
+        pairs : list, 可选
+            通道对索引列表[(i, j), ...], 默认为全部i<j通道对
+        max_lag : float, 可选
+            最大延迟时间, 默认为信号时长
+        weight : str, 默认为"phat"
+            互谱加权方式, 可选: "none", "phat"
+
+        返回:
+        --------
+        pairs : np.ndarray
+            通道对索引, 形状为(通道对数, 2)
+        tau : np.ndarray
+            通道i相对通道j的时延
+        """
+        pairs, _, corr = self._crosscorr(pairs, max_lag, weight)
+        L = (corr.shape[-1] - 1) // 2
+        k = np.argmax(corr, axis=-1)
+        # 峰值及其左右相邻点, 边界处以峰值自身代替
+        rows = np.arange(len(corr))
+        y0 = corr[rows, np.maximum(k - 1, 0)]
+        y1 = corr[rows, k]
+        y2 = corr[rows, np.minimum(k + 1, 2 * L)]
+        denom = y0 - 2 * y1 + y2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = np.where(denom < 0, 0.5 * (y0 - y2) / denom, 0)
+        tau = (k - L + np.clip(delta, -0.5, 0.5)) * self.Sig.dt
+        return pairs, tau
+
 
 # --------------------------------------------------------------------------------------------#
 class Frequency_Analysis(Analysis):
@@ -380,14 +1014,18 @@ class Frequency_Analysis(Analysis):
     --------
     ft() -> np.ndarray
         计算信号的双边频谱  
-    Cft(WinType: str = "矩形窗") -> np.ndarray
+    Cft(WinType: str = "矩形窗", fast_len: bool = False, workers: int = None) -> np.ndarray
         计算信号的单边傅里叶级数谱幅值  
-    Psd(WinType: str = "矩形窗", density: bool = False, both: bool = False) -> np.ndarray
+    Psd(WinType: str = "矩形窗", density: bool = False, both: bool = False, fast_len: bool = False, workers: int = None) -> np.ndarray
         计算信号的功率谱密度
+    Psd_welch(nperseg: int, nhop: int = None, WinType: str = "汉宁窗", average: str = "mean", density: bool = True, both: bool = False) -> np.ndarray
+        Welch法分段平均计算信号的功率谱密度
     Psd_corr(density: bool = False, both: bool = False) -> np.ndarray
         自相关法计算信号的功率谱密度
-    HTenve_spectra() -> np.ndarray
+    HTenve_spectra(fast_len: bool = False, workers: int = None) -> np.ndarray
         计算信号的希尔伯特包络谱
+    Band_enve_spectra(bands: list, f_max: float = None, fast_len: bool = True, workers: int = None) -> np.ndarray
+        由一次正变换批量计算多个频带的窄带包络谱
     """
 
     @Analysis.Input({"Sig": {}})
@@ -402,6 +1040,52 @@ class Frequency_Analysis(Analysis):
         # 该分析类的特有参数
         # ------------------------------------------------------------------------------------#
 
+    # ----------------------------------------------------------------------------------------#
+    def _rfft(
+        self,
+        WinType: str,
+        win_data: Optional[np.ndarray],
+        fast_len: bool,
+        workers: Optional[int],
+    ) -> tuple:
+        """
+        单边频谱计算引擎, 实信号加窗后做实数FFT, 结果按窗类型、精度与变换长度缓存
+
+        参数:
+        --------
+        WinType : str
+            加窗类型, 用作缓存键
+        win_data : np.ndarray, 可选
+            窗函数序列, 为None时不加窗
+        fast_len : bool
+            是否零填充至快速变换长度
+        workers : int, 可选
+            FFT并行线程数
+
+        返回:
+        --------
+        f_Axis : np.ndarray
+            变换长度对应的双边频率轴
+        rfft_data : np.ndarray
+            未归一化的单边频谱, 长度为nfft//2+1
+        """
+        data = self.Sig.data
+        N = self.Sig.N
+        dtype = float_dtype(data)
+        nfft = fft.next_fast_len(N, real=True) if fast_len else N
+        if win_data is None:
+            func = lambda: fft.rfft(data.astype(dtype, copy=False), nfft, workers=workers)
+        else:
+            func = lambda: fft.rfft(
+                data.astype(dtype, copy=False) * win_data, nfft, workers=workers
+            )
+        rfft_data = self.Sig.cached(("rfft", WinType, dtype, nfft), func)
+        if nfft == N:
+            f_Axis = self.Sig.f_Axis
+        else:
+            f_Axis = np.linspace(0, self.Sig.fs, nfft, endpoint=False)
+        return f_Axis, rfft_data
+
     # ----------------------------------------------------------------------------------------#
     def ft(self) -> np.ndarray:
         """
@@ -419,16 +1103,27 @@ class Frequency_Analysis(Analysis):
         N = self.Sig.N
         fs = self.Sig.fs
         dt = self.Sig.dt
+        dtype = float_dtype(data)
         # 计算能量信号的双边频谱密度
-        ft_data = fft.fft(data) / fs  # (DFT/N)/df=DFT/fs
+        ft_data = (
+            self.Sig.cached(
+                ("fft", "矩形窗", dtype), lambda: fft.fft(data.astype(dtype, copy=False))
+            )
+            / fs
+        )  # (DFT/N)/df=DFT/fs
         # 后处理
-        ft_data = fft.fftshift(ft_data)  # 频谱中心化
+        ft_data = fft.fftshift(ft_data, axes=-1)  # 频谱中心化
         f_Axis = fft.fftshift(fft.fftfreq(N, dt))
         return f_Axis, ft_data
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
-    def Cft(self, WinType: str = "矩形窗") -> np.ndarray:
+    def Cft(
+        self,
+        WinType: str = "矩形窗",
+        fast_len: bool = False,
+        workers: Optional[int] = None,
+    ) -> np.ndarray:
         """
         计算信号的单边傅里叶级数谱幅值
 
@@ -439,6 +1134,10 @@ class Frequency_Analysis(Analysis):
                         "矩形窗", "汉宁窗", "海明窗", 
                         "巴特利特窗", "布莱克曼窗", 
                         "自定义窗"
+        fast_len : bool, 默认为False
+            是否零填充至scipy.fft.next_fast_len快速变换长度, 频率轴随变换长度加密
+        workers : int, 可选
+            FFT并行线程数, 默认使用scipy.fft的全局设置
         
         返回:
         --------
@@ -450,20 +1149,25 @@ class Frequency_Analysis(Analysis):
         # 初始化
         data = self.Sig.data
         N = self.Sig.N
+        dtype = float_dtype(data)
         # 计算功率信号的单边傅里叶级数谱
-        scale, _, win_data = window(type=WinType, num=N)
-        windowed_data = data * win_data  # 加窗
-        dft_data = fft.fft(windowed_data) / N * scale  # /N排除窗截断对功率的影响
-        Amp = np.abs(dft_data)
+        scale, _, win_data = window(type=WinType, num=N, dtype=dtype)
+        f_Axis, rfft_data = self._rfft(WinType, win_data, fast_len, workers)
+        Amp = np.abs(rfft_data) * (scale / N)  # 加窗, /N排除窗截断对功率的影响
         # 后处理
-        f_Axis = self.Sig.f_Axis[: N // 2]
-        Amp = 2 * Amp[: len(f_Axis)]
+        f_Axis = f_Axis[: len(f_Axis) // 2]
+        Amp = 2 * Amp[..., : len(f_Axis)]
         return f_Axis, Amp
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
     def Psd(
-        self, WinType: str = "矩形窗", density: bool = True, both: bool = False
+        self,
+        WinType: str = "矩形窗",
+        density: bool = True,
+        both: bool = False,
+        fast_len: bool = False,
+        workers: Optional[int] = None,
     ) -> np.ndarray:
         """
         计算信号的功率谱密度
@@ -479,6 +1183,10 @@ class Frequency_Analysis(Analysis):
             是否计算谱密度
         both : bool, 默认为False
             是否返回双边功率谱
+        fast_len : bool, 默认为False
+            是否零填充至scipy.fft.next_fast_len快速变换长度, 频率轴随变换长度加密
+        workers : int, 可选
+            FFT并行线程数, 默认使用scipy.fft的全局设置
 
         返回:
         --------
@@ -491,18 +1199,132 @@ class Frequency_Analysis(Analysis):
         data = self.Sig.data
         N = self.Sig.N
         df = self.Sig.df
-        f_Axis = self.Sig.f_Axis
+        dtype = float_dtype(data)
         # 周期图法计算功率谱
-        _, scale, win_data = window(type=WinType, num=N)
-        windowed_data = data * win_data
-        fft_data = fft.fft(windowed_data) / N  # 双边幅值谱
-        power = np.square(np.abs(fft_data)) * scale  # 双边功率谱
+        _, scale, win_data = window(type=WinType, num=N, dtype=dtype)
+        f_Axis, rfft_data = self._rfft(WinType, win_data, fast_len, workers)
+        power = (np.square(rfft_data.real) + np.square(rfft_data.imag)) * (
+            scale / N**2
+        )  # 加窗单边频点上的双边功率谱
         if density is True:
             power /= df  # 双边功率谱密度
         # 后处理
+        nfft = len(f_Axis)
+        if both is False:  # 双边功率谱转单边
+            f_Axis = f_Axis[: nfft // 2]
+            power = 2 * power[..., : len(f_Axis)]
+        else:  # 实信号双边谱共轭对称
+            power = np.concatenate(
+                (power, power[..., 1 : (nfft + 1) // 2][..., ::-1]), axis=-1
+            )
+        return f_Axis, power
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Plot("1D", plot_spectrum)
+    @Analysis.Input(
+        {
+            "nperseg": {"Low": 2},
+            "nhop": {"Low": 1},
+            "average": {"Content": ("mean", "median")},
+        }
+    )
+    def Psd_welch(
+        self,
+        nperseg: int,
+        nhop: Optional[int] = None,
+        WinType: str = "汉宁窗",
+        average: str = "mean",
+        density: bool = True,
+        both: bool = False,
+    ) -> np.ndarray:
+        """
+        Welch法分段加窗平均计算信号的功率谱密度, 分段按块批量变换, 内存占用上限固定
+
+        参数:
+        --------
+        nperseg : int
+            段长
+        nhop : int, 可选
+            段移, 默认为nperseg//2
+        WinType : str, 默认为"汉宁窗"
+            加窗类型, 可选:
+                        "矩形窗", "汉宁窗", "海明窗",
+                        "巴特利特窗", "布莱克曼窗",
+                        "自定义窗"
+        average : str, 默认为"mean"
+            各段功率谱的平均方式, 可选:
+                        "mean": 算术平均
+                        "median": 中位数, 经偏差修正, 对冲击等异常段稳健
+        density : bool, 默认为True
+            是否计算谱密度
+        both : bool, 默认为False
+            是否返回双边功率谱
+
+        返回:
+        --------
+        f_Axis : np.ndarray
+            频率轴
+        power : np.ndarray
+            功率谱密度
+        """
+        # 初始化
+        data = self.Sig.data
+        N = self.Sig.N
+        fs = self.Sig.fs
+        nhop = nperseg // 2 if nhop is None else nhop
+        if nperseg > N:
+            raise ValueError(f"段长{nperseg}超过信号长度{N}")
+        dtype = float_dtype(data)
+        _, scale, win_data = window(type=WinType, num=nperseg, dtype=dtype)
+        # 分段为零拷贝视图, 多通道时前置通道轴
+        segs = np.lib.stride_tricks.sliding_window_view(data, nperseg, axis=-1)
+        segs = segs[..., ::nhop, :]
+        seg_num = segs.shape[-2]
+        nfreq = nperseg // 2 + 1
+        block = max(1, CHUNK_SIZE // nperseg)  # 每块分段数
+
+        def seg_power(j: int, k: int = 0, band: int = nfreq) -> np.ndarray:
+            # 第j块各分段在频点k:k+band内的单边幅值平方谱
+            X = fft.rfft(segs[..., j : j + block, :] * win_data)[..., k : k + band]
+            X /= nperseg
+            return np.square(X.real) + np.square(X.imag)
+
+        # ------------------------------------------------------------------------------------#
+        # 分块计算各段功率谱并平均
+        if average == "mean":
+            power = np.zeros(data.shape[:-1] + (nfreq,), dtype=dtype)
+            for j in range(0, seg_num, block):
+                power += np.sum(seg_power(j), axis=-2)
+            power /= seg_num
+        else:
+            # 中位数需全部分段的功率谱, 缓存超过MEDIAN_BUFFER_SIZE点时按频带分多遍计算:
+            # 每遍对各段做一次FFT并保留频带内全部频点, 遍数为ceil(总点数/MEDIAN_BUFFER_SIZE),
+            # 计算量为遍数倍的全部分段FFT
+            lead = data.shape[:-1]
+            passes = -(-int(np.prod(lead)) * seg_num * nfreq // MEDIAN_BUFFER_SIZE)
+            band = -(-nfreq // max(1, min(passes, nfreq)))
+            power = np.empty(lead + (nfreq,), dtype=dtype)
+            band_power = np.empty(lead + (seg_num, band), dtype=dtype)
+            for k in range(0, nfreq, band):
+                width = min(band, nfreq - k)
+                for j in range(0, seg_num, block):
+                    band_power[..., j : j + block, :width] = seg_power(j, k, width)
+                power[..., k : k + width] = np.median(band_power[..., :width], axis=-2)
+            # 中位数相对均值的偏差修正, 同scipy.signal.welch
+            ii_2 = 2 * np.arange(1.0, (seg_num - 1) // 2 + 1)
+            power /= 1 + np.sum(1.0 / (ii_2 + 1) - 1.0 / ii_2)
+        power *= scale  # 双边功率谱
+        if density is True:
+            power /= fs / nperseg  # 双边功率谱密度
+        # 后处理
+        f_Axis = np.arange(nperseg) * (fs / nperseg)
         if both is False:  # 双边功率谱转单边
-            f_Axis = f_Axis[: N // 2]
-            power = 2 * power[: len(f_Axis)]
+            f_Axis = f_Axis[: nperseg // 2]
+            power = 2 * power[..., : len(f_Axis)]
+        else:  # 实信号双边谱共轭对称
+            power = np.concatenate(
+                (power, power[..., 1 : (nperseg + 1) // 2][..., ::-1]), axis=-1
+            )
         return f_Axis, power
 
     # ----------------------------------------------------------------------------------------#
@@ -535,18 +1357,27 @@ class Frequency_Analysis(Analysis):
         if density is True:
             power /= df  # 双边功率谱密度
         # 后处理
-        f_Axis = np.linspace(0, fs, len(power), endpoint=False)
+        f_Axis = np.linspace(0, fs, power.shape[-1], endpoint=False)
         if both is False:  # 双边功率谱转单边
             f_Axis = f_Axis[: int(fs / 2 / f_Axis[1])]
-            power = 2 * power[: len(f_Axis)]
+            power = 2 * power[..., : len(f_Axis)]
         return f_Axis, power
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("1D", plot_spectrum)
-    def HTenve_spectra(self):
+    def HTenve_spectra(
+        self, fast_len: bool = False, workers: Optional[int] = None
+    ) -> np.ndarray:
         """
         计算信号的希尔伯特包络谱
 
+        参数:
+        --------
+        fast_len : bool, 默认为False
+            是否零填充至scipy.fft.next_fast_len快速变换长度, 频率轴随变换长度加密
+        workers : int, 可选
+            FFT并行线程数, 默认使用scipy.fft的全局设置
+
         返回:
         --------
         f_Axis : np.ndarray
@@ -555,19 +1386,127 @@ class Frequency_Analysis(Analysis):
             希尔伯特包络谱
         """
         # 初始化
-        data = self.Sig.data
         N = self.Sig.N
-        f_Axis = self.Sig.f_Axis
-        # 计算解析信号
-        analyze = signal.hilbert(data)
+        # 由缓存单边频谱计算解析信号, 同signal.hilbert
+        f_Axis, rfft_data = self._rfft("矩形窗", None, fast_len, workers)
+        nfft = len(f_Axis)
+        h = np.full(rfft_data.shape[-1], 2, dtype=rfft_data.real.dtype)
+        h[0] = 1
+        if nfft % 2 == 0:
+            h[-1] = 1
+        analyze = fft.ifft(rfft_data * h, nfft, workers=workers)[..., :N]  # 负频率补零
         envelop = np.abs(analyze)  # 希尔伯特包络幅值
-        spectra = np.abs(fft.fft(envelop)) / N
+        spectra = np.abs(fft.rfft(envelop, nfft, workers=workers)) / N
         # 后处理
-        f_Axis = f_Axis[: N // 2]
-        spectra = 2 * spectra[: len(f_Axis)]
+        f_Axis = f_Axis[: nfft // 2]
+        spectra = 2 * spectra[..., : len(f_Axis)]
+        return f_Axis, spectra
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Plot("1D", plot_spectrum)
+    @Analysis.Input({"bands": {}, "f_max": {"OpenLow": 0}})
+    def Band_enve_spectra(
+        self,
+        bands: list,
+        f_max: Optional[float] = None,
+        fast_len: bool = True,
+        workers: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        由一次正变换批量计算多个频带的窄带包络谱, 各频带在频域理想带通并移频至基带,
+        以短长度逆变换得到抽取后的解析信号, 计算量约为一次全频带FFT
+
+        参数:
+        --------
+        bands : list
+            频带列表, 每项为(下限频率, 上限频率), 单位Hz, 范围为[0, fs/2]
+        f_max : float, 可选
+            包络谱的最大频率, 默认为最宽频带的带宽
+        fast_len : bool, 默认为True
+            是否零填充至快速变换长度
+        workers : int, 可选
+            FFT并行线程数, 默认使用scipy.fft的全局设置
+
+        返回:
+        --------
+        f_Axis : np.ndarray
+            包络谱频率轴
+        spectra : np.ndarray
+            各频带的包络谱, 形状为(..., 频带数, 频点数)
+        """
+        # 初始化
+        N = self.Sig.N
+        fs = self.Sig.fs
+        f_Axis, rfft_data = self._rfft("矩形窗", None, fast_len, workers)
+        nfft = len(f_Axis)
+        df = fs / nfft
+        bins = []  # 各频带的起止谱线
+        for low, high in bands:
+            if not 0 <= low < high <= fs / 2:
+                raise ValueError(f"频带({low}, {high})超出范围[0, {fs / 2}]")
+            bins.append((int(np.ceil(low / df)), int(np.floor(high / df)) + 1))
+        width = max(k2 - k1 for k1, k2 in bins)
+        if f_max is not None:
+            width = max(width, int(np.ceil(f_max / df)))
+        # 基带解析谱长度为带宽2倍以上, 包络平方的谱不混叠
+        M = fft.next_fast_len(2 * width)
+        # ------------------------------------------------------------------------------------#
+        # 各频带谱线移至基带, 正频率乘2构成解析信号谱, 一次批量逆变换
+        base = np.zeros(rfft_data.shape[:-1] + (len(bins), M), dtype=rfft_data.dtype)
+        for b, (k1, k2) in enumerate(bins):
+            base[..., b, : k2 - k1] = rfft_data[..., k1:k2]
+        base *= 2
+        analyze = fft.ifft(base, workers=workers) * (M / nfft)  # 抽取nfft/M倍
+        L = int(np.ceil(N * M / nfft))  # 原信号时长内的抽取点数
+        envelop = np.abs(analyze[..., :L])  # 窄带包络幅值, 与移频无关
+        spectra = np.abs(fft.rfft(envelop, M, workers=workers)) / L
+        # 后处理
+        f_Axis = np.arange(M // 2) * df  # 抽取后采样频率为M*df, 频率分辨率不变
+        if f_max is not None:
+            f_Axis = f_Axis[f_Axis <= f_max]
+        spectra = 2 * spectra[..., : len(f_Axis)]
         return f_Axis, spectra
 
 
+# --------------------------------------------------------------------------------------------#
+def _overlap_add(out: np.ndarray, segs: np.ndarray, start: int, nhop: int) -> None:
+    """
+    将连续的帧序列segs(..., 帧数, nperseg)从第start帧起以nhop为步移重叠相加至out,
+    out形状为(..., 总帧数-1+r, nhop), r=ceil(nperseg/nhop), 仅循环r次
+    """
+    num, nperseg = segs.shape[-2:]
+    r = -(-nperseg // nhop)
+    if r * nhop != nperseg:  # 帧长补零至nhop的整数倍
+        segs = np.concatenate(
+            (segs, np.zeros(segs.shape[:-1] + (r * nhop - nperseg,), segs.dtype)),
+            axis=-1,
+        )
+    segs = segs.reshape(segs.shape[:-1] + (r, nhop))
+    for q in range(r):  # 各帧第q个nhop子段同时叠加至第start+q起的子段
+        out[..., start + q : start + q + num, :] += segs[..., q, :]
+
+
+@lru_cache(maxsize=4)
+def _ola_envelope(
+    WinType: str, nperseg: int, nhop: int, num_frames: int, dtype: str
+) -> np.ndarray:
+    """
+    计算ISTFT重叠相加的窗函数平方和归一化包络, 按(WinType, nperseg, nhop, num_frames)缓存
+    """
+    _, _, win = window(type=WinType, num=nperseg, dtype=dtype)
+    # 检查窗口是否满足 NOLA 条件。因为默认ISTFT后归一化，所以不检查COLA条件
+    if not signal.check_NOLA(win, nperseg, nperseg - nhop):
+        raise ValueError(
+            f"输入的stft参数nhop={nhop}不满足非零重叠加 (NOLA) 条件，无法完整重构"
+        )
+    r = -(-nperseg // nhop)
+    env = np.zeros((num_frames - 1 + r, nhop), dtype=dtype)
+    _overlap_add(env, np.broadcast_to(win**2, (num_frames, nperseg)), 0, nhop)
+    env = env.reshape(-1)[: nhop * (num_frames - 1) + nperseg]
+    env.flags.writeable = False  # 缓存共享的包络只读
+    return env
+
+
 # --------------------------------------------------------------------------------------------#
 class TimeFre_Analysis(Analysis):
     """
@@ -595,11 +1534,11 @@ class TimeFre_Analysis(Analysis):
     
     方法:
     --------
-    stft(nperseg: int, nhop: int, WinType: str = "矩形窗") -> np.ndarray
+    stft(nperseg: int, nhop: int, WinType: str = "矩形窗", workers: int = None, out: np.ndarray = None) -> np.ndarray
         计算信号的短时傅里叶变换频谱
-    st_Cft(nperseg: int, nhop: int, WinType: str = "矩形窗") -> np.ndarray
+    st_Cft(nperseg: int, nhop: int, WinType: str = "矩形窗", workers: int = None, out: np.ndarray = None, dtype: str = None) -> np.ndarray
         计算信号的短时单边傅里叶级数谱幅值
-    istft(stft_data: np.ndarray, fs: int, nhop: int, WinType: str = "矩形窗") -> np.ndarray
+    istft(stft_data: np.ndarray, fs: int, nhop: int, WinType: str = "矩形窗", workers: int = None) -> np.ndarray
         根据STFT数据重构时域信号
     """
 
@@ -616,10 +1555,75 @@ class TimeFre_Analysis(Analysis):
         # ------------------------------------------------------------------------------------#
 
     # ----------------------------------------------------------------------------------------#
-    @Analysis.Input({"nperseg": {"Low": 20}, "nhop": {"Low": 1}})
-    def stft(self, nperseg: int, nhop: int, WinType: str = "矩形窗") -> np.ndarray:
+    def _stft_blocks(
+        self, nperseg: int, nhop: int, WinType: str, workers: Optional[int]
+    ):
         """
-        计算信号的短时傅里叶变换频谱
+        按帧块产出STFT单边频谱(起始帧号, rfft/nperseg), 第i帧为以i*nhop为中心的nperseg点,
+        每块只读取并零填充所需的输入片段, 内存占用与信号长度无关, 可直接读取内存映射信号
+        """
+        data = self.Sig.data
+        N = self.Sig.N
+        # 检查输入参数
+        if nperseg > N // 2:
+            raise ValueError(f"段长{nperseg}过长")
+        if nhop > nperseg + 1:
+            raise ValueError(
+                f"段移nhop{nhop}不能大于段长nperseg{nperseg}, 会造成信息缺失"
+            )
+        if workers == 0:
+            raise ValueError("FFT并行线程数workers不能为0")
+        dtype = float_dtype(data)
+        _, _, win = window(type=WinType, num=nperseg, dtype=dtype)
+        half = nperseg // 2
+        num_frames = -(-N // nhop)
+        block = max(1, CHUNK_SIZE // nperseg)  # 每块帧数, 限制临时数组内存
+
+        def blocks():  # 参数检查在调用时立即进行, 逐块计算延迟至迭代时
+            for j in range(0, num_frames, block):
+                # 本块各帧覆盖的输入片段, 超出信号两端的部分补零
+                lo = j * nhop - half
+                hi = lo + (min(block, num_frames - j) - 1) * nhop + nperseg
+                chunk = np.zeros(data.shape[:-1] + (hi - lo,), dtype=dtype)
+                chunk[..., max(-lo, 0) : min(hi, N) - lo] = data[
+                    ..., max(lo, 0) : min(hi, N)
+                ]
+                frames = np.lib.stride_tricks.sliding_window_view(chunk, nperseg, axis=-1)
+                ft_data_seg = fft.rfft(frames[..., ::nhop, :] * win, workers=workers)
+                ft_data_seg /= nperseg
+                yield j, ft_data_seg
+
+        return blocks()
+
+    @staticmethod
+    def _stft_out(out, shape: tuple, dtype) -> np.ndarray:
+        """
+        准备STFT输出数组: 默认新建数组, 路径字符串时新建内存映射.npy文件,
+        否则检查外部数组的形状与类型, 不允许丢弃虚部等跨类别转换
+        """
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+        if isinstance(out, str):
+            return np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+        if out.shape != shape:
+            raise ValueError(f"输出数组形状{out.shape}与结果形状{shape}不一致")
+        if not np.can_cast(dtype, out.dtype, "same_kind"):
+            raise TypeError(f"结果类型{np.dtype(dtype)}无法写入{out.dtype}类型的输出数组")
+        return out
+
+    # ----------------------------------------------------------------------------------------#
+    @Analysis.Input({"nperseg": {"Low": 20}, "nhop": {"Low": 1}, "workers": {}})
+    def stft(
+        self,
+        nperseg: int,
+        nhop: int,
+        WinType: str = "矩形窗",
+        workers: Optional[int] = None,
+        out=None,
+    ) -> np.ndarray:
+        """
+        计算信号的短时傅里叶变换频谱, 各帧以分段中心对齐, 按帧块批量实数FFT并逐块写入输出,
+        输出为内存映射数组且输入为内存映射信号时, 可在有界内存下计算长记录的谱图
 
         参数:
         --------
@@ -632,6 +1636,12 @@ class TimeFre_Analysis(Analysis):
                         "矩形窗", "汉宁窗", "海明窗", 
                         "巴特利特窗", "布莱克曼窗", 
                         "自定义窗"
+        workers : int, 可选
+            FFT并行线程数, 负数表示相对CPU核数(如-1为全部核数), 同scipy.fft,
+            默认使用scipy.fft的全局设置
+        out : np.ndarray or str, 可选
+            输出数组(可为np.memmap), 形状为(..., 帧数, nperseg), 需为复数类型;
+            为字符串时在该路径新建内存映射.npy文件; 默认新建内存数组
 
         返回:
         --------
@@ -640,42 +1650,29 @@ class TimeFre_Analysis(Analysis):
         f_Axis : np.ndarray
             频率轴
         ft_data_matrix : np.ndarray
-            短时傅里叶变换结果
+            短时傅里叶变换结果, 多通道信号时前置通道轴
         """
         # 初始化
         data = self.Sig.data
         N = self.Sig.N
         dt = self.Sig.dt
         fs = self.Sig.fs
-        # 检查输入参数
-        if nperseg > N // 2:
-            raise ValueError(f"段长{nperseg}过长")
-        if nhop > nperseg + 1:
-            raise ValueError(
-                f"段移nhop{nhop}不能大于段长nperseg{nperseg}, 会造成信息缺失"
-            )
-        seg_index = np.arange(0, N, nhop)  # 分段中长索引
+        seg_index = np.arange(0, N, nhop)  # 分段中心索引
+        blocks = self._stft_blocks(nperseg, nhop, WinType, workers)  # 先行检查输入参数
+        ft_data_matrix = self._stft_out(
+            out, data.shape[:-1] + (len(seg_index), nperseg), complex_dtype(data)
+        )  # 多通道信号时前置通道轴
         # ------------------------------------------------------------------------------------#
-        # 分段计算STFT
-        ft_data_matrix = np.zeros((len(seg_index), nperseg), dtype=complex)
-        _, _, win = window(type=WinType, num=nperseg)
-        for i in seg_index:  # i=0,nhop,2*nhop,...
-            # 截取窗口数据并补零以适应窗口长度
-            if i - nperseg // 2 < 0:
-                data_seg = data[: nperseg // 2 + i + 1]
-                data_seg = np.pad(data_seg, (nperseg // 2 - i, 0), mode="constant")
-            elif i + nperseg // 2 >= N:
-                data_seg = data[i - nperseg // 2 :]
-                data_seg = np.pad(
-                    data_seg, (0, i + nperseg // 2 - N + 1), mode="constant"
-                )
-            else:
-                data_seg = data[i - nperseg // 2 : i + nperseg // 2 + 1]
-            # 加窗
-            data_seg = data_seg * win
-            # 计算S(t=i*dt,f)
-            ft_data_seg = (fft.fft(data_seg)) / nperseg
-            ft_data_matrix[i // nhop, :] = ft_data_seg
+        # 逐块写入, 负频率部分由共轭对称补全
+        nfreq = nperseg // 2 + 1
+        for j, ft_data_seg in blocks:
+            ft_data_block = ft_data_matrix[..., j : j + ft_data_seg.shape[-2], :]
+            ft_data_block[..., :nfreq] = ft_data_seg
+            ft_data_block[..., nfreq:] = np.conj(
+                ft_data_seg[..., 1 : (nperseg + 1) // 2][..., ::-1]
+            )
+        if isinstance(ft_data_matrix, np.memmap):
+            ft_data_matrix.flush()
         # ------------------------------------------------------------------------------------#
         # 后处理
         t_Axis = seg_index * dt
@@ -684,9 +1681,19 @@ class TimeFre_Analysis(Analysis):
 
     # ----------------------------------------------------------------------------------------#
     @Analysis.Plot("2D", plot_spectrogram)
-    def st_Cft(self, nperseg: int, nhop: int, WinType: str = "矩形窗") -> np.ndarray:
+    @Analysis.Input({"nperseg": {"Low": 20}, "nhop": {"Low": 1}, "workers": {}})
+    def st_Cft(
+        self,
+        nperseg: int,
+        nhop: int,
+        WinType: str = "矩形窗",
+        workers: Optional[int] = None,
+        out=None,
+        dtype: Optional[str] = None,
+    ) -> np.ndarray:
         """
-        计算信号的短时单边傅里叶级数谱幅值
+        计算信号的短时单边傅里叶级数谱幅值, 每个帧块只计算单边rfft频点并将幅值直接写入实数输出,
+        不生成完整的复数STFT矩阵
 
         参数:
         --------
@@ -699,6 +1706,14 @@ class TimeFre_Analysis(Analysis):
                         "矩形窗", "汉宁窗", "海明窗", 
                         "巴特利特窗", "布莱克曼窗", 
                         "自定义窗"
+        workers : int, 可选
+            FFT并行线程数, 负数表示相对CPU核数(如-1为全部核数), 同scipy.fft,
+            默认使用scipy.fft的全局设置
+        out : np.ndarray or str, 可选
+            输出数组(可为np.memmap), 形状为(..., 帧数, nperseg//2), 需为浮点类型;
+            为字符串时在该路径新建内存映射.npy文件; 默认新建内存数组
+        dtype : str, 可选
+            新建输出的数据类型, 如"float32"可使输出内存减半, 默认按计算精度策略确定
         
         返回:
         --------
@@ -709,26 +1724,45 @@ class TimeFre_Analysis(Analysis):
         Amp : np.ndarray
             单边傅里叶级数谱幅值
         """
-        t_Axis, f_Axis, ft_data_matrix = self.stft(nperseg, nhop, WinType)
-        # 计算短时单边傅里叶级数谱
-        Amp = np.abs(ft_data_matrix) * 2
-        f_Axis = f_Axis[: nperseg // 2]
-        Amp = Amp[:, : len(f_Axis)]
+        # 初始化
+        data = self.Sig.data
+        N = self.Sig.N
+        seg_index = np.arange(0, N, nhop)  # 分段中心索引
+        blocks = self._stft_blocks(nperseg, nhop, WinType, workers)
+        f_Axis = np.linspace(0, self.Sig.fs, nperseg, endpoint=False)[: nperseg // 2]
+        Amp = self._stft_out(
+            out,
+            data.shape[:-1] + (len(seg_index), len(f_Axis)),
+            float_dtype(data) if dtype is None else dtype,
+        )
+        # 逐块计算短时单边傅里叶级数谱, 幅值直接写入输出, 不生成中间数组
+        for j, ft_data_seg in blocks:
+            Amp_block = Amp[..., j : j + ft_data_seg.shape[-2], :]
+            np.abs(ft_data_seg[..., : len(f_Axis)], out=Amp_block)
+            Amp_block *= 2
+        if isinstance(Amp, np.memmap):
+            Amp.flush()
+        t_Axis = seg_index * self.Sig.dt
         return t_Axis, f_Axis, Amp
 
     # ----------------------------------------------------------------------------------------#
     @staticmethod
     @Plot("1D", plot_spectrum)
     def istft(
-        stft_data: np.ndarray, fs: int, nhop: int, WinType: str = "矩形窗", **kwargs
+        stft_data: np.ndarray,
+        fs: int,
+        nhop: int,
+        WinType: str = "矩形窗",
+        workers: Optional[int] = None,
+        **kwargs,
     ) -> np.ndarray:
         """
-        根据STFT数据重构时域信号
+        根据STFT数据重构时域信号, 各帧分块批量逆变换后向量化重叠相加
 
         参数:
         --------
         stft_data : np.ndarray
-            STFT数据
+            STFT数据, 多通道时形状为(channels, frames, nperseg)
         fs : int
             原始信号采样频率
         nhop : int
@@ -738,6 +1772,8 @@ class TimeFre_Analysis(Analysis):
                         "矩形窗", "汉宁窗", "海明窗",
                         "巴特利特窗", "布莱克曼窗",
                         "自定义窗"
+        workers : int, 可选
+            FFT并行线程数, 默认使用scipy.fft的全局设置
 
         返回:
         --------
@@ -747,36 +1783,33 @@ class TimeFre_Analysis(Analysis):
             重构后的时域信号
         """
         # 获取STFT数据
-        num_frames, nperseg = stft_data.shape
-        # 获取窗函数序列
-        _, _, win = window(type=WinType, num=nperseg)
-        # 检查窗口是否满足 NOLA 条件。因为默认ISTFT后归一化，所以不检查COLA条件
-        if not signal.check_NOLA(win, nperseg, nperseg - nhop):
-            raise ValueError(
-                f"输入的stft参数nhop={nhop}不满足非零重叠加 (NOLA) 条件，无法完整重构"
-            )
+        num_frames, nperseg = stft_data.shape[-2:]  # 多通道时前置通道轴
+        # 获取窗函数序列与归一化包络
+        dtype = float_dtype(stft_data)
+        _, _, win = window(type=WinType, num=nperseg, dtype=dtype)
+        win_overlap = _ola_envelope(WinType, nperseg, nhop, num_frames, dtype.name)
         # 初始化重构信号的长度
         N = nhop * (num_frames - 1) + nperseg  # 长度一般大于原始信号
-        RC_data = np.zeros(N)
-        win_overlap = np.zeros(N)
+        r = -(-nperseg // nhop)
+        RC_data = np.zeros(stft_data.shape[:-2] + (num_frames - 1 + r, nhop), dtype=dtype)
         # ------------------------------------------------------------------------------------#
-        # 按帧顺序进行IDFT并叠加
-        for i in range(num_frames):
-            # 对单帧数据进行重构
-            RC_data_seg = np.real(fft.ifft(stft_data[i])) * nperseg
-            # ISTFT过程与STFT过程进行相同加窗操作
-            RC_data_seg *= win
-            # 计算当前帧时间，保证正确叠加
-            start_idx = i * nhop
-            end_idx = start_idx + nperseg
-            RC_data[start_idx:end_idx] += RC_data_seg  # 重构信号叠加
-            win_overlap[start_idx:end_idx] += win**2
+        # 分块批量IDFT并重叠相加, real(ifft(X))等于X的共轭对称分量的irfft
+        nfreq = nperseg // 2 + 1
+        mirror = -np.arange(nfreq) % nperseg  # 各正频率对应的负频率索引
+        block = max(1, CHUNK_SIZE // nperseg)  # 每块帧数, 限制临时数组内存
+        for j in range(0, num_frames, block):
+            ft_data_seg = stft_data[..., j : j + block, :]
+            ft_data_seg = (ft_data_seg[..., :nfreq] + np.conj(ft_data_seg[..., mirror])) / 2
+            RC_data_seg = fft.irfft(ft_data_seg, nperseg, workers=workers)
+            RC_data_seg *= nperseg * win  # ISTFT过程与STFT过程进行相同加窗操作
+            _overlap_add(RC_data, RC_data_seg.astype(dtype, copy=False), j, nhop)
+        RC_data = RC_data.reshape(stft_data.shape[:-2] + (-1,))[..., :N]
         # ------------------------------------------------------------------------------------#
         # 后处理
         # 归一化，去除STFT和ISFT过程加窗的影响
         RC_data = RC_data[
-            nperseg // 2 : -(nperseg // 2)
+            ..., nperseg // 2 : -(nperseg // 2)
         ]  # 排除端点效应,可能导致重构信号尾部减少最多nhop个点
         RC_data /= win_overlap[nperseg // 2 : -(nperseg // 2)]
-        t_Axis = np.arange(len(RC_data)) / fs
+        t_Axis = np.arange(RC_data.shape[-1]) / fs
         return t_Axis, RC_data
@@ -0,0 +1,229 @@
+"""
+# Batch
+批量信号分析模块, 用于对大量等长记录执行同一分析方法
+
+## 内容
+    - function:
+        1. batch_run: 逐通道独立的分析方法分组堆叠为多通道信号, 在线程池或进程池中批量执行并按输入顺序产出结果
+        2. dir_source: 按文件名顺序以内存映射方式惰性加载目录下的信号文件
+"""
+
+from .dependencies import Optional
+from .dependencies import np
+from .dependencies import os, glob, deque
+from .dependencies import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .decorators import Check_Vars
+
+from .Signal import Signal, SignalArray
+from .BasicSP import Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from .Cep_Analysis import Cep_Analysis
+
+
+# 多通道结果与逐通道计算一致、可堆叠批量执行的分析方法; 其余方法(如默认幅值范围取全部通道
+# 最值的Pdf、通道间的Crosscorr、逐通道返回列表的Enco_detect)逐个信号执行
+STACKABLE_METHODS = {
+    Time_Analysis: ("Trend", "Trends", "Autocorr"),
+    Frequency_Analysis: (
+        "ft",
+        "Cft",
+        "Psd",
+        "Psd_welch",
+        "Psd_corr",
+        "HTenve_spectra",
+        "Band_enve_spectra",
+    ),
+    TimeFre_Analysis: ("stft", "st_Cft"),
+    Cep_Analysis: (
+        "Cep_Real",
+        "Cep_Power",
+        "Cep_Complex",
+        "Cep_Analytic",
+        "Cep_Zoom",
+        "Cep_Lift",
+    ),
+}
+
+
+# --------------------------------------------------------------------------------------------#
+# -## ----------------------------------------------------------------------------------------#
+# -----## ------------------------------------------------------------------------------------#
+# ---------## --------------------------------------------------------------------------------#
+def _sampling(fs) -> dict:
+    """
+    由采样频率生成信号构造参数, 非整数采样频率以采样间隔给出
+    """
+    return {"fs": fs} if isinstance(fs, int) else {"dt": 1 / fs}
+
+
+def _run_group(
+    analysis: type, method: str, datas: list, fs, t0: float, args: tuple, kwargs: dict
+):
+    """
+    在工作线程/进程中将一组单通道数据堆叠为多通道信号并执行分析方法
+    """
+    Sig = SignalArray(
+        np.stack(datas), label="批处理信号", t0=t0, copy=False, **_sampling(fs)
+    )._own()
+    return getattr(analysis(Sig), method)(*args, **kwargs)
+
+
+def _run_single(analysis: type, method: str, Sig: Signal, args: tuple, kwargs: dict):
+    """
+    单独执行无法堆叠的信号(如多通道信号)或不可堆叠的分析方法
+    """
+    return getattr(analysis(Sig), method)(*args, **kwargs)
+
+
+def _split(res, num: int) -> list:
+    """
+    将多通道分析结果拆分为各信号的结果, 元组逐项拆分, 长度为通道数的列表按通道拆分,
+    二维及以上数组沿通道轴拆分, 坐标轴等其余结果共享
+    """
+    if isinstance(res, tuple):
+        parts = [_split(item, num) for item in res]
+        return [tuple(part[i] for part in parts) for i in range(num)]
+    if isinstance(res, list) and len(res) == num:
+        return list(res)
+    if isinstance(res, dict):
+        parts = {key: _split(value, num) for key, value in res.items()}
+        return [{key: part[i] for key, part in parts.items()} for i in range(num)]
+    if isinstance(res, np.ndarray) and res.ndim >= 2 and res.shape[0] == num:
+        return list(res)
+    return [res] * num
+
+
+def _groups(Sigs, group_size: int, stackable: bool = True):
+    """
+    将连续的、采样参数与长度一致的单通道信号划分为组, 产出(组内信号列表, 是否可堆叠)
+    """
+    group, key = [], None
+    for Sig in Sigs:
+        if not stackable or isinstance(Sig, SignalArray):  # 多通道信号单独执行
+            if group:
+                yield group, True
+                group, key = [], None
+            yield [Sig], False
+            continue
+        Sig_key = (Sig.N, Sig.fs, Sig.t0, Sig.data.dtype)
+        if group and (Sig_key != key or len(group) >= group_size):
+            yield group, True
+            group = []
+        group.append(Sig)
+        key = Sig_key
+    if group:
+        yield group, True
+
+
+def _collect(num: int, stack: bool, future) -> list:
+    """
+    按序取回一组的结果并拆分为各信号的结果
+    """
+    res = future.result()
+    return _split(res, num) if stack else [res]
+
+
+# --------------------------------------------------------------------------------------------#
+@Check_Vars(
+    {
+        "analysis": {},
+        "method": {},
+        "group_size": {"Low": 1},
+        "workers": {"Low": 1},
+        "executor": {"Content": ("thread", "process")},
+        "max_inflight": {"Low": 1},
+    }
+)
+def batch_run(
+    Sigs,
+    analysis: type,
+    method: str,
+    *args,
+    group_size: int = 64,
+    workers: Optional[int] = None,
+    executor: str = "thread",
+    max_inflight: Optional[int] = None,
+    **kwargs,
+):
+    """
+    对大量信号批量执行同一分析方法, 按输入顺序逐个产出各信号的结果
+
+    对于STACKABLE_METHODS中逐通道独立的分析方法, 连续的、长度/采样频率/起始时间/数据类型
+    一致的单通道信号每group_size个堆叠为一个多通道信号, 一次向量化计算共享窗函数缓存与FFT规划;
+    其余方法的多通道结果与逐个信号计算不一致, 每个信号单独成组; 各组在线程池或进程池中并行执行,
+    同时在途的组数不超过max_inflight, 内存占用与信号总数无关
+
+    参数:
+    --------
+    Sigs : Iterable[Signal]
+        信号的可迭代对象, 如信号列表、生成器或dir_source
+    analysis : type
+        分析类, 如Frequency_Analysis
+    method : str
+        分析方法名, 如"Psd"
+    *args, **kwargs
+        传递给分析方法的参数
+    group_size : int, 默认为64
+        每组堆叠的最大信号数
+    workers : int, 可选
+        并行线程/进程数, 默认为CPU核数
+    executor : str, 默认为"thread"
+        并行方式, 可选:
+                    "thread": 线程池, FFT等计算释放GIL, 无数据序列化开销
+                    "process": 进程池, 适用于含大量Python层计算的分析方法
+    max_inflight : int, 可选
+        同时提交未取回结果的最大组数, 默认为2*workers
+
+    返回:
+    --------
+    res : Generator
+        按输入顺序产出各信号的分析结果, 形式与单个信号调用分析方法一致
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    max_inflight = 2 * workers if max_inflight is None else max_inflight
+    Pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    stackable = method in STACKABLE_METHODS.get(analysis, ())
+    with Pool(max_workers=workers) as pool:
+        pending = deque()  # (组内信号数, 是否可堆叠, 任务)
+        for group, stack in _groups(Sigs, group_size, stackable):
+            if stack:
+                future = pool.submit(
+                    _run_group,
+                    analysis,
+                    method,
+                    [Sig.data for Sig in group],
+                    group[0].fs,
+                    group[0].t0,
+                    args,
+                    kwargs,
+                )
+            else:
+                future = pool.submit(_run_single, analysis, method, group[0], args, kwargs)
+            pending.append((len(group), stack, future))
+            while len(pending) >= max_inflight:  # 在途组数达到上限时先按序取回最早的结果
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
+
+
+# --------------------------------------------------------------------------------------------#
+def dir_source(path: str, pattern: str = "*.npy", **kwargs):
+    """
+    按文件名顺序以内存映射方式惰性加载目录下的信号文件, 可直接作为batch_run的输入
+
+    参数:
+    --------
+    path : str
+        目录路径
+    pattern : str, 默认为"*.npy"
+        文件名匹配模式
+    **kwargs
+        传递给Signal.from_file的采样参数等, 如fs
+
+    返回:
+    --------
+    Sig : Generator
+        各文件对应的信号
+    """
+    for file in sorted(glob.glob(os.path.join(path, pattern))):
+        yield Signal.from_file(file, **kwargs)
@@ -15,7 +15,7 @@ from .dependencies import fft, signal
 from .dependencies import plt, zh_font
 from .dependencies import FLOAT_EPS, PI
 
-from .Signal import Signal, Analysis
+from .Signal import Signal, Analysis, float_dtype
 from .Plot import plot_spectrum
 
 from .decorators import Check_Vars, Plot
@@ -162,14 +162,18 @@ class Cep_Analysis(Analysis):
         # 初始化
         data = self.Sig.data
         # 计算实数倒谱
-        rfft_data = fft.rfft(data)  # 实数据故使用rfft
+        dtype = float_dtype(data)
+        rfft_data = self.Sig.cached(
+            ("rfft", "矩形窗", dtype, self.Sig.N),
+            lambda: fft.rfft(data.astype(dtype, copy=False)),
+        )  # 实数据故使用rfft
         log_A = 10 * np.log10(np.abs(rfft_data) + FLOAT_EPS)
         real_cep = np.real(fft.irfft(log_A))
         # -----------------------------------------------------------------------------------#
         # 后处理
-        real_cep[0] = 0  # 排除对数谱负偏置影响
+        real_cep[..., 0] = 0  # 排除对数谱负偏置影响
         q_Axis = self.Sig.t_Axis[0 : self.Sig.N // 2]
-        real_cep = real_cep[: len(q_Axis)]
+        real_cep = real_cep[..., : len(q_Axis)]
         return q_Axis, real_cep
 
     # ---------------------------------------------------------------------------------------#
@@ -188,15 +192,19 @@ class Cep_Analysis(Analysis):
         # 初始化
         data = self.Sig.data
         # 计算功率倒谱
-        rfft_data = fft.rfft(data)
+        dtype = float_dtype(data)
+        rfft_data = self.Sig.cached(
+            ("rfft", "矩形窗", dtype, self.Sig.N),
+            lambda: fft.rfft(data.astype(dtype, copy=False)),
+        )
         log_A = 10 * np.log10(np.abs(rfft_data) + FLOAT_EPS)
         real_cep = np.real(fft.irfft(log_A))
         power_cep = real_cep * 2
         # -----------------------------------------------------------------------------------#
         # 后处理
-        power_cep[0] = 0  # 排除对数谱负偏置影响
+        power_cep[..., 0] = 0  # 排除对数谱负偏置影响
         q_Axis = self.Sig.t_Axis[0 : self.Sig.N // 2]
-        power_cep = power_cep[: len(q_Axis)]
+        power_cep = power_cep[..., : len(q_Axis)]
         return q_Axis, power_cep
 
     # ---------------------------------------------------------------------------------------#
@@ -215,14 +223,17 @@ class Cep_Analysis(Analysis):
         # 初始化
         data = self.Sig.data
         # 计算复数倒谱
-        fft_data = fft.fft(data)
+        dtype = float_dtype(data)
+        fft_data = self.Sig.cached(
+            ("fft", "矩形窗", dtype), lambda: fft.fft(data.astype(dtype, copy=False))
+        )
         log_A = np.log(np.abs(fft_data) + FLOAT_EPS)
         phi = np.angle(fft_data)
         complex_cep = np.real(fft.ifft(log_A + 1j * phi))  # 复数倒谱为实数，故只取实部
         # -----------------------------------------------------------------------------------#
         # 后处理
         q_Axis = self.Sig.t_Axis
-        complex_cep = complex_cep[: len(q_Axis)]
+        complex_cep = complex_cep[..., : len(q_Axis)]
         return q_Axis, complex_cep
 
     # ---------------------------------------------------------------------------------------#
@@ -249,9 +260,9 @@ class Cep_Analysis(Analysis):
             重构时域信号
         """
         # 检查输入数据
-        if len(q_Axis) != len(complex_cep):
+        if len(q_Axis) != complex_cep.shape[-1]:
             raise ValueError(
-                f"q_Axis={len(q_Axis)}和data={len(complex_cep)}的长度不一致"
+                f"q_Axis={len(q_Axis)}和data={complex_cep.shape[-1]}的长度不一致"
             )
         # 根据输入的复倒谱重构频谱
         fft_cep = fft.fft(complex_cep)
@@ -281,19 +292,22 @@ class Cep_Analysis(Analysis):
         # 初始化
         data = self.Sig.data
         # 计算解析倒谱
-        fft_data = fft.fft(data)
+        dtype = float_dtype(data)
+        fft_data = self.Sig.cached(
+            ("fft", "矩形窗", dtype), lambda: fft.fft(data.astype(dtype, copy=False))
+        )
         log_A = 10 * np.log10(np.abs(fft_data) + FLOAT_EPS)
-        log_A -= np.mean(log_A)
+        log_A -= np.mean(log_A, axis=-1, keepdims=True)
         # 希尔伯特原理获得解析信号频谱
-        log_A[: len(log_A // 2) : -1] = 0  # 转换单边谱
+        log_A[..., : log_A.shape[-1] : -1] = 0  # 转换单边谱
         log_A *= 2  # 获得解析信号频谱
         analytic = fft.ifft(log_A)  # 倒频域解析信号，对称
         analytic_cep = np.abs(analytic)  # 解析倒谱
         # -----------------------------------------------------------------------------------#
         # 后处理
-        analytic_cep[0] = 0  # 排除对数谱负偏置影响
+        analytic_cep[..., 0] = 0  # 排除对数谱负偏置影响
         q_Axis = self.Sig.t_Axis[0 : self.Sig.N // 2]
-        analytic_cep = analytic_cep[: len(q_Axis)]
+        analytic_cep = analytic_cep[..., : len(q_Axis)]
         return q_Axis, analytic_cep
 
     # ---------------------------------------------------------------------------------------#
@@ -320,20 +334,22 @@ class Cep_Analysis(Analysis):
         # 计算Zoom-FFT
         _, zoom_Amp = zoom_Aft(Sig=self.Sig, center_freq=fc, bandwidth=bw)
         log_zoomA = 10 * np.log10(zoom_Amp + FLOAT_EPS)  # 取对数幅值
-        log_zoomA -= np.mean(log_zoomA)
+        log_zoomA -= np.mean(log_zoomA, axis=-1, keepdims=True)
         # 计算解析倒谱
         fft_analytic = np.pad(
-            2 * log_zoomA, (0, len(log_zoomA)), "constant"
+            2 * log_zoomA,
+            [(0, 0)] * (log_zoomA.ndim - 1) + [(0, log_zoomA.shape[-1])],
+            "constant",
         )  # 希尔伯特原理获得解析信号频谱
         analytic = fft.ifft(fft_analytic)  # 倒频域解析信号
         zoom_cep = np.abs(analytic)  # 解析倒谱
         # -----------------------------------------------------------------------------------#
         # 后处理
-        zoom_cep[0] = 0  # 排除对数谱负偏置影响
-        q_Axis = np.linspace(0, self.Sig.T, len(fft_analytic), endpoint=False)[
-            : len(fft_analytic) // 2
+        zoom_cep[..., 0] = 0  # 排除对数谱负偏置影响
+        q_Axis = np.linspace(0, self.Sig.T, fft_analytic.shape[-1], endpoint=False)[
+            : fft_analytic.shape[-1] // 2
         ]  # zoom-fft和解析操作不改变采样时间长度
-        zoom_cep = zoom_cep[: len(q_Axis)]
+        zoom_cep = zoom_cep[..., : len(q_Axis)]
         return q_Axis, zoom_cep
 
     # ---------------------------------------------------------------------------------------#
@@ -406,26 +422,32 @@ class Cep_Analysis(Analysis):
         返回:
         --------
         enco_tau : np.ndarray
-            检测到的回波间隔
+            检测到的回波间隔, 多通道信号时为各通道结果组成的列表
         """
         N = self.Sig.N
         fs = self.Sig.fs
         # 通过倒谱检测回声信号
-        _, cep_real = self.Cep_Real()  # 计算实数倒谱
+        _, cep_real = self.Cep_Real()  # 计算实数倒谱, 多通道时一次批量计算
         # -----------------------------------------------------------------------------------#
-        # 寻找峰值
-        if height is None:
-            height = 3 * np.std(cep_real, ddof=1)  # 根据倒谱的标准差设置峰值高度
-        peak_idxs, peak_params = signal.find_peaks(
-            cep_real, height=height, distance=distance
-        )  # 限制规则寻找峰值
-        peak_heights = peak_params["peak_heights"]
-        # 按高度对索引排序
-        peak_idxs = peak_idxs[np.argsort(peak_heights)[::-1]]
-        # 去除靠近端点的峰值
-        peak_idxs = peak_idxs[(peak_idxs > distance) & (peak_idxs < N - distance)]
-        # 计算回波时延
-        enco_tau = peak_idxs / fs
+        # 逐通道寻找峰值
+        enco_tau = []
+        for ch_cep in cep_real.reshape(-1, cep_real.shape[-1]):
+            if height is None:
+                ch_height = 3 * np.std(ch_cep, ddof=1)  # 根据倒谱的标准差设置峰值高度
+            else:
+                ch_height = height
+            peak_idxs, peak_params = signal.find_peaks(
+                ch_cep, height=ch_height, distance=distance
+            )  # 限制规则寻找峰值
+            peak_heights = peak_params["peak_heights"]
+            # 按高度对索引排序
+            peak_idxs = peak_idxs[np.argsort(peak_heights)[::-1]]
+            # 去除靠近端点的峰值
+            peak_idxs = peak_idxs[(peak_idxs > distance) & (peak_idxs < N - distance)]
+            # 计算回波时延
+            enco_tau.append(peak_idxs / fs)
+        if cep_real.ndim == 1:
+            return enco_tau[0]
         return enco_tau
 
 
@@ -485,11 +507,11 @@ def zoom_Aft(
     # 重采样减小无效数据点数
     Zoom_fs = 2 * cutoff
     ration = int(fs / Zoom_fs)
-    bp_data = cm_data[::ration]  # 重采样降低数据点数
+    bp_data = cm_data[..., ::ration]  # 重采样降低数据点数
     real_Zoom_fs = fs / ration  # 实际细化后的采样频率
     # 频谱分析
     zoomfft_data = fft.fftshift(
-        fft.fft(bp_data) / len(bp_data)
+        fft.fft(bp_data) / bp_data.shape[-1], axes=-1
     )  # 非对称频谱,范围为f_low~f_high
     zoom_Amp = np.abs(zoomfft_data)
     # -----------------------------------------------------------------------------------#
@@ -497,7 +519,7 @@ def zoom_Aft(
     f_Axis = np.linspace(
         center_freq - real_Zoom_fs / 2,
         center_freq + real_Zoom_fs / 2,
-        len(zoomfft_data),
+        zoomfft_data.shape[-1],
         endpoint=False,
     )
     return f_Axis, zoom_Amp
@@ -4,18 +4,27 @@ PySP库的框架模块, 定义了一些基本的类, 实现PySP库其它模块
 
 ## 内容
     - class: 
-        1. Signal: 自带采样信息的信号类, 可进行简单预处理操作
-        2. Analysis: 信号分析基类, 用于创建其他复杂的信号分析、处理方法
+        1. SpectrumCache: 信号频谱缓存, 供各分析类共享同一信号的变换结果
+        2. Signal: 自带采样信息的信号类, 可进行简单预处理操作
+        3. SignalArray: 共享采样信息的多通道信号类, 各分析方法沿时间轴批量计算
+        4. Analysis: 信号分析基类, 用于创建其他复杂的信号分析、处理方法
+        5. PolyResampler: 多相有理数比重采样器, 支持分块/流式输入
     - function:
         1. resample: 对信号进行任意时间段的重采样
+        2. set_precision: 设置全局计算精度策略
+        3. precision: 在with语句块内临时使用指定计算精度策略
+        4. float_dtype: 按计算精度策略确定数据的实数计算类型
+        5. complex_dtype: 按计算精度策略确定数据的复数计算类型
 """
 
-from .dependencies import Optional, Union
+from .dependencies import Optional, Callable
 from .dependencies import np, random
-from .dependencies import inspect
+from .dependencies import signal
 from .dependencies import copy
-from .dependencies import wraps
-from .dependencies import get_origin, get_args
+from .dependencies import os
+from .dependencies import contextmanager, contextvars
+from .dependencies import itertools, threading, OrderedDict, Fraction
+from .dependencies import CHUNK_SIZE
 from .decorators import Check_Vars
 
 from .Plot import plot_spectrum
@@ -25,6 +34,154 @@ from .Plot import plot_spectrum
 # -## ----------------------------------------------------------------------------------------#
 # -----## ------------------------------------------------------------------------------------#
 # ---------## --------------------------------------------------------------------------------#
+_PRECISION_MODES = ("float64", "float32", "auto")
+_PRECISION = os.environ.get("PYSP_PRECISION", "float64")  # 全局计算精度策略
+_PRECISION_LOCAL = contextvars.ContextVar("PYSP_PRECISION_LOCAL", default=None)
+
+
+@Check_Vars({"mode": {"Content": _PRECISION_MODES}})
+def set_precision(mode: str) -> None:
+    """
+    设置全局计算精度策略, 也可通过环境变量PYSP_PRECISION设置
+
+    参数:
+    --------
+    mode : str
+        计算精度策略, 可选:
+                    "float64": 统一按float64/complex128计算, 默认
+                    "float32": 统一按float32/complex64计算
+                    "auto": 保持输入精度, float32输入全程按float32/complex64计算
+    """
+    global _PRECISION
+    _PRECISION = mode
+
+
+@contextmanager
+@Check_Vars({"mode": {"Content": _PRECISION_MODES}})
+def precision(mode: str):
+    """
+    在with语句块内临时使用指定计算精度策略的上下文管理器, 仅作用于当前线程/协程上下文
+    """
+    token = _PRECISION_LOCAL.set(mode)
+    try:
+        yield
+    finally:
+        _PRECISION_LOCAL.reset(token)
+
+
+def float_dtype(data: np.ndarray) -> np.dtype:
+    """
+    按计算精度策略确定数据的实数计算类型, 窗函数、中间结果与输出均采用该类型
+    """
+    mode = _PRECISION_LOCAL.get() or _PRECISION
+    if mode == "float32":
+        return np.dtype(np.float32)
+    if mode == "auto" and data.dtype.kind in "fc" and np.finfo(data.dtype).bits <= 32:
+        return np.dtype(np.float32)  # float16/float32/complex64输入
+    return np.dtype(np.float64)
+
+
+def complex_dtype(data: np.ndarray) -> np.dtype:
+    """
+    按计算精度策略确定数据的复数计算类型, 频谱等复数结果采用该类型
+    """
+    return np.result_type(float_dtype(data), np.complex64)
+
+
+# --------------------------------------------------------------------------------------------#
+_TOKEN = itertools.count()  # 信号数据版本号生成器, 全局唯一
+
+
+class SpectrumCache:
+    """
+    信号频谱缓存, 存储与信号数据版本绑定的只读计算结果, 超出容量时淘汰最久未使用项
+
+    参数:
+    --------
+    max_bytes : int, 可选
+        缓存容量字节数, 默认为类属性MAX_BYTES
+
+    属性:
+    --------
+    MAX_BYTES : int
+        默认缓存容量字节数, 设为0时关闭缓存
+    nbytes : int
+        当前已缓存的字节数
+
+    方法:
+    --------
+    get(key:tuple, func:Callable) -> np.ndarray
+        查询缓存, 未命中时调用func计算并缓存结果
+    clear() -> None
+        清空缓存
+    """
+
+    MAX_BYTES = 256 * 2**20
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = SpectrumCache.MAX_BYTES if max_bytes is None else max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------------------------#
+    def get(self, key: tuple, func: Callable) -> np.ndarray:
+        """
+        查询缓存, 未命中时调用func计算并缓存结果
+
+        参数:
+        --------
+        key : tuple
+            缓存键, 需包含数据版本、变换类型、窗类型等全部计算条件
+        func : Callable
+            无参数的计算函数, 返回np.ndarray
+
+        返回:
+        --------
+        value : np.ndarray
+            只读的计算结果
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)  # 标记为最近使用
+                return self._items[key]
+        value = func()
+        value.flags.writeable = False  # 缓存结果被多个分析共享, 禁止原地修改
+        if value.nbytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._items:
+                    self._items[key] = value
+                    self.nbytes += value.nbytes
+                while self.nbytes > self.max_bytes:  # 按最久未使用淘汰
+                    _, old = self._items.popitem(last=False)
+                    self.nbytes -= old.nbytes
+        return value
+
+    # ----------------------------------------------------------------------------------------#
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def __getstate__(self) -> dict:
+        """
+        序列化时仅保留容量设置, 不传递缓存内容与线程锁
+        """
+        return {"max_bytes": self.max_bytes}
+
+    # ----------------------------------------------------------------------------------------#
+    def __setstate__(self, state: dict):
+        """
+        反序列化时重建空缓存
+        """
+        self.__init__(state["max_bytes"])
+
+
+# --------------------------------------------------------------------------------------------#
 class Signal:
     """
     自带采样信息的信号类, 可进行简单预处理操作
@@ -39,6 +196,8 @@ class Signal:
         采样时间间隔/采样频率/信号采样时长, 输入其中一个即可
     t0 : float, 可选
         信号起始时间, 默认为0
+    copy : bool, 可选
+        是否拷贝输入数据, 默认为True; 为False时以只读视图共享输入数组内存, 写入时复制
 
     属性：
     --------
@@ -60,9 +219,21 @@ class Signal:
         时间坐标序列
     f_Axis : np.ndarray
         频率坐标序列
+    cache : SpectrumCache
+        频谱缓存, 与该信号的视图共享, 拷贝使用独立缓存; 直接原地修改data元素后需调用cache.clear()
 
     方法：
     --------
+    cached(key:tuple, func:Callable) -> np.ndarray
+        查询或计算并缓存与当前信号数据绑定的结果
+    from_file(path:str, ...) -> Signal
+        以内存映射方式从文件惰性加载信号
+    crop(t0:float, T:float=None) -> Signal
+        截取指定时间段的信号, 不拷贝数据
+    view() -> Signal
+        返回与原信号共享数据内存的只读视图信号
+    copy() -> Signal
+        返回信号的深拷贝
     info(print:bool=True) -> dict
         输出信号的采样信息
     plot(**kwargs) -> None
@@ -86,9 +257,32 @@ class Signal:
         fs: Optional[int] = None,
         T: Optional[float] = None,
         t0: Optional[float] = 0,
+        copy: bool = True,
     ):
-        self.data = data.copy()
-        N = len(data)
+        self._setup(data, label, dt, fs, T, t0, copy)
+
+    # ----------------------------------------------------------------------------------------#
+    def _setup(
+        self,
+        data: np.ndarray,
+        label: str,
+        dt: Optional[float],
+        fs: Optional[int],
+        T: Optional[float],
+        t0: Optional[float],
+        copy: bool,
+    ) -> None:
+        """
+        按采样参数初始化信号, 供单通道与多通道信号类共用
+        """
+        if copy:
+            self.data = data.copy()
+            self._shared = False
+        else:
+            self.data = data.view()  # 零拷贝, 与输入数组共享内存
+            self.data.flags.writeable = False  # 只读保护, 修改时再复制
+            self._shared = True
+        N = data.shape[-1]
         # 只允许给出一个采样参数
         if not [dt, fs, T].count(None) == 2:
             raise ValueError("采样参数错误, 请只给出一个采样参数且符合格式要求")
@@ -106,6 +300,41 @@ class Signal:
         # ------------------------------------------------------------------------------------#
         # 设置信号标签
         self.label = label
+        # 频谱缓存
+        self.cache = SpectrumCache()
+
+    # ----------------------------------------------------------------------------------------#
+    @property
+    def data(self) -> np.ndarray:
+        """
+        信号时序数据
+        """
+        return self._data
+
+    # ----------------------------------------------------------------------------------------#
+    @data.setter
+    def data(self, value: np.ndarray):
+        self._data = value
+        self._token = next(_TOKEN)  # 数据更新, 缓存结果随之失效
+
+    # ----------------------------------------------------------------------------------------#
+    def cached(self, key: tuple, func: Callable) -> np.ndarray:
+        """
+        查询或计算并缓存与当前信号数据绑定的结果
+
+        参数:
+        --------
+        key : tuple
+            缓存键, 需包含变换类型、窗类型等除信号数据外的全部计算条件
+        func : Callable
+            无参数的计算函数, 返回np.ndarray
+
+        返回:
+        --------
+        value : np.ndarray
+            只读的计算结果
+        """
+        return self.cache.get((self._token,) + key, func)
 
     # ----------------------------------------------------------------------------------------#
     @property
@@ -137,26 +366,28 @@ class Signal:
         """
         信号长度
         """
-        return len(self.data)
+        return self.data.shape[-1]
 
     # ----------------------------------------------------------------------------------------#
     @property
     def t_Axis(self) -> np.ndarray:
         """
-        信号时间坐标轴
+        信号时间坐标轴, 为缓存共享的只读数组, 需修改时先复制
         """
-        return (
-            np.arange(0, self.N) * self.dt + self.t0
+        return self.cached(
+            ("t_Axis", self.fs, self.t0),
+            lambda: np.arange(0, self.N) * self.dt + self.t0,
         )  # 时间坐标，t=[t0,t0+dt,t0+2dt,...,t0+(N-1)dt]
 
     # ----------------------------------------------------------------------------------------#
     @property
     def f_Axis(self) -> np.ndarray:
         """
-        信号频率坐标轴
+        信号频率坐标轴, 为缓存共享的只读数组, 需修改时先复制
         """
-        return np.linspace(
-            0, self.fs, self.N, endpoint=False
+        return self.cached(
+            ("f_Axis", self.fs),
+            lambda: np.linspace(0, self.fs, self.N, endpoint=False),
         )  # 频率坐标，f=[0,df,2df,...,(N-1)df]
 
     # ----------------------------------------------------------------------------------------#
@@ -195,13 +426,30 @@ class Signal:
         """
         修改信号数据数组的指定索引值, 使Signal类对象支持切片赋值
         """
-        self.data[index] = value
+        if self._shared:  # 写时复制, 不修改共享的原始内存
+            self._data = self._data.copy()
+            self._shared = False
+        self._data[index] = value
+        self._token = next(_TOKEN)  # 数据已修改, 缓存结果随之失效
 
     # ----------------------------------------------------------------------------------------#
-    def __array__(self) -> np.ndarray:
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
         """
-        返回信号数据数组, 用于在传递给NumPy函数时自动调用
+        返回信号数据数组, 用于在传递给NumPy函数时自动调用, dtype与copy语义同NumPy 2:
+        copy=False时返回只读视图, 需要转换数据类型而无法避免拷贝时报错
         """
+        if copy:
+            return np.array(self.data, dtype=dtype, copy=True)
+        if dtype is not None and np.dtype(dtype) != self.data.dtype:
+            if copy is False:
+                raise ValueError(f"转换为{np.dtype(dtype)}需要拷贝信号数据, 不能设置copy=False")
+            return self.data.astype(dtype)
+        if self._shared:
+            return self.data  # 共享数据为只读视图, 无需拷贝
+        if copy is False:
+            view = self.data.view()
+            view.flags.writeable = False  # 只读视图, 修改数据需经__setitem__使缓存失效
+            return view
         return self.data.copy()
 
     # ----------------------------------------------------------------------------------------#
@@ -229,13 +477,16 @@ class Signal:
                 raise ValueError("两个信号长度不一致, 无法运算")
             if self.t0 != other.t0:
                 raise ValueError("两个信号起始时间不一致, 无法运算")
-            return Signal(
+            return type(self)(
                 self.data + other.data,
                 fs=self.fs,
                 t0=self.t0,
                 label=self.label + "与" + other.label + "相加信号",
-            )
-        return Signal(self.data + other, fs=self.fs, t0=self.t0, label=self.label)
+                copy=False,
+            )._own()
+        return type(self)(
+            self.data + other, fs=self.fs, t0=self.t0, label=self.label, copy=False
+        )._own()
 
     # ----------------------------------------------------------------------------------------#
     def __sub__(self, other):
@@ -249,13 +500,16 @@ class Signal:
                 raise ValueError("两个信号长度不一致, 无法运算")
             if self.t0 != other.t0:
                 raise ValueError("两个信号起始时间不一致, 无法运算")
-            return Signal(
+            return type(self)(
                 self.data - other.data,
                 fs=self.fs,
                 t0=self.t0,
                 label=self.label + "与" + other.label + "相减信号",
-            )
-        return Signal(self.data - other, fs=self.fs, t0=self.t0, label=self.label)
+                copy=False,
+            )._own()
+        return type(self)(
+            self.data - other, fs=self.fs, t0=self.t0, label=self.label, copy=False
+        )._own()
 
     def __mul__(self, other):
         """
@@ -268,13 +522,16 @@ class Signal:
                 raise ValueError("两个信号长度不一致, 无法运算")
             if self.t0 != other.t0:
                 raise ValueError("两个信号起始时间不一致, 无法运算")
-            return Signal(
+            return type(self)(
                 self.data * other.data,
                 fs=self.fs,
                 t0=self.t0,
                 label=self.label + "与" + other.label + "相乘信号",
-            )
-        return Signal(self.data * other, fs=self.fs, t0=self.t0, label=self.label)
+                copy=False,
+            )._own()
+        return type(self)(
+            self.data * other, fs=self.fs, t0=self.t0, label=self.label, copy=False
+        )._own()
 
     def __truediv__(self, other):
         """
@@ -287,13 +544,16 @@ class Signal:
                 raise ValueError("两个信号长度不一致, 无法运算")
             if self.t0 != other.t0:
                 raise ValueError("两个信号起始时间不一致, 无法运算")
-            return Signal(
+            return type(self)(
                 self.data / other.data,
                 fs=self.fs,
                 t0=self.t0,
                 label=self.label + "与" + other.label + "相除信号",
-            )
-        return Signal(self.data / other, fs=self.fs, t0=self.t0, label=self.label)
+                copy=False,
+            )._own()
+        return type(self)(
+            self.data / other, fs=self.fs, t0=self.t0, label=self.label, copy=False
+        )._own()
 
     # ----------------------------------------------------------------------------------------#
     def __div__(self, other):
@@ -309,9 +569,115 @@ class Signal:
     # ----------------------------------------------------------------------------------------#
     def copy(self) -> "Signal":
         """
-        返回Signal对象的深拷贝
+        返回Signal对象的深拷贝, 拷贝使用独立的频谱缓存与数据版本号,
+        原地修改任一信号的数据不影响另一信号的缓存结果
+        """
+        Sig = copy.copy(self)
+        Sig.data = self._data.copy()  # 赋值时生成新的版本号
+        Sig._shared = False  # 深拷贝后数据为独占内存
+        Sig.cache = SpectrumCache(self.cache.max_bytes)
+        return Sig
+
+    # ----------------------------------------------------------------------------------------#
+    @staticmethod
+    def from_file(
+        path: str,
+        label: Optional[str] = None,
+        dt: Optional[float] = None,
+        fs: Optional[int] = None,
+        T: Optional[float] = None,
+        t0: Optional[float] = 0,
+        dtype: str = "float64",
+        offset: int = 0,
+        channels: Optional[int] = None,
+    ) -> "Signal":
+        """
+        以内存映射方式从文件惰性加载信号, 数据仅在访问时从磁盘读取
+
+        参数:
+        --------
+        path : str
+            .npy文件或原始二进制文件路径
+        label : str, 可选
+            信号标签, 默认为文件名
+        dt/fs/T : float/int/float
+            采样时间间隔/采样频率/信号采样时长, 输入其中一个即可
+        t0 : float, 可选
+            信号起始时间, 默认为0
+        dtype : str, 默认为"float64"
+            原始二进制文件的数据类型, .npy文件自带类型信息时忽略
+        offset : int, 默认为0
+            原始二进制文件的文件头字节数
+        channels : int, 可选
+            原始二进制文件中按采样点交织存储的通道数, 默认为单通道
+
+        返回:
+        --------
+        Sig : Signal
+            只读共享映射内存的信号, 二维数据时为多通道信号SignalArray
+        """
+        if path.endswith(".npy"):
+            data = np.load(path, mmap_mode="r")
+        else:
+            data = np.memmap(path, dtype=dtype, mode="r", offset=offset)
+            if channels is not None:
+                data = data.reshape(-1, channels).T  # 交织存储转为通道优先视图
+        if label is None:
+            label = os.path.splitext(os.path.basename(path))[0]
+        Sig_type = SignalArray if data.ndim == 2 else Signal
+        return Sig_type(data, label=label, dt=dt, fs=fs, T=T, t0=t0, copy=False)
+
+    # ----------------------------------------------------------------------------------------#
+    @Check_Vars({"T": {"OpenLow": 0}})
+    def crop(self, t0: float, T: Optional[float] = None) -> "Signal":
+        """
+        截取指定时间段的信号, 返回共享原数据内存的只读视图信号, 内存映射信号截取时不读取磁盘
+
+        参数:
+        --------
+        t0 : float
+            截取起始时间
+        T : float, 可选
+            截取时间长度, 默认截取至信号末尾
+
+        返回:
+        --------
+        Sig : Signal
+            截取后的信号
+        """
+        if not self.t0 <= t0 < (self.T + self.t0):
+            raise ValueError("起始时间不在信号时间范围内")
+        start_n = int(round((t0 - self.t0) * self.fs))
+        if T is None:
+            end_n = self.N
+        elif T + t0 > self.T + self.t0:
+            raise ValueError("截取时间长度超过信号时间范围")
+        else:
+            end_n = start_n + int(round(T * self.fs))
+        Sig = self.view()
+        Sig.data = Sig.data[..., start_n:end_n]
+        Sig.t0 = self.t0 + start_n * self.dt
+        return Sig
+
+    # ----------------------------------------------------------------------------------------#
+    def view(self) -> "Signal":
+        """
+        返回与原信号共享数据内存的只读视图信号, 对视图信号切片赋值时自动复制数据
+        """
+        Sig = copy.copy(self)
+        Sig._data = self._data.view()  # 数据相同, 沿用版本号以复用缓存
+        Sig._data.flags.writeable = False
+        Sig._shared = True
+        return Sig
+
+    # ----------------------------------------------------------------------------------------#
+    def _own(self) -> "Signal":
         """
-        return copy.deepcopy(self)
+        声明信号数据为新分配的独占内存并解除只读保护, 用于包装运算结果而不重复拷贝
+        """
+        self.data.flags.writeable = True
+        self._shared = False
+        return self
 
     # ----------------------------------------------------------------------------------------#
     def info(self, print: bool = True) -> dict:
@@ -364,6 +730,159 @@ class Signal:
         )
 
 
+# --------------------------------------------------------------------------------------------#
+class SignalArray(Signal):
+    """
+    多通道信号类, 各通道共享同一组采样参数, 数据按(通道数, 采样点数)存储
+
+    参数:
+    --------
+    data : np.ndarray
+        输入二维数据数组, 每行为一个通道
+    label : str
+        信号标签
+    dt/fs/T : float/int/float
+        采样时间间隔/采样频率/信号采样时长, 输入其中一个即可
+    t0 : float, 可选
+        信号起始时间, 默认为0
+    copy : bool, 可选
+        是否拷贝输入数据, 默认为True; 为False时以只读视图共享输入数组内存, 写入时复制
+
+    属性：
+    --------
+    data : np.ndarray
+        输入信号的时序数据, 形状为(channels, N)
+    channels : int
+        信号通道数
+    N : int
+        单通道信号长度
+    dt, fs, T, df, t0, t_Axis, f_Axis
+        同Signal类, 所有通道共用
+
+    方法：
+    --------
+    channel(index:int) -> Signal
+        取出指定通道的单通道信号
+    from_signals(Sigs:list, label:str) -> SignalArray
+        由多个采样参数一致的单通道信号构建多通道信号
+    info(print:bool=True) -> dict
+        输出信号的采样信息
+    plot(**kwargs) -> None
+        逐通道绘制信号的时域波形图
+    """
+
+    @Check_Vars(
+        {
+            "data": {"ndim": 2},
+            "label": {},
+            "dt": {"OpenLow": 0},
+            "fs": {"Low": 1},
+            "T": {"OpenLow": 0},
+        }
+    )
+    def __init__(
+        self,
+        data: np.ndarray,
+        label: str,
+        dt: Optional[float] = None,
+        fs: Optional[int] = None,
+        T: Optional[float] = None,
+        t0: Optional[float] = 0,
+        copy: bool = True,
+    ):
+        self._setup(data, label, dt, fs, T, t0, copy)
+
+    # ----------------------------------------------------------------------------------------#
+    @property
+    def channels(self) -> int:
+        """
+        信号通道数
+        """
+        return self.data.shape[0]
+
+    # ----------------------------------------------------------------------------------------#
+    def __repr__(self) -> str:
+        """
+        返回SignalArray类对象的字符串表示, 用于调试
+        """
+        return f"SignalArray(data={self.data}, channels={self.channels}, fs={self.fs}, label={self.label})"
+
+    # ----------------------------------------------------------------------------------------#
+    def channel(self, index: int) -> Signal:
+        """
+        取出指定通道的单通道信号
+
+        参数:
+        --------
+        index : int
+            通道索引
+
+        返回:
+        --------
+        Sig : Signal
+            指定通道的单通道信号
+        """
+        return Signal(
+            self.data[index],
+            label=f"{self.label}-通道{index}",
+            fs=self.fs,
+            t0=self.t0,
+            copy=False,
+        )  # 零拷贝共享多通道数据内存
+
+    # ----------------------------------------------------------------------------------------#
+    @staticmethod
+    def from_signals(Sigs: list, label: str) -> "SignalArray":
+        """
+        由多个采样参数一致的单通道信号构建多通道信号
+
+        参数:
+        --------
+        Sigs : list
+            单通道信号列表
+        label : str
+            多通道信号标签
+
+        返回:
+        --------
+        Sig : SignalArray
+            多通道信号
+        """
+        if len(Sigs) == 0:
+            raise ValueError("输入信号列表为空")
+        for Sig in Sigs[1:]:
+            if Sig.fs != Sigs[0].fs:
+                raise ValueError("各通道信号采样频率不一致, 无法合并")
+            if Sig.N != Sigs[0].N:
+                raise ValueError("各通道信号长度不一致, 无法合并")
+            if Sig.t0 != Sigs[0].t0:
+                raise ValueError("各通道信号起始时间不一致, 无法合并")
+        return SignalArray(
+            np.stack([Sig.data for Sig in Sigs]),
+            label=label,
+            fs=Sigs[0].fs,
+            t0=Sigs[0].t0,
+            copy=False,
+        )._own()
+
+    # ----------------------------------------------------------------------------------------#
+    def info(self, print: bool = True) -> dict:
+        """
+        输出信号的采样信息, 额外包含通道数
+        """
+        info_dict = {"channels": str(self.channels)}
+        info_dict.update(super().info(print=print))
+        return info_dict
+
+    # ----------------------------------------------------------------------------------------#
+    def plot(self, **kwargs) -> None:
+        """
+        逐通道绘制信号的时域波形图
+        """
+        for i in range(self.channels):
+            self.channel(i).plot(**kwargs)
+
+
 # --------------------------------------------------------------------------------------------#
 class Analysis:
     """
@@ -372,7 +891,7 @@ class Analysis:
     参数:
     --------
     Sig : Signal
-        输入信号
+        输入信号, 可为多通道信号SignalArray; 零拷贝构建的信号不再复制, 分析直接作用于其只读视图
     plot : bool, 默认为False
         是否绘制分析结果图
     plot_save : bool, 默认为False
@@ -404,12 +923,15 @@ class Analysis:
                 res = func(self, *args, **kwargs)
                 if self.plot:
                     self.plot_kwargs["plot_save"] = self.plot_save
+                    # 多通道信号的分析结果逐通道绘图
                     if plot_type == "1D":  # plot一维连线谱
                         Axis, data = res[0], res[1]
-                        plot_func(Axis, data, **self.plot_kwargs)
+                        for ch_data in data.reshape(-1, data.shape[-1]):
+                            plot_func(Axis, ch_data, **self.plot_kwargs)
                     elif plot_type == "2D":  # imshow二维热力谱图
                         Axis1, Axis2, data = res[0], res[1], res[2]
-                        plot_func(Axis1, Axis2, data, **self.plot_kwargs)
+                        for ch_data in data.reshape(-1, *data.shape[-2:]):
+                            plot_func(Axis1, Axis2, ch_data, **self.plot_kwargs)
                 return res
 
             return wrapper
@@ -419,136 +941,180 @@ class Analysis:
     # ----------------------------------------------------------------------------------------#
     @staticmethod
     def Input(*var_checks):
-        # 根据json输入生成对应的变量检查装饰器
-        def decorator(func):
-            @wraps(func)  # 保留原函数的元信息：函数名、参数列表、注释文档、模块信息等
-            def wrapper(self, *args, **kwargs):  # 针对Analysis类的方法进行装饰
-                # ---------------------------------------------------------------------------#
-                # 获取函数输入变量
-                Vars = inspect.signature(func)
-                # 检查实际输入变量是否在函数参数中
-                if "kwargs" not in Vars.parameters:
-                    for var_name in kwargs:
-                        if var_name not in Vars.parameters:
-                            raise TypeError(
-                                f"输入变量{var_name}={kwargs[var_name]}不在函数{func.__name__}的参数列表中"
-                            )
-                bound_args = Vars.bind(self, *args, **kwargs)
-                bound_args.apply_defaults()
-                # 获取变量的类型注解
-                annotations = func.__annotations__
-                var_checks_json = var_checks[0]
-                # ---------------------------------------------------------------------------#
-                # 按指定方式检查指定的变量
-                for var_name in var_checks_json:
-                    var_value = bound_args.arguments.get(var_name)  # 变量实际值
-                    var_type = annotations.get(var_name)  # 变量预设类型
-                    var_cond = var_checks_json[var_name]  # 变量额外检查条件
-                    # -----------------------------------------------------------------------#
-                    # 对于传值的函数参数进行类型检查
-                    if var_value is not None:
-                        # -------------------------------------------------------------------#
-                        # 处理 Optional 类型
-                        if get_origin(var_type) is Union:
-                            var_type = get_args(var_type)[0]
-                        # 处理float变量的int输入
-                        if var_type is float and isinstance(var_value, int):
-                            var_value = float(var_value)
-                        # 检查输入值类型是否为预设类型
-                        if var_type and not isinstance(var_value, var_type):
-                            raise TypeError(
-                                f"输入变量 '{var_name}' 类型不为要求的 {var_type.__name__}, 实际为 {type(var_value).__name__}"
-                            )
-                        # 针对某些变量类型进行额外检查
-                        # -------------------------------------------------------------------#
-                        # array类检查
-                        if isinstance(var_value, np.ndarray):
-                            # 条件1：数组维度检查
-                            if "ndim" in var_cond:
-                                if var_value.ndim != var_cond["ndim"]:
-                                    raise ValueError(
-                                        f"输入array数组 '{var_name}' 维度不为要求的 {var_cond['ndim']}, 实际为{var_value.ndim}"
-                                    )
-                        # -------------------------------------------------------------------#
-                        # int类
-                        if isinstance(var_value, int):
-                            # 条件1：下界检查
-                            if "Low" in var_cond:
-                                if not (var_cond["Low"] <= var_value):
-                                    raise ValueError(
-                                        f"输入int变量 '{var_name}' 小于要求的下界 {var_cond["Low"]}, 实际为{var_value}"
-                                    )
-                            # 条件2：上界检查
-                            if "High" in var_cond:
-                                if not (var_value <= var_cond["High"]):
-                                    raise ValueError(
-                                        f"输入int变量 '{var_name}' 大于要求的上界 {var_cond["High"]}, 实际为{var_value}"
-                                    )
-                        # -------------------------------------------------------------------#
-                        # float类
-                        if isinstance(var_value, float):
-                            # 条件1：闭下界检查
-                            if "CloseLow" in var_cond:
-                                if not (var_cond["CloseLow"] <= var_value):
-                                    raise ValueError(
-                                        f"输入float变量 '{var_name}' 小于要求的下界 {var_cond["CloseLow"]}, 实际为{var_value}"
-                                    )
-                            # 条件2：闭上界检查
-                            if "CloseHigh" in var_cond:
-                                if not (var_value <= var_cond["CloseHigh"]):
-                                    raise ValueError(
-                                        f"输入float变量 '{var_name}' 大于要求的上界 {var_cond["CloseHigh"]}, 实际为{var_value}"
-                                    )
-                            # 条件3：开下界检查
-                            if "OpenLow" in var_cond:
-                                if not (var_cond["OpenLow"] < var_value):
-                                    raise ValueError(
-                                        f"输入float变量 '{var_name}' 小于或等于要求的下界 {var_cond["OpenLow"]}, 实际为{var_value}"
-                                    )
-                            # 条件4：开上界检查
-                            if "OpenHigh" in var_cond:
-                                if not (var_value < var_cond["OpenHigh"]):
-                                    raise ValueError(
-                                        f"输入float变量 '{var_name}' 大于或等于要求的上界 {var_cond["OpenHigh"]}, 实际为{var_value}"
-                                    )
-                        # -------------------------------------------------------------------#
-                        # str类
-                        if isinstance(var_value, str):
-                            # 条件1：字符串内容检查
-                            if "Content" in var_cond:
-                                if var_value not in var_cond["Content"]:
-                                    raise ValueError(
-                                        f"输入str变量 '{var_name}' 不在要求的范围 {var_cond['Content']}, 实际为{var_value}"
-                                    )
-                        # -------------------------------------------------------------------#
-                        # Signal类
-                        if isinstance(var_value, Signal):
-                            pass
-                # ---------------------------------------------------------------------------#
-                return func(self, *args, **kwargs)  # 检查通过，执行类方法
-
-            return wrapper
-
-        return decorator
+        # 根据json输入生成对应的变量检查装饰器, 与Check_Vars共用预编译检查规则
+        return Check_Vars(*var_checks)
 
     # ----------------------------------------------------------------------------------------#
     def __init__(
         self, Sig: Signal, plot: bool = False, plot_save: bool = False, **kwargs
     ):
-        self.Sig = Sig.copy()  # 防止对原信号进行修改
+        # 防止对原信号进行修改, 零拷贝信号则共享只读视图, 修改时自动复制
+        self.Sig = Sig.view() if Sig._shared else Sig.copy()
         # 绘图参数全局设置
         self.plot = plot
         self.plot_save = plot_save
         self.plot_kwargs = kwargs
 
 
+# --------------------------------------------------------------------------------------------#
+class PolyResampler:
+    """
+    多相有理数比重采样器, 对输入进行up倍上采样、抗混叠低通滤波后down倍抽取,
+    只计算被保留的输出点; 支持分块/流式输入, 块间保留滤波器状态,
+    各块输出拼接后与整段输入的scipy.signal.resample_poly结果一致
+
+    参数:
+    --------
+    up : int
+        上采样倍数
+    down : int
+        下采样倍数
+    half_len : int, 可选
+        低通滤波器半长, 默认为10*max(up, down)
+
+    属性:
+    --------
+    up : int
+        约分后的上采样倍数
+    down : int
+        约分后的下采样倍数
+    count : int
+        已输出的点数
+
+    方法:
+    --------
+    prime(history:np.ndarray) -> None
+        以输入起点之前的真实数据作为滤波器历史, 代替补零
+    process(x:np.ndarray) -> np.ndarray
+        输入新的数据块, 返回当前可计算的全部输出点
+    flush() -> np.ndarray
+        以零值补齐输入末端, 返回剩余输出点
+    """
+
+    @Check_Vars({"up": {"Low": 1}, "down": {"Low": 1}, "half_len": {"Low": 1}})
+    def __init__(self, up: int, down: int, half_len: Optional[int] = None):
+        ratio = Fraction(up, down)
+        self.up, self.down = ratio.numerator, ratio.denominator
+        max_rate = max(self.up, self.down)
+        self.half_len = 10 * max_rate if half_len is None else half_len
+        if max_rate == 1:  # 采样率不变, 直接输出
+            self._taps = None
+        else:
+            # Kaiser窗FIR低通滤波器, 截止频率为上采样后Nyquist频率的1/max_rate
+            h = signal.firwin(
+                2 * self.half_len + 1, 1 / max_rate, window=("kaiser", 5.0)
+            )
+            h *= self.up  # 补偿上采样插零的幅值损失
+            K = -(-len(h) // self.up)  # 每相滤波器长度
+            h = np.concatenate([h, np.zeros(K * self.up - len(h))])
+            # 第r相滤波器为h[r::up], 逆序后可直接与按时间正序的输入窗口做内积
+            self._taps = h.reshape(K, self.up).T[:, ::-1].copy()
+        self._buf = None  # 尚需使用的输入历史
+        self._base = 0  # _buf首点对应的输入全局索引
+        self._history = None  # 输入起点之前的真实数据
+        self._n_in = 0
+        self.count = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def prime(self, history: np.ndarray) -> None:
+        """
+        以输入起点之前的真实数据作为滤波器历史, 代替补零, 避免从信号中段开始重采样时的起始瞬态;
+        需在首次process前调用, 仅使用最后(每相滤波器长度-1)点
+
+        参数:
+        --------
+        history : np.ndarray
+            输入起点之前的数据, 沿最后一轴按时间正序
+        """
+        if self._buf is not None:
+            raise ValueError("滤波器历史需在首次输入数据前设置")
+        if self._taps is not None:
+            K = self._taps.shape[-1]
+            self._history = np.asarray(history)[..., max(history.shape[-1] - K + 1, 0) :]
+
+    # ----------------------------------------------------------------------------------------#
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """
+        输入新的数据块, 返回当前可计算的全部输出点
+
+        参数:
+        --------
+        x : np.ndarray
+            新数据块, 沿最后一轴重采样
+
+        返回:
+        --------
+        y : np.ndarray
+            新增的输出点
+        """
+        x = np.asarray(x)
+        self._n_in += x.shape[-1]
+        if self._taps is None:
+            self._buf = x[..., :0]  # 仅记录输入形状
+            self.count += x.shape[-1]
+            return x.copy()
+        K = self._taps.shape[-1]
+        if self._buf is None:  # 输入起点之前补零
+            dtype = complex_dtype(x) if np.iscomplexobj(x) else float_dtype(x)
+            self._taps = self._taps.astype(float_dtype(x), copy=False)
+            self._buf = np.zeros(x.shape[:-1] + (K - 1,), dtype=dtype)
+            if self._history is not None and self._history.shape[-1] > 0:
+                self._buf[..., K - 1 - self._history.shape[-1] :] = self._history
+                self._history = None
+            self._base = -(K - 1)
+        buf = np.concatenate([self._buf, x], axis=-1, dtype=self._buf.dtype)
+        end = self._base + buf.shape[-1]  # 已接收输入的末端全局索引
+        # 第m个输出点依赖的最新输入索引为(m*down+half_len)//up, 需小于end
+        n_out = (end * self.up - 1 - self.half_len) // self.down + 1 - self.count
+        n_out = max(n_out, 0)
+        y = np.empty(buf.shape[:-1] + (n_out,), dtype=buf.dtype)
+        if n_out > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(buf, K, axis=-1)
+            # 输出序号相差up的点使用同一相滤波器, 对应输入窗口起点相差down
+            for o in range(min(self.up, n_out)):
+                j0, r = divmod((self.count + o) * self.down + self.half_len, self.up)
+                start = j0 - K + 1 - self._base
+                num = len(range(o, n_out, self.up))
+                y[..., o :: self.up] = (
+                    frames[..., start :: self.down, :][..., :num, :] @ self._taps[r]
+                )
+            self.count += n_out
+        # 仅保留后续输出所需的输入历史
+        keep = (self.count * self.down + self.half_len) // self.up - K + 1
+        keep = min(max(keep, self._base), end)
+        self._buf = buf[..., keep - self._base :].copy()
+        self._base = keep
+        return y
+
+    # ----------------------------------------------------------------------------------------#
+    def flush(self) -> np.ndarray:
+        """
+        以零值补齐输入末端, 返回剩余输出点, 总输出点数为ceil(输入点数*up/down)
+
+        返回:
+        --------
+        y : np.ndarray
+            剩余的输出点
+        """
+        total = -(-self._n_in * self.up // self.down)
+        remain = total - self.count
+        if self._buf is None or remain <= 0:
+            return np.empty(0) if self._buf is None else self._buf[..., :0].copy()
+        last = ((total - 1) * self.down + self.half_len) // self.up  # 末个输出点依赖的输入索引
+        pad = last + 1 - (self._base + self._buf.shape[-1])
+        n_in = self._n_in
+        y = self.process(np.zeros(self._buf.shape[:-1] + (pad,), self._buf.dtype))
+        self._n_in, self.count = n_in, total
+        return y[..., :remain]
+
+
 # --------------------------------------------------------------------------------------------#
 @Check_Vars({"Sig": {}, "down_fs": {"Low": 1}, "T": {"OpenLow": 0}})
 def resample(
     Sig: Signal, down_fs: int, t0: float = 0, T: Optional[float] = None
 ) -> Signal:
     """
-    对信号进行任意时间段的重采样
+    对信号进行任意时间段的重采样, 采用多相滤波实现任意有理数比的抗混叠降采样
 
     参数:
     --------
@@ -558,7 +1124,7 @@ def resample(
         重采样频率
     t0 : float
         重采样起始时间
-    t1 : float
+    T : float
         重采样时间长度
 
     返回:
@@ -566,11 +1132,8 @@ def resample(
     resampled_Sig : Signal
         重采样后的信号
     """
-    # 获取重采样间隔点数
     if down_fs > Sig.fs:
         raise ValueError("新采样频率应不大于原采样频率")
-    else:
-        ration = int(Sig.fs / down_fs)
     # 获取重采样起始点的索引
     if not Sig.t0 <= t0 < (Sig.T + Sig.t0):
         raise ValueError("起始时间不在信号时间范围内")
@@ -578,17 +1141,33 @@ def resample(
         start_n = int((t0 - Sig.t0) / Sig.dt)
     # 获取重采样点数
     if T is None:
-        resample_N = -1
+        resample_N = None
     elif T + t0 >= Sig.T + Sig.t0:
         raise ValueError("重采样时间长度超过信号时间范围")
     else:
-        resample_N = int(T / (Sig.dt * ration))  # N = T/(dt*ration)
+        resample_N = int(T * down_fs)
     # ------------------------------------------------------------------------------------#
-    # 对信号进行重采样
-    resampled_data = Sig.data[start_n::ration][:resample_N]  # 重采样
-    resampled_Sig = Signal(
-        resampled_data, label="重采样" + Sig.label, dt=ration * Sig.dt, t0=t0
-    )  # 由于离散信号，实际采样率为fs/ration
+    # 分块输入多相重采样器, 以起始点之前、指定时长之后的真实数据作为滤波头尾
+    ratio = Fraction(down_fs).limit_denominator(1000) / Fraction(
+        Sig.fs
+    ).limit_denominator(1000)
+    resampler = PolyResampler(ratio.numerator, ratio.denominator)
+    resampler.prime(Sig.data[..., :start_n])
+    blocks = []
+    for i in range(start_n, Sig.N, CHUNK_SIZE):
+        blocks.append(resampler.process(Sig.data[..., i : i + CHUNK_SIZE]))
+        if resample_N is not None and resampler.count >= resample_N:
+            break
+    else:
+        blocks.append(resampler.flush())
+    resampled_data = np.concatenate(blocks, axis=-1)[..., :resample_N]
+    resampled_Sig = type(Sig)(
+        resampled_data,
+        label="重采样" + Sig.label,
+        dt=Sig.dt * resampler.down / resampler.up,
+        t0=t0,
+        copy=False,
+    )._own()
     return resampled_Sig
 
 
@@ -607,4 +1186,4 @@ def Sig_Periodic(
             2 * np.pi * f * t_Axis + phi
         )  # 生成任意频率、幅值、相位的余弦信号
     data += random.randn(len(t_Axis)) * noise  # 加入高斯白噪声
-    return Signal(data, fs=fs, label="仿真含噪准周期信号")
+    return Signal(data, fs=fs, label="仿真含噪准周期信号", copy=False)._own()
@@ -0,0 +1,931 @@
+"""
+# Stream
+流式信号处理模块, 用于连续采集数据的分块接入与滑动窗口分析
+
+## 内容
+    - class:
+        1. StreamSource: 流式信号源, 将连续到达的数据块包装为带运行起始时间的信号块
+        2. RingBuffer: 有界环形缓冲区, 可零拷贝地将最新窗口呈现为Signal视图
+        3. RunningMoments: 可合并的运行统计矩, 支持跨数据块与跨进程合并
+        4. OnlineTrend: 在线时域统计特征趋势计算器, 随数据到达增量输出各窗口特征
+        5. OnlineSTFT: 在线短时傅里叶变换, 随数据到达增量输出谱图列
+        6. OnlineISTFT: 在线短时傅里叶逆变换, 逐块重叠相加输出重构信号
+"""
+
+from .dependencies import Optional, Callable
+from .dependencies import np
+from .dependencies import fft, signal
+
+from .decorators import Check_Vars
+
+from .Signal import Signal, SignalArray
+
+from .BasicSP import window, TREND_FEATURES, _TREND_FEATURES, _overlap_add
+
+
+# --------------------------------------------------------------------------------------------#
+# -## ----------------------------------------------------------------------------------------#
+# -----## ------------------------------------------------------------------------------------#
+# ---------## --------------------------------------------------------------------------------#
+class RingBuffer:
+    """
+    有界环形缓冲区, 以镜像双倍存储保证最新窗口始终为连续内存, 数据接入与窗口提取均不重新分配内存
+
+    参数:
+    --------
+    capacity : int
+        缓冲区容量, 即可提取的最长窗口点数
+    fs : int
+        采样频率
+    channels : int, 可选
+        通道数, 默认为单通道
+    dtype : str, 默认为"float64"
+        数据类型
+    t0 : float, 默认为0
+        首个采样点的时间
+    label : str, 默认为"流式信号"
+        提取窗口信号的标签
+
+    属性:
+    --------
+    capacity : int
+        缓冲区容量
+    size : int
+        当前缓冲区内有效点数
+    count : int
+        累计接入的总点数
+
+    方法:
+    --------
+    push(block:np.ndarray) -> None
+        接入新的数据块
+    latest(n:int=None) -> Signal
+        将最新的n点数据呈现为零拷贝的只读Signal视图
+    """
+
+    @Check_Vars({"capacity": {"Low": 1}, "fs": {"Low": 1}, "channels": {"Low": 1}})
+    def __init__(
+        self,
+        capacity: int,
+        fs: int,
+        channels: Optional[int] = None,
+        dtype: str = "float64",
+        t0: float = 0,
+        label: str = "流式信号",
+    ):
+        self.capacity = capacity
+        self.fs = fs
+        self.channels = channels
+        self.t0 = t0
+        self.label = label
+        shape = (2 * capacity,) if channels is None else (channels, 2 * capacity)
+        self._buf = np.zeros(shape, dtype=dtype)  # 前后两半镜像存储
+        self._head = 0  # 下一个写入位置, 范围[0, capacity)
+        self.count = 0
+
+    # ----------------------------------------------------------------------------------------#
+    @property
+    def size(self) -> int:
+        """
+        当前缓冲区内有效点数
+        """
+        return min(self.count, self.capacity)
+
+    # ----------------------------------------------------------------------------------------#
+    def push(self, block: np.ndarray) -> None:
+        """
+        接入新的数据块, 超出容量时覆盖最旧的数据
+
+        参数:
+        --------
+        block : np.ndarray or Signal
+            新数据块, 多通道时形状为(channels, n)
+        """
+        if isinstance(block, Signal):
+            block = block.data
+        n = block.shape[-1]
+        cap = self.capacity
+        if n > cap:  # 只需保留最新的capacity点
+            self._head = (self._head + n - cap) % cap
+            self.count += n - cap
+            block = block[..., -cap:]
+            n = cap
+        head = self._head
+        first = min(n, cap - head)  # 写入至缓冲区末尾的点数
+        self._buf[..., head : head + first] = block[..., :first]
+        self._buf[..., head + cap : head + cap + first] = block[..., :first]
+        if first < n:  # 回绕写入缓冲区头部
+            rest = n - first
+            self._buf[..., :rest] = block[..., first:]
+            self._buf[..., cap : cap + rest] = block[..., first:]
+        self._head = (head + n) % cap
+        self.count += n
+
+    # ----------------------------------------------------------------------------------------#
+    def latest(self, n: Optional[int] = None) -> Signal:
+        """
+        将最新的n点数据呈现为零拷贝的只读Signal视图, 视图数据在下次push后会被覆盖
+
+        参数:
+        --------
+        n : int, 可选
+            窗口点数, 默认为当前有效点数
+
+        返回:
+        --------
+        Sig : Signal
+            最新窗口信号, 多通道时为SignalArray
+        """
+        if n is None:
+            n = self.size
+        if not 0 < n <= self.size:
+            raise ValueError(f"窗口点数{n}超出缓冲区有效点数{self.size}")
+        end = self._head + self.capacity  # 镜像存储中最新点之后的位置
+        Sig_type = Signal if self.channels is None else SignalArray
+        return Sig_type(
+            self._buf[..., end - n : end],
+            label=self.label,
+            fs=self.fs,
+            t0=self.t0 + (self.count - n) / self.fs,
+            copy=False,
+        )
+
+
+# --------------------------------------------------------------------------------------------#
+class StreamSource:
+    """
+    流式信号源, 将连续到达的数据块包装为带运行起始时间的零拷贝信号块
+
+    参数:
+    --------
+    blocks : Iterable
+        数据块的可迭代对象, 如采集卡回调生成器, 多通道时每块形状为(channels, n)
+    fs : int
+        采样频率
+    t0 : float, 默认为0
+        首个数据块的起始时间
+    label : str, 默认为"流式信号"
+        信号块标签
+
+    属性:
+    --------
+    count : int
+        已产生的总点数
+
+    方法:
+    --------
+    __iter__() -> Iterator[Signal]
+        逐块产生信号, 各块t0连续递增
+    sliding(nperseg:int, nhop:int) -> Iterator[Signal]
+        产生长度为nperseg、步进为nhop的滑动窗口信号
+    """
+
+    @Check_Vars({"fs": {"Low": 1}})
+    def __init__(self, blocks, fs: int, t0: float = 0, label: str = "流式信号"):
+        self.blocks = blocks
+        self.fs = fs
+        self.t0 = t0
+        self.label = label
+        self.count = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def __iter__(self):
+        for block in self.blocks:
+            block = np.asarray(block)
+            Sig_type = SignalArray if block.ndim == 2 else Signal
+            Sig = Sig_type(
+                block,
+                label=self.label,
+                fs=self.fs,
+                t0=self.t0 + self.count / self.fs,  # 以累计点数计算, 避免时间累积误差
+                copy=False,
+            )
+            self.count += block.shape[-1]
+            yield Sig
+
+    # ----------------------------------------------------------------------------------------#
+    @Check_Vars({"nperseg": {"Low": 1}, "nhop": {"Low": 1}})
+    def sliding(self, nperseg: int, nhop: int):
+        """
+        产生长度为nperseg、步进为nhop的滑动窗口信号, 窗口为环形缓冲区的只读视图
+
+        参数:
+        --------
+        nperseg : int
+            窗口点数
+        nhop : int
+            窗口步进点数
+
+        返回:
+        --------
+        Iterator[Signal]
+            滑动窗口信号, 每个窗口在迭代至下一窗口前有效
+        """
+        buffer = None
+        pending = nperseg  # 距离下一个完整窗口尚需的点数
+        for Sig in self:
+            data = Sig.data
+            if buffer is None:  # 按首块数据确定通道数与数据类型
+                buffer = RingBuffer(
+                    nperseg,
+                    self.fs,
+                    channels=data.shape[0] if data.ndim == 2 else None,
+                    dtype=data.dtype,
+                    t0=Sig.t0,
+                    label=self.label,
+                )
+            i, n = 0, data.shape[-1]
+            while i < n:
+                k = min(pending, n - i)
+                buffer.push(data[..., i : i + k])
+                i += k
+                pending -= k
+                if pending == 0:
+                    yield buffer.latest()
+                    pending = nhop
+
+
+# --------------------------------------------------------------------------------------------#
+class RunningMoments:
+    """
+    可合并的运行统计矩, 以Welford/Pébay成对合并公式数值稳定地累积均值与二至四阶中心矩,
+    以及绝对值和、方根绝对值和与绝对值最大值, 可跨数据块、跨进程合并后计算趋势统计特征
+
+    参数:
+    --------
+    shape : tuple, 默认为()
+        统计量数组形状, 多通道时为(channels,)
+
+    属性:
+    --------
+    n : np.ndarray
+        累积点数
+    mean : np.ndarray
+        均值
+    M2, M3, M4 : np.ndarray
+        二至四阶中心矩之和
+    abs_sum : np.ndarray
+        绝对值之和
+    sqrt_abs_sum : np.ndarray
+        绝对值平方根之和
+    max_abs : np.ndarray
+        绝对值最大值
+
+    方法:
+    --------
+    from_data(data:np.ndarray) -> RunningMoments
+        沿最后一轴统计数据的各阶矩
+    update(data:np.ndarray) -> None
+        累积新的数据块
+    merge(other:RunningMoments) -> RunningMoments
+        合并两组统计矩, 也可使用"+"运算
+    reduce() -> RunningMoments
+        沿统计量数组最后一轴成对合并
+    features(Features:list=None) -> dict
+        计算以特征名为键的趋势统计特征
+    """
+
+    _FIELDS = ("n", "mean", "M2", "M3", "M4", "abs_sum", "sqrt_abs_sum", "max_abs")
+
+    def __init__(self, shape: tuple = ()):
+        for field in self._FIELDS:
+            setattr(self, field, np.zeros(shape))
+
+    # ----------------------------------------------------------------------------------------#
+    @staticmethod
+    def from_data(data: np.ndarray) -> "RunningMoments":
+        """
+        沿最后一轴统计数据的各阶矩, 先中心化再求矩以保证数值稳定
+
+        参数:
+        --------
+        data : np.ndarray or Signal
+            输入数据
+
+        返回:
+        --------
+        moments : RunningMoments
+            统计矩, 形状为data.shape[:-1]
+        """
+        if isinstance(data, Signal):
+            data = data.data
+        moments = RunningMoments.__new__(RunningMoments)
+        moments.n = np.full(data.shape[:-1], data.shape[-1], dtype=float)
+        moments.mean = np.mean(data, axis=-1)
+        dev = data - moments.mean[..., None]
+        dev_sq = np.square(dev)
+        moments.M2 = np.sum(dev_sq, axis=-1)
+        moments.M3 = np.sum(dev_sq * dev, axis=-1)
+        moments.M4 = np.sum(np.square(dev_sq), axis=-1)
+        abs_data = np.abs(data)
+        moments.abs_sum = np.sum(abs_data, axis=-1)
+        moments.sqrt_abs_sum = np.sum(np.sqrt(abs_data), axis=-1)
+        moments.max_abs = np.max(abs_data, axis=-1)
+        return moments
+
+    # ----------------------------------------------------------------------------------------#
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """
+        合并两组统计矩, 结果与对两组数据整体统计一致
+
+        参数:
+        --------
+        other : RunningMoments
+            另一组统计矩
+
+        返回:
+        --------
+        moments : RunningMoments
+            合并后的统计矩
+        """
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(divide="ignore", invalid="ignore"):  # 空统计矩n=0
+            d = other.mean - self.mean
+            d_n = np.where(n > 0, d / n, 0)
+            moments = RunningMoments.__new__(RunningMoments)
+            moments.n = n
+            moments.mean = self.mean + d_n * nb
+            moments.M2 = self.M2 + other.M2 + d * d_n * na * nb
+            moments.M3 = (
+                self.M3
+                + other.M3
+                + d * d_n**2 * na * nb * (na - nb)
+                + 3 * d_n * (na * other.M2 - nb * self.M2)
+            )
+            moments.M4 = (
+                self.M4
+                + other.M4
+                + d * d_n**3 * na * nb * (na**2 - na * nb + nb**2)
+                + 6 * d_n**2 * (na**2 * other.M2 + nb**2 * self.M2)
+                + 4 * d_n * (na * other.M3 - nb * self.M3)
+            )
+        moments.abs_sum = self.abs_sum + other.abs_sum
+        moments.sqrt_abs_sum = self.sqrt_abs_sum + other.sqrt_abs_sum
+        moments.max_abs = np.maximum(self.max_abs, other.max_abs)
+        return moments
+
+    __add__ = merge
+
+    # ----------------------------------------------------------------------------------------#
+    def update(self, data: np.ndarray) -> None:
+        """
+        累积新的数据块
+
+        参数:
+        --------
+        data : np.ndarray or Signal
+            新数据块, 沿最后一轴统计
+        """
+        self.__dict__.update(self.merge(RunningMoments.from_data(data)).__dict__)
+
+    # ----------------------------------------------------------------------------------------#
+    def _map(self, func: Callable) -> "RunningMoments":
+        moments = RunningMoments.__new__(RunningMoments)
+        for field in self._FIELDS:
+            setattr(moments, field, func(getattr(self, field)))
+        return moments
+
+    def reduce(self) -> "RunningMoments":
+        """
+        沿统计量数组最后一轴成对合并, 合并次数为对数级
+
+        返回:
+        --------
+        moments : RunningMoments
+            合并后的统计矩, 形状去除最后一轴
+        """
+        moments = self
+        while moments.n.shape[-1] > 1:
+            k = moments.n.shape[-1]
+            merged = moments._map(lambda v: v[..., 0 : k - 1 : 2]).merge(
+                moments._map(lambda v: v[..., 1:k:2])
+            )
+            if k % 2:  # 奇数个时末项留待下一轮合并
+                last = moments._map(lambda v: v[..., -1:])
+                merged = RunningMoments._concat([merged, last])
+            moments = merged
+        return moments._map(lambda v: v[..., 0])
+
+    @staticmethod
+    def _concat(moments_list: list) -> "RunningMoments":
+        moments = RunningMoments.__new__(RunningMoments)
+        for field in RunningMoments._FIELDS:
+            setattr(
+                moments,
+                field,
+                np.concatenate([getattr(m, field) for m in moments_list], axis=-1),
+            )
+        return moments
+
+    # ----------------------------------------------------------------------------------------#
+    def _moment(self, name: str) -> np.ndarray:
+        # 与Time_Analysis.Trends共用特征表达式所需的中间矩
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if name == "mean":
+                return self.mean
+            if name == "max_abs":
+                return self.max_abs
+            if name == "mean_abs":
+                return self.abs_sum / self.n
+            if name == "mean_sqrt_abs":
+                return self.sqrt_abs_sum / self.n
+            if name == "mean_sq":
+                return self.M2 / self.n + np.square(self.mean)
+            return getattr(self, "M" + name[1]) / self.n  # m2, m3, m4
+
+    def features(self, Features: Optional[list] = None) -> dict:
+        """
+        计算以特征名为键的趋势统计特征
+
+        参数:
+        --------
+        Features : list, 可选
+            统计特征指标列表, 可选项同Time_Analysis.Trend, 默认为全部指标
+
+        返回:
+        --------
+        features : dict
+            以特征名为键的统计特征
+        """
+        Features = TREND_FEATURES if Features is None else Features
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                Feature: _TREND_FEATURES[Feature](self._moment) for Feature in Features
+            }
+
+
+# --------------------------------------------------------------------------------------------#
+class OnlineTrend:
+    """
+    在线时域统计特征趋势计算器, 随数据块到达增量输出各完整窗口的特征,
+    与Time_Analysis.Trends的窗口划分一致; 数据按gcd(步长, 段长)分为小块并以统计矩累积,
+    内存占用仅与窗口长度有关, 与数据流长度无关
+
+    参数:
+    --------
+    fs : int
+        采样频率
+    step : float
+        时间趋势采样步长
+    SegLength : float
+        时间趋势采样段长
+    Features : list, 可选
+        统计特征指标列表, 可选项同Time_Analysis.Trend, 默认为全部指标
+    t0 : float, 默认为0
+        数据流起始时间
+
+    属性:
+    --------
+    count : int
+        已输出的窗口数
+
+    方法:
+    --------
+    push(block:np.ndarray) -> tuple
+        接入新的数据块, 返回新完成窗口的时间轴与特征字典
+    """
+
+    @Check_Vars({"fs": {"Low": 1}, "step": {"OpenLow": 0}, "SegLength": {"OpenLow": 0}})
+    def __init__(
+        self,
+        fs: int,
+        step: float,
+        SegLength: float,
+        Features: Optional[list] = None,
+        t0: float = 0,
+    ):
+        self.fs = fs
+        self.t0 = t0
+        self.Features = list(TREND_FEATURES) if Features is None else list(Features)
+        for Feature in self.Features:
+            if Feature not in TREND_FEATURES:
+                raise ValueError(f"不支持的特征指标{Feature}")
+        self.stepNum = int(step * fs)
+        self.SegNum = int(SegLength * fs)
+        if self.stepNum < 1 or self.SegNum < 1:
+            raise ValueError("趋势采样步长或段长小于信号采样间隔")
+        self._blk = int(np.gcd(self.stepNum, self.SegNum))  # 小块点数
+        self._partial = None  # 未凑满一个小块的剩余数据
+        self._blocks = None  # 尚需使用的小块统计矩, 最后一轴为小块序号
+        self._blk0 = 0  # _blocks首个小块的全局序号
+        self.count = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def push(self, block: np.ndarray) -> tuple:
+        """
+        接入新的数据块, 返回新完成窗口的时间轴与特征字典
+
+        参数:
+        --------
+        block : np.ndarray or Signal
+            新数据块, 多通道时形状为(channels, n)
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            新完成窗口的起始时间
+        trends : dict
+            以特征名为键的特征, 多通道时前置通道轴
+        """
+        data = block.data if isinstance(block, Signal) else np.asarray(block)
+        if self._partial is not None:
+            data = np.concatenate([self._partial, data], axis=-1)
+        g = self._blk
+        nb = data.shape[-1] // g
+        self._partial = data[..., nb * g :].copy()
+        if nb > 0:
+            blocks = RunningMoments.from_data(
+                data[..., : nb * g].reshape(data.shape[:-1] + (nb, g))
+            )
+            if self._blocks is not None:
+                blocks = RunningMoments._concat([self._blocks, blocks])
+            self._blocks = blocks
+        # ------------------------------------------------------------------------------------#
+        # 由小块统计矩合并出全部新完成窗口的统计矩
+        seg_blk, hop_blk = self.SegNum // g, self.stepNum // g
+        stored = 0 if self._blocks is None else self._blocks.n.shape[-1]
+        end = (self._blk0 + stored - seg_blk) // hop_blk + 1  # 已完成窗口数
+        num = max(end - self.count, 0)
+        if num > 0:
+            start = self.count * hop_blk - self._blk0
+            window_moments = self._blocks._map(
+                lambda v: np.lib.stride_tricks.sliding_window_view(
+                    v[..., start:], seg_blk, axis=-1
+                )[..., ::hop_blk, :][..., :num, :]
+            ).reduce()
+            trends = window_moments.features(self.Features)
+        else:
+            trends = {
+                Feature: np.zeros(data.shape[:-1] + (0,)) for Feature in self.Features
+            }
+        t_Axis = self.t0 + np.arange(self.count, end if num else self.count) * (
+            self.stepNum / self.fs
+        )
+        self.count += num
+        # 仅保留后续窗口所需的小块
+        if self._blocks is not None:
+            drop = min(self.count * hop_blk - self._blk0, stored)
+            if drop > 0:
+                self._blocks = self._blocks._map(lambda v: v[..., drop:].copy())
+                self._blk0 += drop
+        return t_Axis, trends
+
+
+# --------------------------------------------------------------------------------------------#
+class OnlineSTFT:
+    """
+    在线短时傅里叶变换, 随数据块到达增量输出已完整的谱图列, 分帧与TimeFre_Analysis.stft一致:
+    第k帧以k*nhop点为中心, 数据流开头补nperseg//2个零点, flush()时末尾补零输出剩余帧;
+    不足一帧的尾部数据保留在预分配缓冲区中, 稳态下缓冲区不重新分配内存
+
+    参数:
+    --------
+    fs : int
+        采样频率
+    nperseg : int
+        段长
+    nhop : int
+        段移
+    WinType : str, 默认为"矩形窗"
+        加窗类型, 可选项同TimeFre_Analysis.stft
+    output : str, 默认为"complex"
+        输出形式, 可选:
+                    "complex": 双边复数谱, 同TimeFre_Analysis.stft
+                    "magnitude": 单边傅里叶级数谱幅值, 同TimeFre_Analysis.st_Cft
+    channels : int, 可选
+        通道数, 默认为单通道
+    dtype : str, 默认为"float64"
+        计算精度
+    t0 : float, 默认为0
+        数据流起始时间
+
+    属性:
+    --------
+    count : int
+        累计接入的总点数
+    frames : int
+        已输出的帧数
+    f_Axis : np.ndarray
+        输出谱图的频率轴
+
+    方法:
+    --------
+    push(block:np.ndarray) -> tuple
+        接入新的数据块, 返回新完成帧的时间轴、频率轴与谱图列
+    flush() -> tuple
+        数据流结束时末尾补零, 输出剩余帧并重置状态
+    """
+
+    @Check_Vars(
+        {
+            "fs": {"Low": 1},
+            "nperseg": {"Low": 2},
+            "nhop": {"Low": 1},
+            "output": {"Content": ("complex", "magnitude")},
+            "channels": {"Low": 1},
+        }
+    )
+    def __init__(
+        self,
+        fs: int,
+        nperseg: int,
+        nhop: int,
+        WinType: str = "矩形窗",
+        output: str = "complex",
+        channels: Optional[int] = None,
+        dtype: str = "float64",
+        t0: float = 0,
+    ):
+        if nhop > nperseg + 1:
+            raise ValueError(
+                f"段移nhop{nhop}不能大于段长nperseg{nperseg}, 会造成信息缺失"
+            )
+        self.fs = fs
+        self.nperseg = nperseg
+        self.nhop = nhop
+        self.output = output
+        self.t0 = t0
+        self._lead = () if channels is None else (channels,)
+        self._dtype = np.dtype(dtype)
+        _, _, self._win = window(type=WinType, num=nperseg, dtype=self._dtype)
+        self.f_Axis = np.linspace(0, fs, nperseg, endpoint=False)
+        if output == "magnitude":
+            self.f_Axis = self.f_Axis[: nperseg // 2]
+        self._buf = np.zeros(self._lead + (2 * nperseg,), dtype=self._dtype)
+        self._seg = None  # 加窗帧缓冲区, 按需扩容
+        self._out = None  # 输出谱图列缓冲区, 按需扩容
+        self._reset()
+
+    def _reset(self) -> None:
+        self._fill = self.nperseg // 2  # 缓冲区有效点数, 开头补零同离线stft
+        self._buf[..., : self._fill] = 0
+        self._skip = 0  # 段移大于段长时, 下一帧之前尚需跳过的点数
+        self.count = 0
+        self.frames = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def _reserve(self, fill: int, num: int) -> None:
+        """
+        缓冲区容量不足时扩容为所需的2倍, 稳态块长下不再分配
+        """
+        if fill > self._buf.shape[-1]:
+            buf = np.zeros(self._lead + (2 * fill,), dtype=self._dtype)
+            buf[..., : self._fill] = self._buf[..., : self._fill]
+            self._buf = buf
+        if num > 0 and (self._seg is None or num > self._seg.shape[-2]):
+            width = self.nperseg if self.output == "complex" else self.nperseg // 2
+            out_dtype = (
+                np.result_type(self._dtype, np.complex64)
+                if self.output == "complex"
+                else self._dtype
+            )
+            self._seg = np.empty(self._lead + (2 * num, self.nperseg), dtype=self._dtype)
+            self._out = np.empty(self._lead + (2 * num, width), dtype=out_dtype)
+
+    def push(self, block: np.ndarray) -> tuple:
+        """
+        接入新的数据块, 返回新完成帧的时间轴、频率轴与谱图列
+
+        参数:
+        --------
+        block : np.ndarray or Signal
+            新数据块, 多通道时形状为(channels, n)
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            新完成帧的中心时间
+        f_Axis : np.ndarray
+            频率轴
+        columns : np.ndarray
+            新完成帧的谱图列, 形状为(..., 帧数, 频点数), 为内部缓冲区视图, 下次push后失效
+        """
+        data = block.data if isinstance(block, Signal) else np.asarray(block)
+        self.count += data.shape[-1]
+        skip = min(self._skip, data.shape[-1])  # 不属于任何帧的点直接丢弃
+        self._skip -= skip
+        data = data[..., skip:]
+        nperseg, nhop = self.nperseg, self.nhop
+        fill = self._fill + data.shape[-1]
+        num = (fill - nperseg) // nhop + 1 if fill >= nperseg else 0  # 新完成帧数
+        self._reserve(fill, num)
+        self._buf[..., self._fill : fill] = data
+        self._fill = fill
+        return self._emit(num)
+
+    def _emit(self, num: int) -> tuple:
+        """
+        批量变换缓冲区中已完整的num帧, 并将剩余尾部移至缓冲区开头
+        """
+        nperseg, nhop = self.nperseg, self.nhop
+        t_Axis = self.t0 + np.arange(self.frames, self.frames + num) * (nhop / self.fs)
+        if num == 0:
+            width = nperseg if self.output == "complex" else nperseg // 2
+            return t_Axis, self.f_Axis, np.zeros(self._lead + (0, width))
+        frames = np.lib.stride_tricks.sliding_window_view(
+            self._buf[..., : self._fill], nperseg, axis=-1
+        )[..., ::nhop, :][..., :num, :]
+        seg = self._seg[..., :num, :]
+        np.multiply(frames, self._win, out=seg)
+        ft_data = fft.rfft(seg)
+        ft_data /= nperseg
+        out = self._out[..., :num, :]
+        if self.output == "complex":  # 负频率部分由共轭对称补全
+            nfreq = nperseg // 2 + 1
+            out[..., :nfreq] = ft_data
+            np.conj(ft_data[..., 1 : (nperseg + 1) // 2][..., ::-1], out=out[..., nfreq:])
+        else:
+            np.abs(ft_data[..., : nperseg // 2], out=out)
+            out *= 2
+        # 保留下一帧起的尾部数据, 下一帧起点超出缓冲区时记录尚需跳过的点数
+        used = num * nhop
+        rest = max(self._fill - used, 0)
+        self._skip = max(used - self._fill, 0)
+        self._buf[..., :rest] = self._buf[..., used : self._fill]
+        self._fill = rest
+        self.frames += num
+        return t_Axis, self.f_Axis, out
+
+    def flush(self) -> tuple:
+        """
+        数据流结束时末尾补零, 输出中心位于数据范围内的剩余帧, 并重置状态以接入新的数据流
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            剩余帧的中心时间
+        f_Axis : np.ndarray
+            频率轴
+        columns : np.ndarray
+            剩余帧的谱图列
+        """
+        total = -(-self.count // self.nhop)  # 离线stft的总帧数
+        num = max(total - self.frames, 0)
+        # 剩余各帧需要的补零点数
+        need = (num - 1) * self.nhop + self.nperseg - self._fill if num else 0
+        self._reserve(self._fill + max(need, 0), num)
+        if need > 0:
+            self._buf[..., self._fill : self._fill + need] = 0
+            self._fill += need
+        res = self._emit(num)
+        res = (res[0], res[1], res[2].copy())  # 重置后缓冲区将被复用
+        self._reset()
+        return res
+
+
+# --------------------------------------------------------------------------------------------#
+class OnlineISTFT:
+    """
+    在线短时傅里叶逆变换, 逐块接入STFT帧并重叠相加, 增量输出不再受后续帧影响的重构点,
+    与TimeFre_Analysis.istft一致: 舍弃开头nperseg//2点, 以窗函数平方和包络归一化,
+    flush()时输出末尾剩余点; 重叠相加的累加缓冲区预分配, 稳态下不重新分配
+
+    参数:
+    --------
+    fs : int
+        采样频率
+    nperseg : int
+        段长
+    nhop : int
+        段移
+    WinType : str, 默认为"矩形窗"
+        STFT的加窗类型
+    channels : int, 可选
+        通道数, 默认为单通道
+    dtype : str, 默认为"float64"
+        计算精度
+
+    属性:
+    --------
+    count : int
+        已输出的重构点数
+    frames : int
+        已接入的帧数
+
+    方法:
+    --------
+    push(frames:np.ndarray) -> tuple
+        接入新的STFT帧, 返回新完成重构点的时间轴与数据
+    flush() -> tuple
+        数据流结束时输出剩余重构点并重置状态
+    """
+
+    @Check_Vars(
+        {"fs": {"Low": 1}, "nperseg": {"Low": 2}, "nhop": {"Low": 1}, "channels": {"Low": 1}}
+    )
+    def __init__(
+        self,
+        fs: int,
+        nperseg: int,
+        nhop: int,
+        WinType: str = "矩形窗",
+        channels: Optional[int] = None,
+        dtype: str = "float64",
+    ):
+        self.fs = fs
+        self.nperseg = nperseg
+        self.nhop = nhop
+        self._lead = () if channels is None else (channels,)
+        self._dtype = np.dtype(dtype)
+        _, _, self._win = window(type=WinType, num=nperseg, dtype=self._dtype)
+        if not signal.check_NOLA(self._win, nperseg, nperseg - nhop):
+            raise ValueError(
+                f"输入的stft参数nhop={nhop}不满足非零重叠加 (NOLA) 条件，无法完整重构"
+            )
+        self._r = -(-nperseg // nhop)  # 每帧覆盖的nhop子段数
+        self._mirror = -np.arange(nperseg // 2 + 1) % nperseg  # 正频率对应的负频率索引
+        # 重叠相加与窗函数平方和包络的累加缓冲区, 按nhop子段存储, 按需扩容
+        self._acc = np.zeros(self._lead + (2 * self._r, nhop), dtype=self._dtype)
+        self._env = np.zeros((2 * self._r, nhop), dtype=self._dtype)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._acc[...] = 0
+        self._env[...] = 0
+        self._base = 0  # 缓冲区首个子段的全局序号
+        self._pos = self.nperseg // 2  # 下一个输出点的全局位置, 开头舍弃点同离线istft
+        self.frames = 0
+        self.count = 0
+
+    # ----------------------------------------------------------------------------------------#
+    def push(self, frames: np.ndarray) -> tuple:
+        """
+        接入新的STFT帧, 返回新完成重构点的时间轴与数据
+
+        参数:
+        --------
+        frames : np.ndarray
+            STFT帧, 形状为(..., 帧数, nperseg), 同TimeFre_Analysis.stft或OnlineSTFT的复数输出
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            新完成重构点的时间
+        RC_data : np.ndarray
+            新完成的重构数据
+        """
+        num = frames.shape[-2]
+        nperseg, nhop = self.nperseg, self.nhop
+        start = self.frames - self._base  # 新帧在缓冲区中的起始子段
+        rows = start + num + self._r - 1
+        if rows > self._env.shape[0]:  # 扩容并保留未输出的子段
+            used = start + self._r - 1
+            acc = np.zeros(self._lead + (2 * rows, nhop), dtype=self._dtype)
+            env = np.zeros((2 * rows, nhop), dtype=self._dtype)
+            acc[..., :used, :] = self._acc[..., :used, :]
+            env[:used] = self._env[:used]
+            self._acc, self._env = acc, env
+        # 批量IDFT后加窗重叠相加, real(ifft(X))等于X的共轭对称分量的irfft
+        if num > 0:
+            ft_data = frames[..., : nperseg // 2 + 1] + np.conj(frames[..., self._mirror])
+            ft_data /= 2
+            segs = fft.irfft(ft_data, nperseg)
+            segs *= nperseg * self._win
+            _overlap_add(self._acc, segs.astype(self._dtype, copy=False), start, nhop)
+            _overlap_add(
+                self._env, np.broadcast_to(self._win**2, (num, nperseg)), start, nhop
+            )
+            self.frames += num
+        # 已接入帧之前的点不再变化, 且不超过当前帧数下离线istft的末尾
+        end = min(self.frames * nhop, (self.frames - 1) * nhop + nperseg - nperseg // 2)
+        return self._emit(end)
+
+    def _emit(self, end: int) -> tuple:
+        """
+        输出全局位置[_pos, end)的归一化重构点, 并丢弃已输出的完整子段
+        """
+        nhop = self.nhop
+        lo, hi = self._pos - self._base * nhop, end - self._base * nhop
+        hi = max(hi, lo)
+        RC_data = self._acc.reshape(self._lead + (-1,))[..., lo:hi]
+        RC_data = RC_data / self._env.reshape(-1)[lo:hi]
+        t_Axis = (self.count + np.arange(RC_data.shape[-1])) / self.fs
+        self.count += RC_data.shape[-1]
+        self._pos += RC_data.shape[-1]
+        # 已输出且不再有后续帧叠加的子段移出缓冲区
+        drop = min(self._pos // nhop, self.frames) - self._base
+        used = self.frames - self._base + self._r - 1
+        if drop > 0:
+            self._acc[..., : used - drop, :] = self._acc[..., drop:used, :]
+            self._acc[..., used - drop : used, :] = 0
+            self._env[: used - drop] = self._env[drop:used]
+            self._env[used - drop : used] = 0
+            self._base += drop
+        return t_Axis, RC_data
+
+    def flush(self) -> tuple:
+        """
+        数据流结束时输出剩余重构点, 末尾舍弃nperseg//2点同离线istft, 并重置状态
+
+        返回:
+        --------
+        t_Axis : np.ndarray
+            剩余重构点的时间
+        RC_data : np.ndarray
+            剩余重构数据
+        """
+        end = (self.frames - 1) * self.nhop + self.nperseg - self.nperseg // 2
+        res = self._emit(end if self.frames > 0 else self._pos)
+        self._reset()
+        return res
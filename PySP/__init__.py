@@ -2,3 +2,5 @@ from . import Signal
 from . import Plot
 from . import BasicSP
 from . import Cep_Analysis
+from . import Stream
+from . import Batch
@@ -1,6 +1,8 @@
+from .dependencies import Callable
 from .dependencies import np
 from .dependencies import inspect
-from .dependencies import wraps
+from .dependencies import os
+from .dependencies import wraps, contextmanager, contextvars
 from .dependencies import get_origin, get_args, Union
 
 
@@ -8,113 +10,178 @@ from .dependencies import get_origin, get_args, Union
 # -## ----------------------------------------------------------------------------------------#
 # -----## ------------------------------------------------------------------------------------#
 # ---------## --------------------------------------------------------------------------------#
+_CHECK_ENABLED = os.environ.get("PYSP_CHECK_VARS", "1") != "0"  # 全局变量检查开关
+_CHECK_SKIPPED = contextvars.ContextVar("PYSP_CHECK_SKIPPED", default=False)
+
+
+def set_check_vars(enable: bool) -> None:
+    """
+    全局开启或关闭Check_Vars与Analysis.Input的变量检查, 也可通过环境变量PYSP_CHECK_VARS=0关闭
+
+    参数:
+    --------
+    enable : bool
+        是否进行变量检查
+    """
+    global _CHECK_ENABLED
+    _CHECK_ENABLED = enable
+
+
+@contextmanager
+def skip_check_vars():
+    """
+    在with语句块内跳过变量检查的上下文管理器, 仅作用于当前线程/协程上下文
+    """
+    token = _CHECK_SKIPPED.set(True)
+    try:
+        yield
+    finally:
+        _CHECK_SKIPPED.reset(token)
+
+
+# --------------------------------------------------------------------------------------------#
+def _compile_rule(var_name: str, var_type, var_cond) -> Callable:
+    """
+    将单个变量的检查规则预编译为检查函数
+    """
+    # 处理 Optional 类型
+    if get_origin(var_type) is Union:
+        var_type = get_args(var_type)[0]
+    if not isinstance(var_cond, dict):
+        var_cond = {}
+    ndim = var_cond.get("ndim")
+    Low, High = var_cond.get("Low"), var_cond.get("High")
+    CloseLow, CloseHigh = var_cond.get("CloseLow"), var_cond.get("CloseHigh")
+    OpenLow, OpenHigh = var_cond.get("OpenLow"), var_cond.get("OpenHigh")
+    Content = var_cond.get("Content")
+
+    def check(var_value):
+        # 处理float变量的int输入
+        if var_type is float and isinstance(var_value, int):
+            var_value = float(var_value)
+        # 检查输入值类型是否为预设类型
+        if var_type and not isinstance(var_value, var_type):
+            raise TypeError(
+                f"输入变量 '{var_name}' 类型不为要求的 {var_type.__name__}, 实际为 {type(var_value).__name__}"
+            )
+        # 针对某些变量类型进行额外检查
+        # ------------------------------------------------------------------------------------#
+        # array类检查
+        if isinstance(var_value, np.ndarray):
+            # 条件1：数组维度检查
+            if ndim is not None and var_value.ndim != ndim:
+                raise ValueError(
+                    f"输入array数组 '{var_name}' 维度不为要求的 {ndim}, 实际为{var_value.ndim}"
+                )
+        # ------------------------------------------------------------------------------------#
+        # int类
+        elif isinstance(var_value, int):
+            # 条件1：下界检查
+            if Low is not None and not (Low <= var_value):
+                raise ValueError(
+                    f"输入int变量 '{var_name}' 小于要求的下界 {Low}, 实际为{var_value}"
+                )
+            # 条件2：上界检查
+            if High is not None and not (var_value <= High):
+                raise ValueError(
+                    f"输入int变量 '{var_name}' 大于要求的上界 {High}, 实际为{var_value}"
+                )
+        # ------------------------------------------------------------------------------------#
+        # float类
+        elif isinstance(var_value, float):
+            # 条件1：闭下界检查
+            if CloseLow is not None and not (CloseLow <= var_value):
+                raise ValueError(
+                    f"输入float变量 '{var_name}' 小于要求的下界 {CloseLow}, 实际为{var_value}"
+                )
+            # 条件2：闭上界检查
+            if CloseHigh is not None and not (var_value <= CloseHigh):
+                raise ValueError(
+                    f"输入float变量 '{var_name}' 大于要求的上界 {CloseHigh}, 实际为{var_value}"
+                )
+            # 条件3：开下界检查
+            if OpenLow is not None and not (OpenLow < var_value):
+                raise ValueError(
+                    f"输入float变量 '{var_name}' 小于或等于要求的下界 {OpenLow}, 实际为{var_value}"
+                )
+            # 条件4：开上界检查
+            if OpenHigh is not None and not (var_value < OpenHigh):
+                raise ValueError(
+                    f"输入float变量 '{var_name}' 大于或等于要求的上界 {OpenHigh}, 实际为{var_value}"
+                )
+        # ------------------------------------------------------------------------------------#
+        # str类
+        elif isinstance(var_value, str):
+            # 条件1：字符串内容检查
+            if Content is not None and var_value not in Content:
+                raise ValueError(
+                    f"输入str变量 '{var_name}' 不在要求的范围 {Content}, 实际为{var_value}"
+                )
+
+    return check
+
+
+# --------------------------------------------------------------------------------------------#
+def _compile_checks(func: Callable, var_checks_json: dict) -> Callable:
+    """
+    在装饰时一次性解析函数签名与检查规则, 生成快速检查函数
+    """
+    Vars = inspect.signature(func)
+    params = Vars.parameters
+    has_var_kw = any(p.kind is p.VAR_KEYWORD for p in params.values())
+    positional = [
+        name
+        for name, p in params.items()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ]
+    annotations = func.__annotations__  # 获取变量的类型注解
+    # 每条规则: (变量名, 位置索引, 默认值, 检查函数), 不在参数列表中的变量不检查
+    rules = []
+    for var_name, var_cond in var_checks_json.items():
+        if var_name not in params or params[var_name].kind is params[var_name].VAR_KEYWORD:
+            continue
+        default = params[var_name].default
+        rules.append(
+            (
+                var_name,
+                positional.index(var_name) if var_name in positional else None,
+                None if default is inspect.Parameter.empty else default,
+                _compile_rule(var_name, annotations.get(var_name), var_cond),
+            )
+        )
+
+    def validate(args: tuple, kwargs: dict) -> None:
+        # 检查实际输入变量是否在函数参数中
+        if kwargs and not has_var_kw:
+            for var_name in kwargs:
+                if var_name not in params:
+                    raise TypeError(
+                        f"输入变量{var_name}={kwargs[var_name]}不在函数{func.__name__}的参数列表中"
+                    )
+        # 按指定方式检查指定的变量
+        for var_name, index, default, check in rules:
+            if var_name in kwargs:
+                var_value = kwargs[var_name]
+            elif index is not None and index < len(args):
+                var_value = args[index]
+            else:
+                var_value = default
+            if var_value is not None:  # 对于传值的函数参数进行检查
+                check(var_value)
+
+    return validate
+
+
+# --------------------------------------------------------------------------------------------#
 def Check_Vars(*var_checks):
     # 根据json输入生成对应的变量检查装饰器
     def decorator(func):
+        validate = _compile_checks(func, var_checks[0])  # 装饰时预编译检查规则
+
         @wraps(func)  # 保留原函数的元信息：函数名、参数列表、注释文档、模块信息等
         def wrapper(*args, **kwargs):
-            from .Signal import Signal
-
-            # --------------------------------------------------------------------------------#
-            # 获取函数输入变量
-            Vars = inspect.signature(func)
-            # 检查实际输入变量是否在函数参数中
-            if "kwargs" not in Vars.parameters:
-                for var_name in kwargs:
-                    if var_name not in Vars.parameters:
-                        raise TypeError(
-                            f"输入变量{var_name}={kwargs[var_name]}不在函数{func.__name__}的参数列表中"
-                        )
-            bound_args = Vars.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            # 获取变量的类型注解
-            annotations = func.__annotations__
-            var_checks_json = var_checks[0]
-            # --------------------------------------------------------------------------------#
-            # 按指定方式检查指定的变量
-            for var_name in var_checks_json:
-                var_value = bound_args.arguments.get(var_name)  # 变量实际值
-                var_type = annotations.get(var_name)  # 变量预设类型
-                var_cond = var_checks_json[var_name]  # 变量额外检查条件
-                # ----------------------------------------------------------------------------#
-                # 对于传值的函数参数进行类型检查
-                if var_value is not None:
-                    # 处理 Optional 类型
-                    if get_origin(var_type) is Union:
-                        var_type = get_args(var_type)[0]
-                    # 处理float变量的int输入
-                    if var_type is float and isinstance(var_value, int):
-                        var_value = float(var_value)
-                    # 检查输入值类型是否为预设类型
-                    if var_type and not isinstance(var_value, var_type):
-                        raise TypeError(
-                            f"输入变量 '{var_name}' 类型不为要求的 {var_type.__name__}, 实际为 {type(var_value).__name__}"
-                        )
-                    # 针对某些变量类型进行额外检查
-                    # ------------------------------------------------------------------------#
-                    # array类检查
-                    if isinstance(var_value, np.ndarray):
-                        # 条件1：数组维度检查
-                        if "ndim" in var_cond:
-                            if var_value.ndim != var_cond["ndim"]:
-                                raise ValueError(
-                                    f"输入array数组 '{var_name}' 维度不为要求的 {var_cond['ndim']}, 实际为{var_value.ndim}"
-                                )
-                    # ------------------------------------------------------------------------#
-                    # int类
-                    if isinstance(var_value, int):
-                        # 条件1：下界检查
-                        if "Low" in var_cond:
-                            if not (var_cond["Low"] <= var_value):
-                                raise ValueError(
-                                    f"输入int变量 '{var_name}' 小于要求的下界 {var_cond['Low']}, 实际为{var_value}"
-                                )
-                        # 条件2：上界检查
-                        if "High" in var_cond:
-                            if not (var_value <= var_cond["High"]):
-                                raise ValueError(
-                                    f"输入int变量 '{var_name}' 大于要求的上界 {var_cond['High']}, 实际为{var_value}"
-                                )
-                    # ------------------------------------------------------------------------#
-                    # float类
-                    if isinstance(var_value, float):
-                        # 条件1：闭下界检查
-                        if "CloseLow" in var_cond:
-                            if not (var_cond["CloseLow"] <= var_value):
-                                raise ValueError(
-                                    f"输入float变量 '{var_name}' 小于要求的下界 {var_cond['CloseLow']}, 实际为{var_value}"
-                                )
-                        # 条件2：闭上界检查
-                        if "CloseHigh" in var_cond:
-                            if not (var_value <= var_cond["CloseHigh"]):
-                                raise ValueError(
-                                    f"输入float变量 '{var_name}' 大于要求的上界 {var_cond['CloseHigh']}, 实际为{var_value}"
-                                )
-                        # 条件3：开下界检查
-                        if "OpenLow" in var_cond:
-                            if not (var_cond["OpenLow"] < var_value):
-                                raise ValueError(
-                                    f"输入float变量 '{var_name}' 小于或等于要求的下界 {var_cond['OpenLow']}, 实际为{var_value}"
-                                )
-                        # 条件4：开上界检查
-                        if "OpenHigh" in var_cond:
-                            if not (var_value < var_cond["OpenHigh"]):
-                                raise ValueError(
-                                    f"输入float变量 '{var_name}' 大于或等于要求的上界 {var_cond['OpenHigh']}, 实际为{var_value}"
-                                )
-                    # ------------------------------------------------------------------------#
-                    # str类
-                    if isinstance(var_value, str):
-                        # 条件1：字符串内容检查
-                        if "Content" in var_cond:
-                            if var_value not in var_cond["Content"]:
-                                raise ValueError(
-                                    f"输入str变量 '{var_name}' 不在要求的范围 {var_cond['Content']}, 实际为{var_value}"
-                                )
-                    # ------------------------------------------------------------------------#
-                    # Signal类
-                    if isinstance(var_value, Signal):
-                        pass
+            if _CHECK_ENABLED and not _CHECK_SKIPPED.get():
+                validate(args, kwargs)
             return func(*args, **kwargs)  # 检查通过，执行函数
 
         return wrapper
@@ -1,32 +1,143 @@
 # PYTHON基础库
 from typing import Optional, Callable, Union, get_origin, get_args  # 类型提示
-from functools import wraps  # 函数对象操作
+from functools import wraps, lru_cache  # 函数对象操作
+from contextlib import contextmanager  # 上下文管理器
+import contextvars  # 上下文变量
+import importlib  # 动态导入
 import inspect  # 函数检查
 import copy  # 对象复制
+import os  # 文件路径操作
+import glob  # 文件路径匹配
+import itertools  # 迭代工具
+import threading  # 线程锁
+from collections import OrderedDict, deque  # 有序字典与双端队列
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor  # 线程池与进程池
+from fractions import Fraction  # 有理数运算
 
+
+# --------------------------------------------------------------------------------------------#
+class _LazyModule:
+    """
+    延迟导入的模块代理, 首次访问其属性时才真正导入模块, 以减少import PySP的启动耗时
+    """
+
+    def __init__(self, name: str, setup: Optional[Callable] = None):
+        self._name = name
+        self._setup = setup  # 模块导入后的初始化函数
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._setup is not None:
+                self._setup(module)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__"):  # 不代理特殊属性, 避免拷贝、序列化时误触发导入
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "已导入" if self._module is not None else "未导入"
+        return f"<延迟导入模块 {self._name} ({state})>"
+
+
+class _LazyFont:
+    """
+    延迟解析的字体代理, 首次使用时按以下顺序确定字体文件:
+    环境变量 -> 候选字体路径 -> matplotlib按字体族名查找,
+    可直接作为fontproperties/prop参数传入matplotlib
+    """
+
+    def __init__(self, env: str, paths: list, families: list):
+        self._env = env  # 指定字体文件路径的环境变量名
+        self._paths = paths  # 各平台常见字体文件路径
+        self._families = families  # 字体族名, 用于兜底查找
+        self._path = None
+        self._font = None
+
+    def set_path(self, path: str) -> None:
+        """
+        手动指定字体文件路径
+        """
+        self._path = path
+        self._font = None
+
+    def _resolve(self) -> str:
+        if self._path is None:
+            candidates = [os.environ.get(self._env)] + self._paths
+            for path in candidates:
+                if path and os.path.isfile(path):
+                    self._path = path
+                    break
+            else:
+                self._path = font_manager.findfont(
+                    font_manager.FontProperties(family=self._families)
+                )
+        return self._path
+
+    def __fspath__(self) -> str:
+        return self._resolve()
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        if self._font is None:
+            self._font = font_manager.FontProperties(fname=self._resolve())
+        return getattr(self._font, attr)
+
+
+def _setup_pyplot(plt) -> None:
+    """
+    pyplot首次导入时的全局绘图设置
+    """
+    plt.rcParams["font.family"] = "sans-serif"  # 默认字体类型
+    plt.rcParams["font.sans-serif"] = ["Times New Roman"]  # 默认字体
+    plt.rcParams["axes.unicode_minus"] = False  # 正常显示负号
+    plt.rcParams["font.size"] = 16  # 设置全局字体大小
+
+
+# --------------------------------------------------------------------------------------------#
 # 向量数值计算库
 import numpy as np
 from numpy import random  # 随机数包
 
 # 高级数学分析库
-from scipy import signal  # 信号处理包
 from scipy import fft  # 快速傅里叶变换包
-from scipy import stats  # 统计分析包
-from scipy import interpolate  # 插值分析包
-
-# 可视化绘图库
-import matplotlib.pyplot as plt
-from matplotlib import animation  # 动画绘图
-from matplotlib import font_manager  # 字体管理
-
-plt.rcParams["font.family"] = "sans-serif"  # 默认字体类型
-plt.rcParams["font.sans-serif"] = ["Times New Roman"]  # 默认字体
-plt.rcParams["axes.unicode_minus"] = False  # 正常显示负号
-plt.rcParams["font.size"] = 16  # 设置全局字体大小
-zh_font = font_manager.FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf")  # 中文字体
-en_font = font_manager.FontProperties(
-    fname=r"C:\Windows\Fonts\Times New Roman.ttf"
+signal = _LazyModule("scipy.signal")  # 信号处理包
+stats = _LazyModule("scipy.stats")  # 统计分析包
+interpolate = _LazyModule("scipy.interpolate")  # 插值分析包
+
+# 可视化绘图库, 仅在首次绘图时导入
+plt = _LazyModule("matplotlib.pyplot", setup=_setup_pyplot)
+animation = _LazyModule("matplotlib.animation")  # 动画绘图
+font_manager = _LazyModule("matplotlib.font_manager")  # 字体管理
+
+zh_font = _LazyFont(
+    "PYSP_ZH_FONT",
+    [
+        r"C:\Windows\Fonts\simhei.ttf",
+        "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+        "/System/Library/Fonts/PingFang.ttc",
+    ],
+    ["SimHei", "WenQuanYi Micro Hei", "Noto Sans CJK SC", "PingFang SC"],
+)  # 中文字体
+en_font = _LazyFont(
+    "PYSP_EN_FONT",
+    [
+        r"C:\Windows\Fonts\Times New Roman.ttf",
+        "/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSerif-Regular.ttf",
+        "/System/Library/Fonts/Supplemental/Times New Roman.ttf",
+    ],
+    ["Times New Roman", "Liberation Serif", "DejaVu Serif"],
 )  # 英文字体
 
-FLOAT_EPS = np.finfo(float).eps  # 机器精度
+FLOAT_EPS = float(np.finfo(float).eps)  # 机器精度, Python浮点数不改变数组计算精度
 PI = np.pi  # 圆周率
+CHUNK_SIZE = 2**22  # 分块处理大信号时每块的最大采样点数
+MEDIAN_BUFFER_SIZE = 2**25  # 中位数Welch法缓存各段功率谱的最大点数
@@ -0,0 +1,46 @@
+"""
+# bench_batch
+批量分析吞吐量基准
+
+对比逐个信号调用Frequency_Analysis.Psd与batch_run在不同并行数下每秒处理的记录数,
+运行: python benchmarks/bench_batch.py [记录数] [记录长度]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from PySP.Signal import Signal
+from PySP.BasicSP import Frequency_Analysis
+from PySP.Batch import batch_run
+
+
+# --------------------------------------------------------------------------------------------#
+def main():
+    num = int(float(sys.argv[1])) if len(sys.argv) > 1 else 5000
+    N = int(float(sys.argv[2])) if len(sys.argv) > 2 else 16384
+    rng = np.random.default_rng(0)
+    Sigs = [Signal(rng.standard_normal(N), label="记录", fs=25600) for _ in range(num)]
+
+    t = time.perf_counter()
+    for Sig in Sigs:
+        Frequency_Analysis(Sig).Psd("汉宁窗")
+    base = num / (time.perf_counter() - t)
+    print(f"{'逐个调用':<16s} {base:10.1f} 记录/s")
+
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    for w in workers:
+        t = time.perf_counter()
+        for _ in batch_run(Sigs, Frequency_Analysis, "Psd", "汉宁窗", workers=w):
+            pass
+        rate = num / (time.perf_counter() - t)
+        print(f"{f'batch_run x{w}':<16s} {rate:10.1f} 记录/s  加速比 {rate / base:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+# bench_check_vars
+变量检查装饰器的单次调用开销微基准
+
+对比未装饰函数、开启检查的Check_Vars/Analysis.Input装饰函数与关闭检查时的单次调用耗时,
+运行: python benchmarks/bench_check_vars.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from PySP.decorators import Check_Vars
+from PySP.Signal import Signal, Analysis
+
+try:
+    from PySP.decorators import skip_check_vars
+except ImportError:  # 旧版本无检查开关
+    skip_check_vars = None
+
+
+# --------------------------------------------------------------------------------------------#
+def func(data: np.ndarray, num: int, step: float, type: str = "汉宁窗"):
+    return data
+
+
+checked_func = Check_Vars(
+    {
+        "data": {"ndim": 1},
+        "num": {"Low": 1},
+        "step": {"OpenLow": 0},
+        "type": {"Content": ("矩形窗", "汉宁窗")},
+    }
+)(func)
+
+
+class Bench_Analysis(Analysis):
+    @Analysis.Input({"nperseg": {"Low": 20}, "nhop": {"Low": 1}})
+    def method(self, nperseg: int, nhop: int, WinType: str = "矩形窗"):
+        return nperseg
+
+
+# --------------------------------------------------------------------------------------------#
+def bench(stmt, number: int = 100000) -> float:
+    """
+    返回单次调用的最优耗时(us)
+    """
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    data = np.zeros(4096)
+    Sig = Signal(data, label="测试信号", fs=4096)
+    obj = Bench_Analysis(Sig)
+    results = {
+        "未装饰函数": bench(lambda: func(data, 10, 0.5)),
+        "Check_Vars装饰函数": bench(lambda: checked_func(data, 10, 0.5)),
+        "Analysis.Input装饰方法": bench(lambda: obj.method(101, 10)),
+        "Signal构造": bench(lambda: Signal(data, label="测试信号", fs=4096), 20000),
+    }
+    if skip_check_vars is not None:
+        with skip_check_vars():
+            results["Check_Vars装饰函数(关闭检查)"] = bench(
+                lambda: checked_func(data, 10, 0.5)
+            )
+            results["Analysis.Input装饰方法(关闭检查)"] = bench(
+                lambda: obj.method(101, 10)
+            )
+    for name, t in results.items():
+        print(f"{name}: {t:.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
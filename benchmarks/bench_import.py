@@ -0,0 +1,53 @@
+"""
+# bench_import
+import PySP 的启动耗时测量
+
+在独立子进程中多次导入PySP, 统计导入耗时, 并检查绘图库与不常用的scipy子模块未被提前导入,
+运行: python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEAVY_MODULES = ("matplotlib", "matplotlib.pyplot", "scipy.signal", "scipy.stats")
+
+CODE = f"""
+import sys, time
+t = time.perf_counter()
+import PySP
+t = time.perf_counter() - t
+print(t * 1e3)
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+# --------------------------------------------------------------------------------------------#
+def measure(repeat: int = 5) -> tuple:
+    """
+    返回多次子进程导入的最短耗时(ms)与被提前导入的重型模块
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    times, loaded = [], ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", CODE], env=env, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return min(times), loaded
+
+
+def main():
+    t, loaded = measure()
+    print(f"import PySP: {t:.1f} ms")
+    if loaded:
+        print(f"警告: 导入时加载了重型模块 {loaded}")
+        sys.exit(1)
+    print("未加载matplotlib、scipy.signal、scipy.stats")
+
+
+if __name__ == "__main__":
+    main()
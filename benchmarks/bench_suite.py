@@ -0,0 +1,302 @@
+"""
+# bench_suite
+PySP各公开分析方法的耗时与内存基准套件
+
+以Sig_Periodic生成的仿真信号, 在1e3~1e8采样点范围内测量各分析方法、window、resample
+及无界面绘图函数的单次耗时与峰值内存, 结果保存为JSON文件, 可与其它版本的结果对比以发现性能退化,
+运行:
+    python benchmarks/bench_suite.py -o new.json
+    python benchmarks/bench_suite.py --sizes 1e3,1e4,1e5,1e6,1e7,1e8 -o full.json
+    python benchmarks/bench_suite.py -o new.json --compare old.json --threshold 1.2
+"""
+
+import os
+import sys
+import re
+import gc
+import json
+import time
+import platform
+import argparse
+import tempfile
+import warnings
+import subprocess
+import tracemalloc
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # 无界面绘图, plt.show()不阻塞
+warnings.filterwarnings("ignore", category=UserWarning)  # 忽略缺失中文字体等绘图警告
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import scipy
+
+import PySP
+from PySP.Signal import Sig_Periodic, resample
+from PySP.BasicSP import window, Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from PySP.Cep_Analysis import Cep_Analysis, zoom_Aft
+from PySP.Plot import plot_spectrum, plot_spectrogram, plot_findpeak, plot_2DAnim
+from PySP.dependencies import plt
+
+FS = 10000  # 仿真信号采样频率
+COS_PARAMS = ((50, 1, 0), (120, 0.5, 0.3), (1500, 0.2, 1.2))  # 仿真信号余弦分量
+NOISE = 0.5
+NPERSEG, NHOP = 255, 64  # 短时分析参数
+ENVE_BANDS = [(500 + 150 * i, 800 + 150 * i) for i in range(20)]  # 窄带包络分析频带
+
+
+# --------------------------------------------------------------------------------------------#
+def _stft_args(Sig):
+    _, _, stft_data = TimeFre_Analysis(Sig).stft(NPERSEG, NHOP, "汉宁窗")
+    return lambda: TimeFre_Analysis.istft(stft_data, Sig.fs, NHOP, "汉宁窗")
+
+
+def _spectrogram_args(Sig):
+    t_Axis, f_Axis, Amp = TimeFre_Analysis(Sig).st_Cft(NPERSEG, NHOP, "汉宁窗")
+    return lambda: plot_spectrogram(t_Axis, f_Axis, Amp)
+
+
+def _anim_args(Sig):
+    frames = np.stack([Sig.data * (1 + 0.1 * i) for i in range(10)])
+    return lambda: plot_2DAnim(Sig.t_Axis, frames)
+
+
+# 基准用例: 名称 -> (由信号生成无参数调用的函数, 最大采样点数)
+# 最大采样点数用于跳过计算量为O(N^2)或结果内存远大于信号本身的用例
+CASES = {
+    "window": (lambda Sig: lambda: window("汉宁窗", Sig.N), None),
+    "resample": (lambda Sig: lambda: resample(Sig, FS // 4), None),
+    "Time_Analysis.Pdf": (lambda Sig: lambda: Time_Analysis(Sig).Pdf(), 10**6),
+    "Time_Analysis.Pdf(binned_kde)": (
+        lambda Sig: lambda: Time_Analysis(Sig).Pdf(method="binned_kde"),
+        None,
+    ),
+    "Time_Analysis.Trend": (
+        lambda Sig: lambda: Time_Analysis(Sig).Trend("有效值", 0.05, 0.1),
+        None,
+    ),
+    "Time_Analysis.Autocorr": (lambda Sig: lambda: Time_Analysis(Sig).Autocorr(), None),
+    "Frequency_Analysis.ft": (lambda Sig: lambda: Frequency_Analysis(Sig).ft(), None),
+    "Frequency_Analysis.Cft": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).Cft("汉宁窗"),
+        None,
+    ),
+    "Frequency_Analysis.Psd": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).Psd("汉宁窗"),
+        None,
+    ),
+    "Frequency_Analysis.Psd_welch": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).Psd_welch(min(1024, Sig.N)),
+        None,
+    ),
+    "Frequency_Analysis.Psd_corr": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).Psd_corr(),
+        None,
+    ),
+    "Frequency_Analysis.HTenve_spectra": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).HTenve_spectra(),
+        None,
+    ),
+    "Frequency_Analysis.Band_enve_spectra": (
+        lambda Sig: lambda: Frequency_Analysis(Sig).Band_enve_spectra(ENVE_BANDS),
+        None,
+    ),
+    "TimeFre_Analysis.stft": (
+        lambda Sig: lambda: TimeFre_Analysis(Sig).stft(NPERSEG, NHOP, "汉宁窗"),
+        10**7,
+    ),
+    "TimeFre_Analysis.st_Cft": (
+        lambda Sig: lambda: TimeFre_Analysis(Sig).st_Cft(NPERSEG, NHOP, "汉宁窗"),
+        10**7,
+    ),
+    "TimeFre_Analysis.istft": (_stft_args, 10**7),
+    "Cep_Analysis.Cep_Real": (lambda Sig: lambda: Cep_Analysis(Sig).Cep_Real(), None),
+    "Cep_Analysis.Cep_Power": (lambda Sig: lambda: Cep_Analysis(Sig).Cep_Power(), None),
+    "Cep_Analysis.Cep_Complex": (
+        lambda Sig: lambda: Cep_Analysis(Sig).Cep_Complex(),
+        None,
+    ),
+    "Cep_Analysis.Cep_Analytic": (
+        lambda Sig: lambda: Cep_Analysis(Sig).Cep_Analytic(),
+        None,
+    ),
+    "Cep_Analysis.Cep_Zoom": (
+        lambda Sig: lambda: Cep_Analysis(Sig).Cep_Zoom(1500, 400),
+        None,
+    ),
+    "Cep_Analysis.Cep_Lift": (
+        lambda Sig: lambda: Cep_Analysis(Sig).Cep_Lift(0.02, 0.002, 5),
+        None,
+    ),
+    "Cep_Analysis.Enco_detect": (
+        lambda Sig: lambda: Cep_Analysis(Sig).Enco_detect(),
+        None,
+    ),
+    "zoom_Aft": (lambda Sig: lambda: zoom_Aft(Sig, 1500, 400), None),
+    "plot_spectrum": (lambda Sig: lambda: plot_spectrum(Sig.t_Axis, Sig.data), 10**7),
+    "plot_findpeak": (
+        lambda Sig: lambda: plot_findpeak(Sig.t_Axis, Sig.data, 1.5),
+        10**6,
+    ),
+    "plot_spectrogram": (_spectrogram_args, 10**6),
+    "plot_2DAnim": (_anim_args, 10**4),
+}
+
+
+# --------------------------------------------------------------------------------------------#
+def version_info() -> dict:
+    """
+    记录被测PySP版本与运行环境, 便于对比不同版本的结果
+    """
+    with open(os.path.join(ROOT, "setup.py"), encoding="utf-8") as f:
+        match = re.search(r'version="([^"]+)"', f.read())
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "version": match.group(1) if match else "unknown",
+        "commit": commit or "unknown",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _clear_cache(Sig) -> None:
+    cache = getattr(Sig, "cache", None)  # 旧版本无频谱缓存
+    if cache is not None:
+        cache.clear()
+
+
+def measure(make_call, Sig, repeat: int) -> dict:
+    """
+    测量单个用例的最短耗时与峰值内存, 每次调用前清空频谱缓存以计入完整计算;
+    计时前先不计时调用一次, 排除延迟导入、滤波器设计等一次性开销
+    """
+    call = make_call(Sig)
+    _clear_cache(Sig)
+    call()  # 预热
+    plt.close("all")
+    times = []
+    for _ in range(repeat):
+        _clear_cache(Sig)
+        gc.collect()
+        t = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - t)
+        plt.close("all")
+    # 单独运行一次测量峰值内存, 避免tracemalloc开销计入耗时
+    _clear_cache(Sig)
+    gc.collect()
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    plt.close("all")
+    return {"time_s": min(times), "peak_MB": peak / 2**20}
+
+
+def run(sizes: list, cases: list, repeat: int) -> list:
+    results = []
+    for N in sizes:
+        Sig = Sig_Periodic(fs=FS, T=N / FS, CosParams=COS_PARAMS, noise=NOISE)
+        for name in cases:
+            make_call, max_N = CASES[name]
+            record = {"case": name, "N": N}
+            if max_N is not None and N > max_N:
+                record["status"] = "skipped"
+            else:
+                try:
+                    # 大信号单次耗时已足够稳定, 减少重复次数
+                    record.update(measure(make_call, Sig, repeat if N < 10**7 else 1))
+                    record["status"] = "ok"
+                except Exception as e:
+                    record["status"] = f"error: {type(e).__name__}: {e}"
+            results.append(record)
+            print(_format(record), flush=True)
+        del Sig
+    return results
+
+
+def _format(record: dict) -> str:
+    head = f"{record['case']:<36s} N={record['N']:<10d}"
+    if record["status"] != "ok":
+        return f"{head} {record['status']}"
+    return f"{head} {record['time_s'] * 1e3:10.2f} ms {record['peak_MB']:10.1f} MB"
+
+
+# --------------------------------------------------------------------------------------------#
+def compare(new: list, old: list, threshold: float) -> list:
+    """
+    按用例与采样点数匹配新旧结果, 返回耗时或峰值内存超过旧结果threshold倍的条目
+    """
+    old_map = {(r["case"], r["N"]): r for r in old if r["status"] == "ok"}
+    regressions = []
+    print(f"\n{'用例':<34s} {'N':<10s} {'耗时比':>8s} {'内存比':>8s}")
+    for r in new:
+        o = old_map.get((r["case"], r["N"]))
+        if o is None or r["status"] != "ok":
+            continue
+        t_ratio = r["time_s"] / max(o["time_s"], 1e-9)
+        m_ratio = r["peak_MB"] / max(o["peak_MB"], 1e-3)
+        # 忽略绝对差值过小的波动: 耗时差不足1ms或峰值内存不足1MB
+        flag = (t_ratio > threshold and r["time_s"] - o["time_s"] > 1e-3) or (
+            m_ratio > threshold and r["peak_MB"] > 1
+        )
+        print(
+            f"{r['case']:<36s} {r['N']:<10d} {t_ratio:8.2f} {m_ratio:8.2f}"
+            + ("  <-- 退化" if flag else "")
+        )
+        if flag:
+            regressions.append(dict(r, time_ratio=t_ratio, mem_ratio=m_ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PySP性能基准套件")
+    parser.add_argument(
+        "--sizes", default="1e3,1e4,1e5,1e6", help="逗号分隔的信号采样点数, 最大1e8"
+    )
+    parser.add_argument("--cases", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数, 取最短耗时")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="结果JSON文件")
+    parser.add_argument("--compare", default=None, help="用于对比的旧版本结果JSON文件")
+    parser.add_argument("--threshold", type=float, default=1.2, help="判定退化的比值阈值")
+    args = parser.parse_args()
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    cases = [name for name in CASES if args.cases in name]
+    output = os.path.abspath(args.output)
+    with tempfile.TemporaryDirectory() as tmp:  # 绘图函数保存的动图等文件写入临时目录
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            results = run(sizes, cases, args.repeat)
+        finally:
+            os.chdir(cwd)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": version_info(), "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"结果已保存至 {output}")
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        print(f"对比版本: {old['meta']['version']} ({old['meta']['commit']})")
+        regressions = compare(results, old["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}项性能退化超过阈值{args.threshold}")
+            sys.exit(1)
+        print("\n未发现性能退化")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+pytest公共配置: 以源码目录导入PySP, 无界面绘图
+"""
+
+import os
+import sys
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
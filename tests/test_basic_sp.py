@@ -0,0 +1,305 @@
+"""
+BasicSP数值实现与参考定义(原逐帧/直接计算实现及scipy)的等价性测试
+"""
+
+import numpy as np
+import pytest
+from scipy import fft, signal, stats
+
+from PySP.Signal import Signal, SignalArray
+from PySP.BasicSP import window, Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from PySP.BasicSP import HistAccumulator, ReservoirSampler, register_window, fft_crosscorr
+
+FS = 1000
+
+
+@pytest.fixture
+def x():
+    rng = np.random.default_rng(0)
+    t = np.arange(4001) / FS
+    return np.cos(2 * np.pi * 50 * t) * (1 + 0.5 * np.cos(2 * np.pi * 7 * t)) + 0.3 * rng.standard_normal(len(t))
+
+
+@pytest.fixture
+def Sig(x):
+    return Signal(x, label="测试信号", fs=FS)
+
+
+# --------------------------------------------------------------------------------------------#
+# 参考实现: 重构前的逐帧循环STFT/ISTFT
+def ref_stft(x, nperseg, nhop, WinType):
+    N, half = len(x), nperseg // 2
+    _, _, win = window(WinType, nperseg)
+    padded = np.concatenate((np.zeros(half), x, np.zeros(nperseg)))
+    frames = [np.fft.fft(padded[i : i + nperseg] * win) / nperseg for i in range(0, N, nhop)]
+    return np.array(frames)
+
+
+def ref_istft(Z, nhop, WinType):
+    num_frames, nperseg = Z.shape
+    _, _, win = window(WinType, nperseg)
+    N = nhop * (num_frames - 1) + nperseg
+    RC, env = np.zeros(N), np.zeros(N)
+    for i in range(num_frames):
+        RC[i * nhop : i * nhop + nperseg] += np.real(np.fft.ifft(Z[i])) * nperseg * win
+        env[i * nhop : i * nhop + nperseg] += win**2
+    half = nperseg // 2
+    return RC[half:-half] / env[half:-half]
+
+
+# --------------------------------------------------------------------------------------------#
+def test_ft(Sig, x):
+    f_Axis, ft_data = Frequency_Analysis(Sig).ft()
+    assert np.allclose(ft_data, np.fft.fftshift(np.fft.fft(x)) / FS)
+    assert np.allclose(f_Axis, np.fft.fftshift(np.fft.fftfreq(len(x), 1 / FS)))
+
+
+@pytest.mark.parametrize("WinType", ["矩形窗", "汉宁窗"])
+def test_Cft(Sig, x, WinType):
+    N = len(x)
+    scale, _, win = window(WinType, N)
+    f_Axis, Amp = Frequency_Analysis(Sig).Cft(WinType)
+    assert np.allclose(Amp, 2 * np.abs(np.fft.fft(x * win) / N * scale)[: N // 2])
+    assert np.allclose(f_Axis, Sig.f_Axis[: N // 2])
+
+
+@pytest.mark.parametrize("both", [False, True])
+def test_Psd(Sig, x, both):
+    N = len(x)
+    _, scale, win = window("汉宁窗", N)
+    power = np.abs(np.fft.fft(x * win) / N) ** 2 * scale / Sig.df
+    if not both:
+        power = 2 * power[: N // 2]
+    assert np.allclose(Frequency_Analysis(Sig).Psd("汉宁窗", both=both)[1], power)
+
+
+def test_fast_len(Sig, x):
+    # 零填充至快速长度后幅值仍按原信号长度归一化, 频率轴按变换长度加密
+    N = len(x)
+    nfft = 4050  # next_fast_len(4001)
+    scale, _, win = window("汉宁窗", N)
+    f_Axis, Amp = Frequency_Analysis(Sig).Cft("汉宁窗", fast_len=True)
+    assert np.allclose(Amp, 2 * np.abs(np.fft.rfft(x * win, nfft))[: nfft // 2] * scale / N)
+    assert np.allclose(f_Axis, np.arange(nfft // 2) * FS / nfft)
+
+
+def test_HTenve_spectra(Sig, x):
+    N = len(x)
+    ref = 2 * np.abs(np.fft.fft(np.abs(signal.hilbert(x)))[: N // 2]) / N
+    assert np.allclose(Frequency_Analysis(Sig).HTenve_spectra()[1], ref)
+
+
+def test_Band_enve_spectra(x):
+    # 与全速率理想带通后的希尔伯特包络谱一致
+    x = x[:4000]
+    Sig = Signal(x, label="测试信号", fs=FS)
+    low, high = 30.0, 70.0
+    f_Axis, spectra = Frequency_Analysis(Sig).Band_enve_spectra([(low, high)], fast_len=False)
+    fr = np.fft.rfftfreq(len(x), 1 / FS)
+    xb = np.fft.irfft(np.fft.rfft(x) * ((fr >= low) & (fr <= high)), len(x))
+    ref = 2 * np.abs(np.fft.rfft(np.abs(signal.hilbert(xb)))) / len(x)
+    # 包络幅值为非线性运算, 抽取后高频成分有少量混叠
+    assert np.abs(spectra[0] - ref[: len(f_Axis)]).max() < 1e-3 * ref.max()
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize("average", ["mean", "median"])
+@pytest.mark.parametrize("nperseg,nhop", [(256, 100), (255, 255)])
+def test_Psd_welch(Sig, x, average, nperseg, nhop):
+    f_Axis, power = Frequency_Analysis(Sig).Psd_welch(nperseg, nhop, "矩形窗", average)
+    fr, pr = signal.welch(
+        x, FS, window="boxcar", nperseg=nperseg, noverlap=nperseg - nhop,
+        detrend=False, average=average,
+    )
+    # scipy单边谱两端频点不乘2, 比较内部频点
+    assert np.allclose(power[1:], pr[1 : len(f_Axis)])
+    assert np.allclose(f_Axis, fr[: len(f_Axis)])
+
+
+def test_Psd_welch_median_bands(Sig, monkeypatch):
+    # 缓存上限较小时按频带多遍计算, 结果与单遍一致
+    ref = Frequency_Analysis(Sig).Psd_welch(256, 64, average="median")[1]
+    monkeypatch.setattr("PySP.BasicSP.MEDIAN_BUFFER_SIZE", 1000)
+    assert np.allclose(Frequency_Analysis(Sig).Psd_welch(256, 64, average="median")[1], ref)
+
+
+# --------------------------------------------------------------------------------------------#
+def test_Pdf(Sig, x):
+    amp_Axis, kde = Time_Analysis(Sig).Pdf()
+    assert np.allclose(kde, stats.gaussian_kde(x)(amp_Axis))
+    _, binned = Time_Analysis(Sig).Pdf(method="binned_kde")
+    assert np.max(np.abs(binned - kde)) < 1e-3 * np.max(kde)
+    # 蓄水池容量不小于信号长度时保留全部样本, 与全量核密度估计一致
+    _, res = Time_Analysis(Sig).Pdf(method="reservoir", reservoir=len(x))
+    assert np.allclose(res, kde)
+    amp_Axis, hist = Time_Analysis(Sig).Pdf(samples=50, AmpRange=(-2, 2), method="hist")
+    width = amp_Axis[1] - amp_Axis[0]
+    counts, _ = np.histogram(x, 50, (-2 - width / 2, 2 - width / 2))
+    assert np.allclose(hist, counts / (len(x) * width))
+
+
+def test_ReservoirSampler():
+    data = np.arange(10000.0).reshape(2, 5000)
+    sampler = ReservoirSampler(300, (2,))
+    for i in range(0, 5000, 700):
+        sampler.update(data[:, i : i + 700])
+    assert sampler.n == 5000 and sampler.samples.shape == (2, 300)
+    assert np.array_equal(sampler.samples[1], sampler.samples[0] + 5000)  # 各通道共用采样时刻
+    assert len(np.unique(sampler.samples[0])) == 300
+    with pytest.raises(ValueError):
+        HistAccumulator(0, 1).reservoir_kde(np.zeros(3))
+
+
+# --------------------------------------------------------------------------------------------#
+def test_Autocorr(Sig, x):
+    N = len(x)
+    R = np.correlate(x, x, mode="full") / N
+    assert np.allclose(Time_Analysis(Sig).Autocorr()[1], R[-N:])
+    assert np.allclose(Time_Analysis(Sig).Autocorr(std=True, both=True)[1], R / np.var(x))
+    assert np.allclose(Time_Analysis(Sig).Autocorr(method="direct")[1], R[-N:])
+
+
+
+# --------------------------------------------------------------------------------------------#
+def _delayed(d, N=4000, seed=0):
+    # 宽带信号及其延迟d点的副本, 通道0滞后于通道1; 整数延迟直接截取白噪声,
+    # 分数延迟对带限信号频域移相
+    rng = np.random.default_rng(seed)
+    s = rng.standard_normal(N + 400)
+    if d == int(d):
+        return np.stack([s[200 - d : 200 - d + N], s[200 : 200 + N]])
+    s = signal.lfilter(*signal.butter(4, 0.2), s)
+    f = np.fft.rfftfreq(len(s))
+    s_d = np.fft.irfft(np.fft.rfft(s) * np.exp(-2j * np.pi * f * d), len(s))
+    return np.stack([s_d[200 : 200 + N], s[200 : 200 + N]])
+
+
+@pytest.mark.parametrize("max_lag", [None, 0.05, 10.0])
+@pytest.mark.parametrize("pairs", [None, [(2, 0), (1, 1)]])
+def test_Crosscorr(max_lag, pairs):
+    X = np.random.default_rng(1).standard_normal((3, 500))
+    SA = SignalArray(X, label="测试信号", fs=1000)
+    t_Axis, corr = Time_Analysis(SA).Crosscorr(pairs=pairs, max_lag=max_lag)
+    N = X.shape[-1]
+    L = N - 1 if max_lag is None else min(int(max_lag * 1000), N - 1)
+    ref_pairs = [(0, 1), (0, 2), (1, 2)] if pairs is None else pairs
+    ref = np.stack([np.correlate(X[i], X[j], "full") / N for i, j in ref_pairs])
+    assert np.allclose(corr, ref[:, N - 1 - L : N + L])
+    assert np.allclose(t_Axis, np.arange(-L, L + 1) / 1000)
+    assert np.allclose(fft_crosscorr(X, pairs, None if max_lag is None else L), corr)
+
+
+def test_Crosscorr_phat():
+    X = _delayed(9)
+    N, L = X.shape[-1], 50
+    SA = SignalArray(X, label="测试信号", fs=1000)
+    t_Axis, corr = Time_Analysis(SA).Crosscorr(max_lag=L / 1000, weight="phat")
+    nfft = fft.next_fast_len(N + L)
+    cross = np.fft.rfft(X[0], nfft) * np.conj(np.fft.rfft(X[1], nfft))
+    r = np.fft.irfft(cross / np.abs(cross), nfft)
+    assert np.allclose(corr[0], np.concatenate((r[nfft - L :], r[: L + 1])))
+    # 白化后互相关峰值尖锐, 位于延迟处
+    k = np.argmax(corr[0])
+    assert t_Axis[k] == pytest.approx(9 / 1000)
+    assert corr[0, k] > 5 * np.max(np.abs(np.delete(corr[0], k)))
+
+
+@pytest.mark.parametrize("weight", ["none", "phat"])
+@pytest.mark.parametrize("d,tol", [(7, 0.05), (-12, 0.05), (7.3, 0.1), (-12.6, 0.1)])
+def test_Time_delay(weight, d, tol):
+    SA = SignalArray(_delayed(d), label="测试信号", fs=1000)
+    pairs, tau = Time_Analysis(SA).Time_delay(max_lag=0.05, weight=weight)
+    assert np.array_equal(pairs, [[0, 1]])
+    assert tau[0] * 1000 == pytest.approx(d, abs=tol)
+
+@pytest.mark.parametrize(
+    "Feature,func",
+    [
+        ("均值", lambda s: np.mean(s, axis=-1)),
+        ("方差", lambda s: np.var(s, axis=-1)),
+        ("有效值", lambda s: np.sqrt(np.mean(s**2, axis=-1))),
+        ("方根幅值", lambda s: np.mean(np.sqrt(np.abs(s)), axis=-1) ** 2),
+        ("峰值指标", lambda s: np.max(np.abs(s), -1) / np.sqrt(np.mean(s**2, -1))),
+        ("偏度指标", lambda s: stats.skew(s, axis=-1)),
+        ("峭度指标", lambda s: stats.kurtosis(s, axis=-1)),
+    ],
+)
+def test_Trend(Sig, x, Feature, func):
+    step, SegNum = 50, 300
+    seg = np.stack([x[i : i + SegNum] for i in range(0, len(x), step) if i + SegNum <= len(x)])
+    t_Axis, trend = Time_Analysis(Sig).Trend(Feature, step / FS, SegNum / FS)
+    assert np.allclose(trend, func(seg))
+    assert np.allclose(t_Axis, np.arange(len(seg)) * step / FS)
+
+
+def test_Trends_matches_Trend(Sig):
+    _, trends = Time_Analysis(Sig).Trends(0.05, 0.3)
+    for Feature, trend in trends.items():
+        assert np.allclose(trend, Time_Analysis(Sig).Trend(Feature, 0.05, 0.3)[1])
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize(
+    "nperseg,nhop,WinType", [(101, 25, "汉宁窗"), (256, 64, "海明窗"), (100, 100, "矩形窗")]
+)
+def test_stft(Sig, x, nperseg, nhop, WinType):
+    t_Axis, f_Axis, Z = TimeFre_Analysis(Sig).stft(nperseg, nhop, WinType)
+    assert np.allclose(Z, ref_stft(x, nperseg, nhop, WinType))
+    assert np.allclose(t_Axis, np.arange(0, len(x), nhop) / FS)
+    assert np.allclose(f_Axis, np.arange(nperseg) * FS / nperseg)
+    _, f_half, Amp = TimeFre_Analysis(Sig).st_Cft(nperseg, nhop, WinType)
+    assert np.allclose(Amp, 2 * np.abs(Z[:, : nperseg // 2]))
+    assert np.allclose(f_half, f_Axis[: nperseg // 2])
+
+
+@pytest.mark.parametrize("workers", [None, 1, 2, -1])
+def test_stft_workers(Sig, workers):
+    ref = TimeFre_Analysis(Sig).stft(128, 32, "汉宁窗")[2]
+    assert np.allclose(TimeFre_Analysis(Sig).stft(128, 32, "汉宁窗", workers=workers)[2], ref)
+    assert TimeFre_Analysis(Sig).st_Cft(128, 32, workers=workers)[2].shape[-1] == 64
+
+
+def test_stft_workers_zero(Sig):
+    with pytest.raises(ValueError):
+        TimeFre_Analysis(Sig).stft(128, 32, workers=0)
+    with pytest.raises(ValueError):
+        TimeFre_Analysis(Sig).st_Cft(128, 32, workers=0)
+
+
+def test_stft_out(Sig, tmp_path):
+    _, _, Z = TimeFre_Analysis(Sig).stft(101, 25, "汉宁窗")
+    _, _, Zm = TimeFre_Analysis(Sig).stft(101, 25, "汉宁窗", out=str(tmp_path / "Z.npy"))
+    assert isinstance(Zm, np.memmap) and np.allclose(Zm, Z)
+    out = np.zeros((Z.shape[0], 50), dtype=np.float32)
+    _, _, Amp = TimeFre_Analysis(Sig).st_Cft(101, 25, "汉宁窗", out=out)
+    assert Amp is out and np.allclose(out, 2 * np.abs(Z[:, :50]), atol=1e-5)
+    out_c = np.zeros(Z.shape, dtype=np.complex64)  # 同类别降精度允许写入
+    assert TimeFre_Analysis(Sig).stft(101, 25, "汉宁窗", out=out_c)[2] is out_c
+    for dtype in (np.float64, np.float32, np.int64):  # 复数结果不得丢弃虚部
+        with pytest.raises(TypeError):
+            TimeFre_Analysis(Sig).stft(101, 25, "汉宁窗", out=np.zeros(Z.shape, dtype=dtype))
+    with pytest.raises(TypeError):
+        TimeFre_Analysis(Sig).st_Cft(101, 25, out=np.zeros((Z.shape[0], 50), dtype=np.int32))
+
+
+@pytest.mark.parametrize(
+    "nperseg,nhop,WinType", [(101, 25, "汉宁窗"), (256, 64, "汉宁窗"), (100, 30, "矩形窗")]
+)
+def test_istft(Sig, x, nperseg, nhop, WinType):
+    _, _, Z = TimeFre_Analysis(Sig).stft(nperseg, nhop, WinType)
+    _, RC = TimeFre_Analysis.istft(Z, FS, nhop, WinType)
+    assert np.allclose(RC, x[: len(RC)])
+    # 非共轭对称的修改谱与原逐帧实现一致
+    Z2 = Z * np.exp(1j * np.random.default_rng(1).standard_normal(Z.shape))
+    assert np.allclose(TimeFre_Analysis.istft(Z2, FS, nhop, WinType)[1], ref_istft(Z2, nhop, WinType))
+
+
+def test_istft_reregistered_window(Sig, x):
+    # 重复注册同名窗函数后, 缓存的ISTFT包络随之更新
+    register_window("测试窗", lambda n: np.ones(len(n)))
+    _, _, Z = TimeFre_Analysis(Sig).stft(128, 32, "测试窗")
+    TimeFre_Analysis.istft(Z, FS, 32, "测试窗")
+    register_window("测试窗", lambda n: 0.5 - 0.5 * np.cos(2 * np.pi * n / len(n)))
+    _, _, Z = TimeFre_Analysis(Sig).stft(128, 32, "测试窗")
+    RC = TimeFre_Analysis.istft(Z, FS, 32, "测试窗")[1]
+    assert np.allclose(RC, x[: len(RC)])
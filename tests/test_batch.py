@@ -0,0 +1,65 @@
+"""
+批量分析与逐个信号调用的等价性测试
+"""
+
+import numpy as np
+import pytest
+
+from PySP.Signal import Signal, SignalArray
+from PySP.BasicSP import Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from PySP.Cep_Analysis import Cep_Analysis
+from PySP.Batch import batch_run, STACKABLE_METHODS
+
+
+@pytest.fixture(scope="module")
+def Sigs():
+    rng = np.random.default_rng(0)
+    Sigs = [Signal(rng.standard_normal(2000) * (i + 1), label="记录", fs=1000) for i in range(7)]
+    Sigs.append(Signal(rng.standard_normal(1500), label="记录", fs=1000))  # 长度不同另起一组
+    Sigs.append(SignalArray(rng.standard_normal((2, 2000)), label="记录", fs=1000))
+    return Sigs
+
+
+def _assert_same(res, ref):
+    if isinstance(res, (tuple, list)):
+        assert type(res) is type(ref) and len(res) == len(ref)
+        for a, b in zip(res, ref):
+            _assert_same(a, b)
+    elif isinstance(res, dict):
+        assert res.keys() == ref.keys()
+        for key in res:
+            _assert_same(res[key], ref[key])
+    else:
+        assert np.allclose(res, ref)
+
+
+CASES = [
+    (Frequency_Analysis, "Psd", ("汉宁窗",), {}),  # 同benchmarks/bench_batch.py
+    (Frequency_Analysis, "Cft", ("汉宁窗",), {}),
+    (Frequency_Analysis, "Psd_welch", (256,), {}),
+    (Time_Analysis, "Trends", (0.1, 0.2), {}),
+    (TimeFre_Analysis, "st_Cft", (101, 20), {}),
+    (Cep_Analysis, "Cep_Real", (), {}),
+    # 不可堆叠的方法逐个信号执行
+    (Time_Analysis, "Pdf", (), {}),
+    (Cep_Analysis, "Enco_detect", (), {}),
+]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("analysis,method,args,kwargs", CASES)
+def test_batch_run_matches_single(Sigs, analysis, method, args, kwargs, executor):
+    res = list(
+        batch_run(
+            Sigs, analysis, method, *args, group_size=3, workers=2, executor=executor, **kwargs
+        )
+    )
+    assert len(res) == len(Sigs)
+    for r, Sig in zip(res, Sigs):
+        _assert_same(r, getattr(analysis(Sig), method)(*args, **kwargs))
+
+
+def test_stackable_methods_exist():
+    for analysis, methods in STACKABLE_METHODS.items():
+        for method in methods:
+            assert callable(getattr(analysis, method))
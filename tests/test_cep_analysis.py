@@ -0,0 +1,37 @@
+"""
+倒谱分析与参考定义的等价性测试
+"""
+
+import numpy as np
+import pytest
+
+from PySP.Signal import Signal
+from PySP.Cep_Analysis import Cep_Analysis
+from PySP.dependencies import FLOAT_EPS
+
+
+@pytest.fixture
+def x():
+    rng = np.random.default_rng(0)
+    t = np.arange(3000) / 1000
+    x = np.cos(2 * np.pi * 60 * t) + 0.2 * rng.standard_normal(len(t))
+    x[150:] += 0.5 * x[:-150]  # 回声
+    return x
+
+
+def test_Cep_Real_Power(x):
+    N = len(x)
+    real_cep = np.fft.irfft(10 * np.log10(np.abs(np.fft.rfft(x)) + FLOAT_EPS), N)
+    real_cep[0] = 0
+    Sig = Signal(x, label="测试信号", fs=1000)
+    q_Axis, cep = Cep_Analysis(Sig).Cep_Real()
+    assert np.allclose(cep, real_cep[: N // 2])
+    assert np.allclose(q_Axis, Sig.t_Axis[: N // 2])
+    assert np.allclose(Cep_Analysis(Sig).Cep_Power()[1], 2 * real_cep[: N // 2])
+
+
+def test_Cep_Complex(x):
+    X = np.fft.fft(x)
+    ref = np.real(np.fft.ifft(np.log(np.abs(X) + FLOAT_EPS) + 1j * np.angle(X)))
+    Sig = Signal(x, label="测试信号", fs=1000)
+    assert np.allclose(Cep_Analysis(Sig).Cep_Complex()[1], ref)
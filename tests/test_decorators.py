@@ -0,0 +1,91 @@
+"""
+变量检查装饰器与检查开关测试
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from PySP import decorators
+from PySP.decorators import Check_Vars, set_check_vars, skip_check_vars
+from PySP.Signal import Signal
+from PySP.BasicSP import TimeFre_Analysis
+
+from .conftest import ROOT
+
+
+@Check_Vars({"n": {"Low": 1}, "mode": {"Content": ("a", "b")}})
+def checked(n: int, mode: str = "a"):
+    return n, mode
+
+
+@pytest.fixture
+def Sig():
+    return Signal(np.random.default_rng(0).standard_normal(1000), label="测试信号", fs=1000)
+
+
+# --------------------------------------------------------------------------------------------#
+def test_enforced_by_default(Sig):
+    assert checked(1, "b") == (1, "b")
+    with pytest.raises(ValueError):
+        checked(0)
+    with pytest.raises(ValueError):
+        checked(1, "c")
+    with pytest.raises(ValueError):
+        TimeFre_Analysis(Sig).stft(10, 5)  # Analysis.Input共用检查规则
+
+
+def test_skip_check_vars_restores():
+    with skip_check_vars():
+        assert checked(0, "c") == (0, "c")
+        with skip_check_vars():  # 可嵌套
+            assert checked(-1) == (-1, "a")
+        assert checked(0) == (0, "a")
+    with pytest.raises(ValueError):
+        checked(0)
+    with pytest.raises(RuntimeError):
+        with skip_check_vars():
+            raise RuntimeError  # 异常退出时同样恢复
+    with pytest.raises(ValueError):
+        checked(0)
+
+
+def test_skip_check_vars_is_context_local():
+    errors = []
+
+    def worker():
+        try:
+            checked(0)
+        except ValueError as e:
+            errors.append(e)
+
+    with skip_check_vars():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1  # 其他线程仍然检查
+
+
+def test_set_check_vars():
+    try:
+        set_check_vars(False)
+        assert checked(0) == (0, "a")
+    finally:
+        set_check_vars(True)
+    with pytest.raises(ValueError):
+        checked(0)
+
+
+@pytest.mark.parametrize("value,enabled", [("0", False), ("1", True)])
+def test_env_switch(value, enabled):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYSP_CHECK_VARS=value)
+    code = "from PySP import decorators; print(decorators._CHECK_ENABLED)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == str(enabled)
+    assert decorators._CHECK_ENABLED is True
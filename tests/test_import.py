@@ -0,0 +1,39 @@
+"""
+import PySP 的延迟导入与启动耗时测试, 在独立子进程中导入以避免受其它测试已导入模块的影响
+"""
+
+import os
+import subprocess
+import sys
+
+from .conftest import ROOT
+
+HEAVY_MODULES = ("matplotlib", "matplotlib.pyplot", "scipy.signal", "scipy.stats")
+IMPORT_TIME_LIMIT = 5.0  # 宽松的导入耗时上限(s), 仅用于发现明显退化
+
+CODE = f"""
+import sys, time
+t = time.perf_counter()
+import PySP
+print(time.perf_counter() - t)
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def _import_PySP() -> tuple:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("MPLBACKEND", None)
+    out = subprocess.run(
+        [sys.executable, "-c", CODE], env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    return float(out[0]), out[1] if len(out) > 1 else ""
+
+
+def test_import_is_lazy():
+    _, loaded = _import_PySP()
+    assert loaded == "", f"import PySP 时加载了重型模块 {loaded}"
+
+
+def test_import_time():
+    t = min(_import_PySP()[0] for _ in range(3))
+    assert t < IMPORT_TIME_LIMIT
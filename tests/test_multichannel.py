@@ -0,0 +1,68 @@
+"""
+多通道信号SignalArray与逐通道分析结果的等价性测试
+"""
+
+import numpy as np
+import pytest
+
+from PySP.Signal import SignalArray, resample
+from PySP.BasicSP import Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from PySP.Cep_Analysis import Cep_Analysis
+
+
+@pytest.fixture(scope="module")
+def SA():
+    X = np.random.default_rng(0).standard_normal((3, 2000))
+    X[1] *= 3  # 各通道幅值范围不同
+    return SignalArray(X, label="测试信号", fs=1000)
+
+
+CASES = {
+    "Pdf": lambda s: Time_Analysis(s).Pdf(AmpRange=(-3, 3)),
+    "Pdf_binned_kde": lambda s: Time_Analysis(s).Pdf(AmpRange=(-3, 3), method="binned_kde"),
+    "Pdf_hist": lambda s: Time_Analysis(s).Pdf(AmpRange=(-3, 3), method="hist"),
+    "Trend": lambda s: Time_Analysis(s).Trend("峭度指标", 0.1, 0.2),
+    "Autocorr": lambda s: Time_Analysis(s).Autocorr(std=True),
+    "ft": lambda s: Frequency_Analysis(s).ft(),
+    "Cft": lambda s: Frequency_Analysis(s).Cft("汉宁窗"),
+    "Psd": lambda s: Frequency_Analysis(s).Psd(),
+    "Psd_corr": lambda s: Frequency_Analysis(s).Psd_corr(),
+    "Psd_welch": lambda s: Frequency_Analysis(s).Psd_welch(256),
+    "HTenve_spectra": lambda s: Frequency_Analysis(s).HTenve_spectra(),
+    "stft": lambda s: TimeFre_Analysis(s).stft(101, 20, "汉宁窗"),
+    "st_Cft": lambda s: TimeFre_Analysis(s).st_Cft(101, 20),
+    "Cep_Real": lambda s: Cep_Analysis(s).Cep_Real(),
+    "Cep_Power": lambda s: Cep_Analysis(s).Cep_Power(),
+    "Cep_Complex": lambda s: Cep_Analysis(s).Cep_Complex(),
+    "Cep_Analytic": lambda s: Cep_Analysis(s).Cep_Analytic(),
+    "Cep_Zoom": lambda s: Cep_Analysis(s).Cep_Zoom(200, 100),
+    "Cep_Lift": lambda s: Cep_Analysis(s).Cep_Lift(0.1, 0.01, 3),
+}
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_matches_per_channel(SA, name):
+    func = CASES[name]
+    res = func(SA)
+    per_channel = [func(SA.channel(i)) for i in range(SA.channels)]
+    for k, item in enumerate(res):
+        ref = [np.asarray(r[k]) for r in per_channel]
+        if np.ndim(item) == ref[0].ndim:  # 坐标轴各通道共享
+            assert np.allclose(item, ref[0])
+        else:
+            assert np.allclose(item, np.stack(ref))
+
+
+def test_istft_matches_per_channel(SA):
+    _, _, Z = TimeFre_Analysis(SA).stft(101, 20, "汉宁窗")
+    RC = TimeFre_Analysis.istft(Z, 1000, 20, "汉宁窗")[1]
+    for i in range(SA.channels):
+        assert np.allclose(RC[i], TimeFre_Analysis.istft(Z[i], 1000, 20, "汉宁窗")[1])
+
+
+def test_resample_and_from_signals(SA):
+    channels = [SA.channel(i) for i in range(SA.channels)]
+    assert SignalArray.from_signals(channels, "测试信号") == SA
+    res = resample(SA, 500)
+    for i, Sig in enumerate(channels):
+        assert np.allclose(res.data[i], resample(Sig, 500).data)
@@ -0,0 +1,247 @@
+"""
+Signal模块的数据存取、频谱缓存、重采样与计算精度策略测试
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from PySP.Signal import Signal, SignalArray, SpectrumCache, PolyResampler, resample
+from PySP.Signal import precision, float_dtype
+from PySP.BasicSP import Time_Analysis, Frequency_Analysis, TimeFre_Analysis
+from PySP.Cep_Analysis import Cep_Analysis
+
+
+@pytest.fixture
+def x():
+    return np.random.default_rng(0).standard_normal((2, 10007))
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize("up,down", [(1, 4), (3, 7), (5, 2), (1, 1)])
+def test_PolyResampler_matches_resample_poly(x, up, down):
+    res = PolyResampler(up, down)
+    y = np.concatenate((res.process(x), res.flush()), axis=-1)
+    assert np.allclose(y, signal.resample_poly(x, up, down, axis=-1))
+
+
+@pytest.mark.parametrize("up,down", [(1, 4), (3, 7)])
+def test_PolyResampler_chunked(x, up, down):
+    one_shot = PolyResampler(up, down)
+    ref = np.concatenate((one_shot.process(x), one_shot.flush()), axis=-1)
+    chunked = PolyResampler(up, down)
+    rng = np.random.default_rng(1)
+    parts, pos = [], 0
+    while pos < x.shape[-1]:
+        n = int(rng.integers(1, 700))
+        parts.append(chunked.process(x[..., pos : pos + n]))
+        pos += n
+    parts.append(chunked.flush())
+    assert np.allclose(np.concatenate(parts, axis=-1), ref)
+
+
+def test_resample(x):
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    Sig_r = resample(Sig, 250)
+    assert Sig_r.fs == pytest.approx(250)
+    assert np.allclose(Sig_r.data, signal.resample_poly(x[0], 1, 4)[: Sig_r.N])
+
+
+# --------------------------------------------------------------------------------------------#
+def test_precision_auto_keeps_float32(x):
+    Sig = Signal(x[0].astype(np.float32), label="测试信号", fs=1000)
+    assert float_dtype(Sig.data) == np.float64
+    with precision("auto"):
+        assert float_dtype(Sig.data) == np.float32
+        _, Amp = Frequency_Analysis(Sig).Cft("汉宁窗")
+        assert Amp.dtype == np.float32
+    _, Amp64 = Frequency_Analysis(Sig).Cft("汉宁窗")
+    assert Amp64.dtype == np.float64
+    assert np.allclose(Amp, Amp64, atol=1e-4)
+
+
+
+def _istft(s):
+    Z = TimeFre_Analysis(s).stft(128, 32, "汉宁窗")[2]
+    return TimeFre_Analysis.istft(Z, 1000, 32, "汉宁窗")
+
+
+FLOAT32_CASES = {
+    "ft": lambda s: Frequency_Analysis(s).ft(),
+    "Cft": lambda s: Frequency_Analysis(s).Cft(),
+    "Cft_hann": lambda s: Frequency_Analysis(s).Cft("汉宁窗"),
+    "Psd": lambda s: Frequency_Analysis(s).Psd(),
+    "Psd_hann": lambda s: Frequency_Analysis(s).Psd("汉宁窗", fast_len=True),
+    "Psd_welch": lambda s: Frequency_Analysis(s).Psd_welch(256),
+    "HTenve_spectra": lambda s: Frequency_Analysis(s).HTenve_spectra(),
+    "Autocorr": lambda s: Time_Analysis(s).Autocorr(),
+    "stft": lambda s: TimeFre_Analysis(s).stft(128, 32, "汉宁窗"),
+    "st_Cft": lambda s: TimeFre_Analysis(s).st_Cft(128, 32, "汉宁窗"),
+    "istft": _istft,
+    "Cep_Real": lambda s: Cep_Analysis(s).Cep_Real(),
+    "Cep_Power": lambda s: Cep_Analysis(s).Cep_Power(),
+    "Cep_Complex": lambda s: Cep_Analysis(s).Cep_Complex(),
+    "Cep_Analytic": lambda s: Cep_Analysis(s).Cep_Analytic(),
+    "Cep_Lift": lambda s: Cep_Analysis(s).Cep_Lift(0.1, 0.01, 3),
+}
+
+
+@pytest.mark.parametrize("name", list(FLOAT32_CASES))
+def test_precision_float32_on_float64_input(x, name):
+    func = FLOAT32_CASES[name]
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    ref = func(Sig)[-1]
+    with precision("float32"):
+        res = func(Sig)[-1]  # 同一信号的float64缓存不得被复用
+    assert res.dtype in (np.float32, np.complex64)
+    assert np.allclose(res, ref, rtol=1e-3, atol=1e-4 * np.max(np.abs(ref)))
+
+# --------------------------------------------------------------------------------------------#
+def test_zero_copy_and_copy_on_write(x):
+    data = x[0].copy()
+    Sig = Signal(data, label="测试信号", fs=1000, copy=False)
+    assert np.shares_memory(Sig.data, data)
+    assert not Sig.data.flags.writeable
+    Sig[0] = 1.0  # 写时复制, 不修改原始内存
+    assert not np.shares_memory(Sig.data, data)
+    assert Sig.data[0] == 1.0 and data[0] == x[0, 0]
+    assert not np.shares_memory(Signal(data, label="测试信号", fs=1000).data, data)
+
+
+def test_array_protocol(x):
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    arr = np.asarray(Sig)
+    assert not np.shares_memory(arr, Sig.data)  # 默认返回拷贝, 保护内部数据
+    view = np.asarray(Sig, copy=False)
+    assert np.shares_memory(view, Sig.data) and not view.flags.writeable
+    arr32 = np.asarray(Sig, dtype=np.float32)
+    assert arr32.dtype == np.float32 and np.allclose(arr32, x[0], atol=1e-6)
+    with pytest.raises(ValueError):
+        np.asarray(Sig, dtype=np.float32, copy=False)
+    shared = Signal(x[0], label="测试信号", fs=1000, copy=False)
+    assert np.shares_memory(np.asarray(shared), x[0])
+    assert not np.shares_memory(np.array(shared, copy=True), x[0])
+
+
+# --------------------------------------------------------------------------------------------#
+def test_from_file_npy(x, tmp_path):
+    path = str(tmp_path / "记录.npy")
+    np.save(path, x[0])
+    Sig = Signal.from_file(path, fs=1000)
+    assert type(Sig) is Signal and Sig.label == "记录"
+    assert np.array_equal(Sig.data, x[0]) and not Sig.data.flags.writeable
+    np.save(path, x)
+    SA = Signal.from_file(path, fs=1000)
+    assert isinstance(SA, SignalArray) and np.array_equal(SA.data, x)
+
+
+def test_from_file_raw_interleaved(x, tmp_path):
+    path = tmp_path / "记录.bin"
+    X = x[:, :1000].astype(np.float32)
+    header = b"\x00" * 16
+    path.write_bytes(header + X.T.tobytes())  # 按采样点交织存储
+    SA = Signal.from_file(str(path), fs=1000, dtype="float32", offset=16, channels=2)
+    assert isinstance(SA, SignalArray) and SA.data.shape == (2, 1000)
+    assert np.array_equal(SA.data, X)
+    Sig = Signal.from_file(str(path), fs=1000, dtype="float32", offset=16)
+    assert np.array_equal(Sig.data, X.T.reshape(-1))
+
+
+def test_crop(x):
+    Sig = Signal(x[0], label="测试信号", fs=1000, t0=0.5)
+    Sig_c = Sig.crop(0.7, 0.2)
+    assert Sig_c.t0 == pytest.approx(0.7) and Sig_c.N == 200
+    assert np.array_equal(Sig_c.data, x[0, 200:400])
+    assert np.allclose(Sig_c.t_Axis, Sig.t_Axis[200:400])
+    assert np.shares_memory(Sig_c.data, Sig.data)  # 截取不拷贝数据
+    Sig_c[0] = 100.0  # 写时复制, 不修改原信号
+    assert not np.shares_memory(Sig_c.data, Sig.data) and Sig.data[200] == x[0, 200]
+    assert Sig.crop(10.0).N == Sig.N - 9500
+    with pytest.raises(ValueError):
+        Sig.crop(0.4)
+    with pytest.raises(ValueError):
+        Sig.crop(10.0, 1.0)
+
+
+# --------------------------------------------------------------------------------------------#
+def test_SpectrumCache_lru_by_bytes():
+    cache = SpectrumCache(max_bytes=3 * 800)  # 容纳3个100点float64数组
+    calls = []
+
+    def make(i):
+        return lambda: calls.append(i) or np.full(100, float(i))
+
+    for i in range(3):
+        cache.get((i,), make(i))
+    cache.get((0,), make(0))  # 命中, 0成为最近使用
+    cache.get((3,), make(3))  # 淘汰最久未使用的1
+    assert calls == [0, 1, 2, 3] and cache.nbytes == 3 * 800
+    cache.get((1,), make(1))  # 1重新计算并淘汰2
+    cache.get((0,), make(0))
+    cache.get((2,), make(2))
+    assert calls == [0, 1, 2, 3, 1, 2]
+    big = cache.get(("big",), lambda: np.zeros(1000))  # 超过容量的结果不缓存
+    assert not big.flags.writeable and ("big",) not in cache._items
+    cache.clear()
+    assert cache.nbytes == 0
+
+
+def test_SpectrumCache_pickle(x):
+    cache = SpectrumCache(max_bytes=1000)
+    cache.get((0,), lambda: np.zeros(10))
+    cache2 = pickle.loads(pickle.dumps(cache))
+    assert cache2.max_bytes == 1000 and cache2.nbytes == 0
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    Frequency_Analysis(Sig).Cft()
+    Sig2 = pickle.loads(pickle.dumps(Sig))
+    assert Sig2 == Sig and Sig2.cache.nbytes == 0
+    assert np.allclose(Frequency_Analysis(Sig2).Cft()[1], Frequency_Analysis(Sig).Cft()[1])
+
+
+def test_cache_invalidation(x):
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    Amp = Frequency_Analysis(Sig).Cft()[1]
+    spectrum = Sig.cached(("test",), lambda: np.fft.rfft(Sig.data))
+    assert Sig.cached(("test",), lambda: None) is spectrum  # 命中缓存
+    assert not Sig.t_Axis.flags.writeable and not Sig.f_Axis.flags.writeable
+    Sig[:] = 2 * x[0]  # 数据修改后版本号更新, 缓存失效
+    assert np.allclose(Frequency_Analysis(Sig).Cft()[1], 2 * Amp)
+    Sig.data = x[0].copy()
+    assert np.allclose(Frequency_Analysis(Sig).Cft()[1], Amp)
+
+
+def test_copy_has_own_cache(x):
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    Amp = Frequency_Analysis(Sig).Cft()[1]
+    Sig2 = Sig.copy()
+    assert Sig2.cache is not Sig.cache and Sig2._token != Sig._token
+    Sig2.data[:] = 0  # 原地修改拷贝不影响原信号的缓存结果
+    assert np.allclose(Frequency_Analysis(Sig2).Cft()[1], 0)
+    assert np.allclose(Frequency_Analysis(Sig).Cft()[1], Amp)
+    assert Sig.view().cache is Sig.cache  # 视图数据相同, 共享缓存
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize("down_fs,t0", [(250, 1.0), (300, 2.0), (250, 0.004)])
+def test_resample_mid_signal(x, down_fs, t0):
+    # 从信号中段开始重采样时以之前的真实数据作为滤波器历史, 无起始瞬态
+    Sig = Signal(x[0], label="测试信号", fs=1000)
+    Sig_r = resample(Sig, down_fs, t0=t0, T=3.0)
+    res = PolyResampler(down_fs, 1000)
+    ref = np.concatenate((res.process(x[0]), res.flush()))
+    start = int(round(t0 * down_fs))
+    assert Sig_r.t0 == t0
+    assert np.allclose(Sig_r.data, ref[start : start + Sig_r.N])
+
+
+def test_PolyResampler_prime(x):
+    res = PolyResampler(1, 4)
+    ref = np.concatenate((res.process(x), res.flush()), axis=-1)
+    primed = PolyResampler(1, 4)
+    primed.prime(x[..., :4000])
+    y = np.concatenate((primed.process(x[..., 4000:]), primed.flush()), axis=-1)
+    assert np.allclose(y, ref[..., 1000:])
+    with pytest.raises(ValueError):
+        primed.prime(x)
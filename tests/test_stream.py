@@ -0,0 +1,150 @@
+"""
+流式缓冲、数据源及流式处理与离线分析的等价性测试
+"""
+
+import numpy as np
+import pytest
+
+from PySP.Signal import Signal, SignalArray
+from PySP.BasicSP import Time_Analysis, TimeFre_Analysis
+from PySP.Stream import RingBuffer, StreamSource
+from PySP.Stream import RunningMoments, OnlineTrend, OnlineSTFT, OnlineISTFT
+
+
+@pytest.fixture
+def X():
+    return np.random.default_rng(0).standard_normal((2, 5003))
+
+
+def _blocks(data, seed=1, high=400):
+    rng = np.random.default_rng(seed)
+    pos = 0
+    while pos < data.shape[-1]:
+        n = int(rng.integers(1, high))
+        yield data[..., pos : pos + n]
+        pos += n
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize("channels", [None, 2])
+def test_RingBuffer_wraparound(X, channels):
+    data = X[0] if channels is None else X
+    buffer = RingBuffer(100, 1000, channels=channels, t0=1.0)
+    count = 0
+    for block in _blocks(data, high=150):  # 含超过容量的数据块
+        buffer.push(block)
+        count += block.shape[-1]
+        assert buffer.count == count and buffer.size == min(count, 100)
+        Sig = buffer.latest()
+        assert np.array_equal(Sig.data, data[..., count - buffer.size : count])
+        assert Sig.t0 == pytest.approx(1.0 + (count - buffer.size) / 1000)
+        assert not Sig.data.flags.writeable
+        if buffer.size >= 37:
+            assert np.array_equal(buffer.latest(37).data, data[..., count - 37 : count])
+
+
+def test_RingBuffer_overflow(X):
+    buffer = RingBuffer(100, 1000)
+    with pytest.raises(ValueError):
+        buffer.latest()  # 空缓冲区
+    buffer.push(X[0, :30])
+    with pytest.raises(ValueError):
+        buffer.latest(31)
+    buffer.push(X[0, 30:280])  # 单块超过容量只保留最新的capacity点
+    assert buffer.count == 280 and np.array_equal(buffer.latest().data, X[0, 180:280])
+    buffer.push(X[0, 280:290])
+    assert np.array_equal(buffer.latest().data, X[0, 190:290])
+
+
+def test_StreamSource_iter(X):
+    blocks = list(_blocks(X))
+    source = StreamSource(iter(blocks), 1000, t0=2.0)
+    count = 0
+    for block, Sig in zip(blocks, source):
+        assert isinstance(Sig, SignalArray) and np.shares_memory(Sig.data, block)
+        assert Sig.t0 == pytest.approx(2.0 + count / 1000)
+        count += block.shape[-1]
+    assert source.count == X.shape[-1]
+
+
+@pytest.mark.parametrize("nperseg,nhop", [(128, 32), (101, 101), (50, 77)])
+def test_StreamSource_sliding(X, nperseg, nhop):
+    source = StreamSource(_blocks(X), 1000)
+    windows = [(Sig.t0, Sig.data.copy()) for Sig in source.sliding(nperseg, nhop)]
+    ref = np.lib.stride_tricks.sliding_window_view(X, nperseg, axis=-1)[..., ::nhop, :]
+    assert len(windows) == ref.shape[-2]
+    for k, (t0, data) in enumerate(windows):
+        assert t0 == pytest.approx(k * nhop / 1000)
+        assert np.array_equal(data, ref[..., k, :])
+
+
+# --------------------------------------------------------------------------------------------#
+def test_RunningMoments_merge(X):
+    ref = RunningMoments.from_data(X)
+    moments = RunningMoments((2,))
+    for block in _blocks(X):
+        moments.update(block)
+    for field in RunningMoments._FIELDS:
+        assert np.allclose(getattr(moments, field), getattr(ref, field))
+    merged = RunningMoments.from_data(X[:, :1000]) + RunningMoments.from_data(X[:, 1000:])
+    assert np.allclose(merged.M4, ref.M4)
+
+
+def test_OnlineTrend_matches_Trends(X):
+    Sig = SignalArray(X, label="测试信号", fs=1000)
+    t_ref, ref = Time_Analysis(Sig).Trends(0.05, 0.2)
+    online = OnlineTrend(1000, 0.05, 0.2)
+    res = [online.push(block) for block in _blocks(X)]
+    t_Axis = np.concatenate([r[0] for r in res])
+    assert np.allclose(t_Axis, t_ref)
+    for Feature, value in ref.items():
+        assert np.allclose(np.concatenate([r[1][Feature] for r in res], axis=-1), value)
+
+
+# --------------------------------------------------------------------------------------------#
+@pytest.mark.parametrize("output", ["complex", "magnitude"])
+@pytest.mark.parametrize("nperseg,nhop", [(128, 32), (101, 25), (64, 64)])
+def test_OnlineSTFT_matches_stft(X, output, nperseg, nhop):
+    Sig = SignalArray(X, label="测试信号", fs=1000)
+    if output == "complex":
+        t_ref, f_ref, ref = TimeFre_Analysis(Sig).stft(nperseg, nhop, "汉宁窗")
+    else:
+        t_ref, f_ref, ref = TimeFre_Analysis(Sig).st_Cft(nperseg, nhop, "汉宁窗")
+    online = OnlineSTFT(1000, nperseg, nhop, "汉宁窗", output=output, channels=2)
+    res = [tuple(np.copy(r) for r in online.push(block)) for block in _blocks(X)]
+    res.append(online.flush())  # push输出为内部缓冲区视图, 需复制保存
+    t_Axis = np.concatenate([r[0] for r in res])
+    columns = np.concatenate([r[2] for r in res], axis=-2)
+    assert np.allclose(t_Axis, t_ref)
+    assert np.allclose(res[0][1], f_ref)
+    assert np.allclose(columns, ref)
+
+
+@pytest.mark.parametrize("nperseg,nhop,high", [(64, 65, 38), (64, 65, 2), (101, 102, 300)])
+def test_OnlineSTFT_hop_longer_than_segment(X, nperseg, nhop, high):
+    # 段移大于段长时两帧之间的点不属于任何帧, 跨块跳过
+    Sig = SignalArray(X, label="测试信号", fs=1000)
+    t_ref, _, ref = TimeFre_Analysis(Sig).stft(nperseg, nhop)
+    online = OnlineSTFT(1000, nperseg, nhop, channels=2)
+    res = [tuple(np.copy(r) for r in online.push(b)) for b in _blocks(X, high=high)]
+    res.append(online.flush())
+    assert np.allclose(np.concatenate([r[0] for r in res]), t_ref)
+    assert np.allclose(np.concatenate([r[2] for r in res], axis=-2), ref)
+
+
+@pytest.mark.parametrize("nperseg,nhop", [(128, 32), (101, 25), (64, 40)])
+def test_OnlineISTFT_matches_istft(X, nperseg, nhop):
+    Sig = Signal(X[0], label="测试信号", fs=1000)
+    _, _, Z = TimeFre_Analysis(Sig).stft(nperseg, nhop, "汉宁窗")
+    t_ref, ref = TimeFre_Analysis.istft(Z, 1000, nhop, "汉宁窗")
+    online = OnlineISTFT(1000, nperseg, nhop, "汉宁窗")
+    rng = np.random.default_rng(2)
+    res, pos = [], 0
+    while pos < Z.shape[-2]:
+        n = int(rng.integers(1, 20))
+        res.append(online.push(Z[pos : pos + n]))
+        pos += n
+    res.append(online.flush())
+    assert np.allclose(np.concatenate([r[0] for r in res]), t_ref)
+    assert np.allclose(np.concatenate([r[1] for r in res]), ref)
+    assert np.allclose(ref, X[0][: len(ref)])